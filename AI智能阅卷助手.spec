@@ -12,20 +12,28 @@
 
 # -*- mode: python ; coding: utf-8 -*-
 
-from PyInstaller.utils.hooks import collect_submodules
+# 程序不使用 numpy/cv2/pandas（pyscreeze、Pillow 只是可选地导入它们），不再打包，
+# 单文件exe体积更小、启动时解压更快。
+# 延迟导入的模块（pyautogui、PIL.ImageGrab、openpyxl、requests 在函数内导入）显式列出，确保被打包。
+hiddenimports = ['PyQt5.sip', 'pyautogui', 'PIL.ImageGrab', 'openpyxl', 'requests', 'winsound']
 
-hiddenimports = collect_submodules('numpy') + collect_submodules('cv2')
+# 主窗口界面使用由 setting/多题.ui 预编译的 ui_components/ui_main_window.py，
+# 打包前先重新编译一次；exe 中不再包含 .ui 文件和 uic 模块（XML 解析器）。
+import sys
+sys.path.insert(0, SPECPATH)
+from ui_components.compile_ui import compile_main_window_ui
+compile_main_window_ui()
 
 a = Analysis(
     ['main.py'],
     pathex=[],
     binaries=[],
-    datas=[('setting', 'setting')],
-    hiddenimports=['PyQt5.sip', 'PyQt5.QtCore', 'PyQt5.QtGui', 'PyQt5.QtWidgets', 'api_service', 'auto_thread', 'config_manager', 'ui_components.main_window', 'ui_components.question_config_dialog', 'pyautogui', 'PIL', 'PIL.ImageGrab', 'PIL.Image', 'PIL.ImageDraw', 'appdirs', 'requests', 'winsound'] + hiddenimports,
+    datas=[('setting/config.ini', 'setting')],
+    hiddenimports=hiddenimports,
     hookspath=[],
     hooksconfig={},
     runtime_hooks=[],
-    excludes=['tkinter', 'unittest', 'doctest'],
+    excludes=['tkinter', 'unittest', 'doctest', 'numpy', 'cv2', 'pandas', 'matplotlib', 'scipy', 'IPython', 'PyQt5.uic'],
     noarchive=False,
     optimize=0,
 )
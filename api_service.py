@@ -61,14 +61,20 @@
 #
 # ==============================================================================
 
-import requests
 import traceback
 from typing import Tuple, Optional, Dict, Any
 import hashlib
 import hmac
+import threading
 import time
 import json
 from datetime import datetime
+from functools import lru_cache
+
+from api_usage import ApiResponse, parse_usage
+from grading_schema import GRADING_OUTPUT_SCHEMA
+from retry_policy import (ApiError, RetryPolicy, classify_http_status, error_category, parse_retry_after,
+                          BAD_REQUEST, CONFIG, EMPTY_RESPONSE, NETWORK, SERVER, TIMEOUT, UNKNOWN)
 
 # ==============================================================================
 #  UI文本到提供商ID的映射字典 (UI Text to Provider ID Mapping)
@@ -99,18 +105,28 @@ PROVIDER_CONFIGS = {
         "url": "https://ark.cn-beijing.volces.com/api/v3/chat/completions",
         "auth_method": "bearer",
         "payload_builder": "_build_volcengine_payload",
+        "max_concurrency": 8,
+        "structured_output": "json_object",
+        "system_prompt": True,
     },
     "moonshot": {
         "name": "月之暗面",
         "url": "https://api.moonshot.cn/v1/chat/completions",
         "auth_method": "bearer",
         "payload_builder": "_build_openai_compatible_payload",
+        "max_concurrency": 2,
+        "structured_output": "json_object",
+        # 低档账户的每分钟请求数限制较严，限流后多等一会儿、多试几次
+        "retry": {"max_attempts": 5, "rate_limit_base_delay": 10.0},
     },
     "zhipu": {
         "name": "智谱清言",
         "url": "https://open.bigmodel.cn/api/paas/v4/chat/completions",
         "auth_method": "bearer", # 智谱的Key虽然是JWT，但用法和Bearer完全一样
         "payload_builder": "_build_openai_compatible_payload",
+        "max_concurrency": 4,
+        "structured_output": "json_object",
+        "system_prompt": True,
     },
     # "deepseek": {
     #     "name": "deepseek",
@@ -123,18 +139,23 @@ PROVIDER_CONFIGS = {
         "url": "https://dashscope.aliyuncs.com/compatible-mode/v1/chat/completions",
         "auth_method": "bearer",
         "payload_builder": "_build_openai_compatible_payload",
+        "max_concurrency": 8,
+        "structured_output": "json_object",
+        "system_prompt": True,
     },
     "baidu": {
         "name": "百度文心千帆",
         "url": "https://qianfan.baidubce.com/v2/chat/completions",
         "auth_method": "bearer",
         "payload_builder": "_build_openai_compatible_payload",
+        "max_concurrency": 4,
     },
     "tencent": {
         "name": "腾讯混元",
         "url": "https://hunyuan.tencentcloudapi.com/",
         "auth_method": "tencent_signature_v3", # 使用腾讯云签名方法 v3
         "payload_builder": "_build_tencent_payload",
+        "max_concurrency": 2,
         "service_info": {  # 新增服务信息配置，避免硬编码
             "service": "hunyuan",
             "region": "ap-guangzhou",
@@ -148,18 +169,23 @@ PROVIDER_CONFIGS = {
         "url": "https://openrouter.ai/api/v1/chat/completions",
         "auth_method": "bearer",
         "payload_builder": "_build_openai_compatible_payload",
+        "max_concurrency": 8,
     },
     "openai": { # 新增
         "name": "OpenAI",
         "url": "https://api.openai.com/v1/chat/completions",
         "auth_method": "bearer",
         "payload_builder": "_build_openai_compatible_payload",
+        "max_concurrency": 8,
+        "structured_output": "json_schema",
+        "system_prompt": True,
     },
     "gemini": { # 新增
         "name": "Google Gemini",
         "url": "https://generativelanguage.googleapis.com/v1beta/models/gemini-pro-vision:generateContent",
         "auth_method": "google_api_key_in_url",
         "payload_builder": "_build_gemini_payload",
+        "max_concurrency": 4,
     }
 }
 
@@ -179,13 +205,82 @@ def get_ui_text_from_provider_id(provider_id: str) -> Optional[str]:
     config = PROVIDER_CONFIGS.get(provider_id)
     return config["name"] if config else None
 
+# 单次请求的默认超时 (连接超时, 读取超时)，可在 PROVIDER_CONFIGS 中通过 "timeout" 单独覆盖
+DEFAULT_REQUEST_TIMEOUT = (10, 60)
+# 同步会话连接池大小（离线批量阅卷并发 x 双评）
+SESSION_POOL_MAXSIZE = 32
+# 每个供应商同时在途的请求数上限，可在 PROVIDER_CONFIGS 中通过 "max_concurrency" 单独设置。
+# 多题并发、双评和离线批量阅卷的请求共用该上限，超出的请求在发送前排队，不会一起压到供应商触发限流
+DEFAULT_PROVIDER_CONCURRENCY = 4
+# 评分调用失败后的重试策略见 retry_policy.RetryPolicy，可在 PROVIDER_CONFIGS 中通过 "retry" 单独覆盖
+# 模型输出格式错误时的JSON修复请求（纯文本）默认使用该组的模型，可在 PROVIDER_CONFIGS 中通过
+# "repair_model" 指定同一供应商下更便宜的文本模型（需与该组API Key同一账户可用）
+# "structured_output" 声明供应商原生支持的JSON输出模式（OpenAI兼容的 response_format）:
+#   "json_schema" 按 grading_schema.GRADING_OUTPUT_SCHEMA 严格约束字段；"json_object" 只保证输出合法JSON；
+#   未声明时与原来一样只在Prompt中要求JSON。
+# "system_prompt": True 时，评分请求把整段Prompt（总则、题型说明、评分细则、输出格式）放在 system 消息中，
+#   user 消息只有答案图片和一句固定的指令。同一道题的所有请求前缀完全相同，
+#   支持前缀/上下文缓存的供应商可以复用这部分输入，降低首字延迟和费用（缓存命中数见响应的 usage）。
+# 以上可选功能在某个模型上被拒绝时（返回400且错误内容明确提到该功能），自动去掉该功能立即重发；
+# 重发成功才记住该模型不支持此功能，本次运行中不再使用。
+# 其他原因的400（模型ID错误、图片过大、内容审核等）照常返回错误，不影响可选功能。
+OPTIONAL_FEATURE_ERROR_KEYWORDS = {
+    "structured_output": ("response_format", "json_schema", "json_object"),
+    # 不能只匹配 "system"：“system error”“system busy”等与 system 消息无关的错误也会包含它
+    "system_prompt": ("system message", "system role", "role 'system'", 'role "system"', "role: system",
+                      "role=system", "messages[0]"),
+}
+
+JPEG_DATA_URI_PREFIX = "data:image/jpeg;base64,"
+# 评分Prompt放在 system 消息中时，user 消息里随图片发送的固定指令
+GRADING_USER_INSTRUCTION = "请根据系统消息中的评分细则和输出格式要求，对这张学生答案图片进行评分，直接输出JSON对象。"
+
+
+def serialize_payload(payload: Dict[str, Any]) -> bytes:
+    """
+    将请求体序列化为最终发送的字节串（紧凑格式、UTF-8）。
+    每个请求只序列化这一次，签名与发送使用同一份字节，保证签名内容与实际请求体一致。
+    """
+    return json.dumps(payload, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+
+@lru_cache(maxsize=32)
+def _derive_tc3_signing_key(secret_key: str, date: str, service: str) -> bytes:
+    """派生腾讯云 TC3 签名密钥。同一天、同一服务的密钥不变，缓存后每次请求只需一次HMAC"""
+    secret_date = hmac.new(f"TC3{secret_key}".encode('utf-8'), date.encode('utf-8'), hashlib.sha256).digest()
+    secret_service = hmac.new(secret_date, service.encode('utf-8'), hashlib.sha256).digest()
+    return hmac.new(secret_service, "tc3_request".encode('utf-8'), hashlib.sha256).digest()
+
+
 class ApiService:
     def __init__(self, config_manager):
         self.config_manager = config_manager
-        self.session = requests.Session()
+        # requests 导入较慢（约0.1秒），首次调用API时才创建会话，不拖慢窗口显示
+        self._session = None
+        self._session_lock = threading.Lock()
+        # {供应商: threading.Semaphore}，限制每个供应商的在途请求数，见 _provider_slot
+        self._provider_semaphores = {}
+        # 确认不支持的可选功能 {(供应商, 模型, 功能名)}，之后不再使用，见 _get_optional_features
+        self._unsupported_features = set()
         # 初始化当前题目索引，虽然主要逻辑在AutoThread中，但这里有个默认值更安全
         self.current_question_index = 1
 
+    @property
+    def session(self):
+        """共用的 requests 会话，首次使用时创建"""
+        if self._session is None:
+            with self._session_lock:
+                if self._session is None:
+                    import requests
+                    from requests.adapters import HTTPAdapter
+                    session = requests.Session()
+                    # 多题并发/离线批量阅卷会从多个线程共用该会话，扩大连接池以复用 keep-alive 连接
+                    adapter = HTTPAdapter(pool_maxsize=SESSION_POOL_MAXSIZE)
+                    session.mount("https://", adapter)
+                    session.mount("http://", adapter)
+                    self._session = session
+        return self._session
+
     # ==========================================================================
     #  腾讯云签名方法 v3 实现 (Tencent Cloud Signature Method v3)
     #
@@ -201,9 +296,10 @@ class ApiService:
     #  - 签名顺序: SecretKey -> Date -> Service -> "tc3_request"
     #  - 支持的 Service: "hunyuan"
     #  - 支持的 Region: "ap-guangzhou" (默认)
+    #  - 派生的签名密钥按 (SecretKey, Date, Service) 缓存，见 _derive_tc3_signing_key
     # ==========================================================================
     def _build_tencent_signature_v3(self, secret_id: str, secret_key: str, service: str, region: str,
-                                   action: str, version: str, payload: str, host: str) -> str:
+                                   action: str, version: str, payload: bytes, host: str) -> str:
         """构建腾讯云 API 签名方法 v3
 
         Args:
@@ -213,7 +309,7 @@ class ApiService:
             region: 地域 (ap-guangzhou)
             action: API 动作 (ChatCompletions)
             version: API 版本 (2023-09-01)
-            payload: 请求 payload 的 JSON 字符串
+            payload: 实际发送的请求体字节串（serialize_payload 的结果）
 
         Returns:
             tuple: (authorization_header, timestamp)
@@ -232,9 +328,7 @@ class ApiService:
         string_to_sign = f"{algorithm}\n{timestamp}\n{credential_scope}\n{hashlib.sha256(canonical_request.encode('utf-8')).hexdigest()}"
 
         # 3. 计算签名
-        secret_date = hmac.new(f"TC3{secret_key}".encode('utf-8'), date.encode('utf-8'), hashlib.sha256).digest()
-        secret_service = hmac.new(secret_date, service.encode('utf-8'), hashlib.sha256).digest()
-        secret_signing = hmac.new(secret_service, "tc3_request".encode('utf-8'), hashlib.sha256).digest()
+        secret_signing = _derive_tc3_signing_key(secret_key, date, service)
         signature = hmac.new(secret_signing, string_to_sign.encode('utf-8'), hashlib.sha256).hexdigest()
 
         # 4. 构建 Authorization
@@ -242,7 +336,7 @@ class ApiService:
 
         return authorization, str(timestamp)
 
-    def _build_canonical_request(self, action: str, payload: str, host: str) -> str:
+    def _build_canonical_request(self, action: str, payload: bytes, host: str) -> str:
         """构建规范请求字符串"""
         # HTTP 请求方法
         http_request_method = "POST"
@@ -255,7 +349,9 @@ class ApiService:
         # 签名的头部列表
         signed_headers = "content-type;host"
         # 请求载荷的哈希值
-        hashed_request_payload = hashlib.sha256(payload.encode('utf-8')).hexdigest()
+        if isinstance(payload, str):
+            payload = payload.encode('utf-8')
+        hashed_request_payload = hashlib.sha256(payload).hexdigest()
 
         canonical_request = f"{http_request_method}\n{canonical_uri}\n{canonical_querystring}\n{canonical_headers}\n{signed_headers}\n{hashed_request_payload}"
 
@@ -271,29 +367,49 @@ class ApiService:
     def call_second_api(self, img_str: str, prompt: str) -> Tuple[Optional[str], Optional[str]]:
         return self._call_api_by_group("second", img_str, prompt)
 
-    def _call_api_by_group(self, api_group: str, img_str: str, prompt: str) -> Tuple[Optional[str], Optional[str]]:
+    def call_text_api(self, api_group: str, prompt: str) -> Tuple[Optional[str], Optional[str]]:
+        """
+        用该组API发送一次纯文本请求（不含图片），如整理格式错误的评分输出。
+        供应商配置了 "repair_model" 时改用该（更便宜的）文本模型，否则沿用该组的模型。
+        """
+        return self._call_api_by_group(api_group, "", prompt, text_only=True)
+
+    def get_api_group_settings(self, api_group: str) -> Optional[Tuple[str, str, str]]:
+        """获取API组别对应的 (provider, api_key, model_id)，无效组别返回 None"""
+        if api_group == "first":
+            return (self.config_manager.first_api_provider, self.config_manager.first_api_key,
+                    self.config_manager.first_modelID)
+        if api_group == "second":
+            return (self.config_manager.second_api_provider, self.config_manager.second_api_key,
+                    self.config_manager.second_modelID)
+        return None
+
+    def get_retry_policy(self, api_group: str) -> RetryPolicy:
+        """获取API组别当前供应商的重试策略"""
+        settings = self.get_api_group_settings(api_group)
+        provider = settings[0] if settings else ""
+        return RetryPolicy.from_provider_config(PROVIDER_CONFIGS.get(provider, {}).get("retry"))
+
+    def _call_api_by_group(self, api_group: str, img_str: str, prompt: str,
+                           text_only: bool = False) -> Tuple[Optional[str], Optional[str]]:
         """根据API组别调用对应的预设供应商API"""
         try:
-            if api_group == "first":
-                provider = self.config_manager.first_api_provider
-                api_key = self.config_manager.first_api_key
-                model_id = self.config_manager.first_modelID
-            elif api_group == "second":
-                provider = self.config_manager.second_api_provider
-                api_key = self.config_manager.second_api_key
-                model_id = self.config_manager.second_modelID
-            else:
-                return None, "无效的API组别"
+            settings = self.get_api_group_settings(api_group)
+            if settings is None:
+                return None, ApiError("无效的API组别", CONFIG)
+            provider, api_key, model_id = settings
 
             if not all([provider, api_key, model_id]):
-                return None, f"第{api_group}组API配置不完整 (供应商、Key或模型ID为空)"
+                return None, ApiError(f"第{api_group}组API配置不完整 (供应商、Key或模型ID为空)", CONFIG)
+            if text_only:
+                model_id = PROVIDER_CONFIGS.get(provider, {}).get("repair_model") or model_id
             
             print(f"[API] 准备调用 {api_group} API, 供应商: {provider}")
             return self._execute_api_call(provider, api_key, model_id, img_str, prompt)
         except Exception as e:
             error_detail = traceback.format_exc()
             print(f"[API] 调用 {api_group} API 时发生严重错误: {str(e)}\n{error_detail}")
-            return None, f"API调用失败: {str(e)}"
+            return None, ApiError(f"API调用失败: {str(e)}", UNKNOWN)
 
     def test_api_connection(self, api_group: str) -> Tuple[bool, str]:
         """测试指定API组的连接"""
@@ -315,7 +431,9 @@ class ApiService:
                 return False, f"{group_name}API配置不完整"
 
             print(f"[API Test] 测试 {group_name} API, 供应商: {provider}")
-            result, error = self._execute_api_call(provider, api_key, model_id, img_str="", prompt="你好")
+            # 连接测试只发一句问候，不要求JSON输出
+            result, error = self._execute_api_call(provider, api_key, model_id, img_str="", prompt="你好",
+                                                   structured_output=False)
 
             provider_name = PROVIDER_CONFIGS.get(provider, {}).get("name", provider)
             if result and not error:
@@ -382,9 +500,99 @@ class ApiService:
         # 其他鉴权方法直接返回
         return api_key, None
 
-    def _execute_api_call(self, provider: str, api_key: str, model_id: str, img_str: str, prompt: str) -> Tuple[Optional[str], Optional[str]]:
+    def _execute_api_call(self, provider: str, api_key: str, model_id: str, img_str: str, prompt: str,
+                          structured_output: bool = True) -> Tuple[Optional[str], Optional[str]]:
+        """
+        同步执行一次API调用: 构建请求 -> 发送 -> 解析响应。发送时占用该供应商的一个并发名额。
+        structured_output=False 时不使用供应商的原生JSON输出模式（如连接测试）。
+        """
+        session = self.session
+        import requests  # 会话创建时已导入，这里只是取模块引用
+        dropped_features = []  # 本次调用中因被拒绝而去掉的可选功能
+        while True:
+            with self._provider_slot(provider):
+                # 在拿到并发名额后再构建请求，避免排队期间签名时间戳过期（如腾讯云签名）
+                request, error = self._prepare_api_request(provider, api_key, model_id, img_str, prompt,
+                                                           structured_output, dropped_features)
+                if error:
+                    return None, error
+                try:
+                    response = session.post(request["url"], headers=request["headers"], data=request["body"],
+                                            timeout=request["timeout"])
+                    content, error = self._parse_api_response(provider, response.status_code, response.text,
+                                                              response.headers)
+                except requests.exceptions.RequestException as e:
+                    friendly_error = self._create_network_error_message(e)
+                    return None, friendly_error
+            # 错误明确指向某个可选功能时去掉该功能立即重发；去掉后成功才记住该模型不支持它
+            feature = self._rejected_optional_feature(request, error)
+            if feature is None:
+                if content and dropped_features:
+                    for dropped in dropped_features:
+                        self._unsupported_features.add((provider, model_id, dropped))
+                    print(f"[API] {provider}/{model_id} 不支持可选功能 {'、'.join(dropped_features)}，本次运行中不再使用")
+                return content, error
+            dropped_features.append(feature)
+            print(f"[API] {provider}/{model_id} 拒绝了可选功能 {feature}，去掉后重发: {error}")
+
+    def get_provider_concurrency(self, provider: str) -> int:
+        """获取指定供应商允许的最大在途请求数"""
+        return max(1, int(PROVIDER_CONFIGS.get(provider, {}).get("max_concurrency", DEFAULT_PROVIDER_CONCURRENCY)))
+
+    def _provider_slot(self, provider: str) -> threading.Semaphore:
+        """该供应商的并发名额（with 语句中持有），首次使用时创建"""
+        semaphore = self._provider_semaphores.get(provider)
+        if semaphore is None:
+            with self._session_lock:
+                semaphore = self._provider_semaphores.setdefault(
+                    provider, threading.Semaphore(self.get_provider_concurrency(provider)))
+        return semaphore
+
+    def _get_optional_features(self, provider: str, model_id: str, img_str: str,
+                               structured_output: bool, dropped_features=()) -> Dict[str, Any]:
+        """
+        本次请求要使用的可选功能 {功能名: 参数}，作为关键字参数传给 payload 构建函数。
+        已确认不支持的功能和 dropped_features（本次调用中被拒绝的功能）不再使用。
+        """
+        config = PROVIDER_CONFIGS.get(provider, {})
+
+        def usable(feature):
+            return feature not in dropped_features and (provider, model_id, feature) not in self._unsupported_features
+
+        features = {}
+        if structured_output and config.get("structured_output") and usable("structured_output"):
+            features["structured_output"] = config["structured_output"]
+        # 只有带图片的评分请求才拆分 system/user；纯文本请求（连接测试、JSON修复）保持原样
+        if img_str and config.get("system_prompt") and usable("system_prompt"):
+            features["system_prompt"] = True
+        return features
+
+    def _rejected_optional_feature(self, request: Optional[Dict[str, Any]], error) -> Optional[str]:
+        """
+        使用了可选功能的请求被拒绝（400等参数错误），且错误内容明确提到其中某个功能时，返回该功能名，
+        调用方应去掉该功能后重发。错误内容与可选功能无关时返回 None，保留原来的错误。
+        """
+        if not request or not request.get("features") or error_category(error) != BAD_REQUEST:
+            return None
+        detail = getattr(error, "detail", "").lower()
+        for feature in request["features"]:
+            if any(keyword in detail for keyword in OPTIONAL_FEATURE_ERROR_KEYWORDS.get(feature, ())):
+                return feature
+        return None
+
+    def _prepare_api_request(self, provider: str, api_key: str, model_id: str, img_str: str, prompt: str,
+                             structured_output: bool = True,
+                             dropped_features=()) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
+        """
+        根据 PROVIDER_CONFIGS 构建一次请求所需的全部信息。
+
+        请求体在这里一次性序列化为字节串 ("body")，签名与发送共用，之后不再保留 payload 字典。
+
+        Returns:
+            tuple: ({"url", "headers", "body", "timeout", "features"}, error_message)
+        """
         if provider not in PROVIDER_CONFIGS:
-            return None, f"未知的供应商标识: {provider}"
+            return None, ApiError(f"未知的供应商标识: {provider}", CONFIG)
 
         config = PROVIDER_CONFIGS[provider]
         url = config["url"]
@@ -394,14 +602,16 @@ class ApiService:
         # 预处理API Key
         processed_key, key_error = self._preprocess_api_key(api_key, auth_method)
         if key_error:
-            return None, key_error
+            return None, ApiError(key_error, CONFIG)
 
-        # 先构建 payload，因为腾讯签名需要用到它
+        # 先构建并序列化请求体，因为腾讯签名需要用到它
+        features = self._get_optional_features(provider, model_id, img_str, structured_output, dropped_features)
         try:
             builder_func = getattr(self, config["payload_builder"])
-            payload = builder_func(model_id, img_str, prompt)
+            payload = builder_func(model_id, img_str, prompt, **features)
+            body = serialize_payload(payload)
         except Exception as e:
-            return None, f"构建请求体失败: {e}"
+            return None, ApiError(f"构建请求体失败: {e}", CONFIG)
 
         # 鉴权处理
         if auth_method == "bearer":
@@ -411,7 +621,6 @@ class ApiService:
         elif auth_method == "tencent_signature_v3":
             # 腾讯云签名方法 v3 - 使用预处理后的Key
             secret_id, secret_key = processed_key.split(":", 1)
-            payload_str = json.dumps(payload, separators=(',', ':'))
 
             # 从配置中读取服务信息，避免硬编码
             service_info = config.get("service_info", {})
@@ -422,7 +631,7 @@ class ApiService:
 
             host = service_info.get("host", "hunyuan.tencentcloudapi.com")
             authorization, timestamp = self._build_tencent_signature_v3(
-                secret_id, secret_key, service, region, action, version, payload_str, host
+                secret_id, secret_key, service, region, action, version, body, host
             )
             headers["Authorization"] = authorization
             headers["X-TC-Timestamp"] = timestamp
@@ -430,22 +639,37 @@ class ApiService:
             headers["X-TC-Action"] = action
             headers["X-TC-Region"] = region
 
+        request = {
+            "url": url,
+            "headers": headers,
+            "body": body,
+            "timeout": config.get("timeout", DEFAULT_REQUEST_TIMEOUT),
+            "features": features,
+        }
+        return request, None
+
+    def _parse_api_response(self, provider: str, status_code: int, response_text: str,
+                            headers=None) -> Tuple[Optional[str], Optional[str]]:
+        """
+        解析HTTP响应，返回 (content, error_message)。
+        error_message 为 ApiError，附带失败分类和 Retry-After，供重试策略使用。
+        """
+        if status_code != 200:
+            friendly_error = self._create_api_error_message(provider, status_code, response_text[:200])
+            retry_after = parse_retry_after(headers.get("Retry-After")) if headers else None
+            return None, ApiError(friendly_error, classify_http_status(status_code, response_text[:500]),
+                                  status_code=status_code, retry_after=retry_after, detail=response_text[:500])
+
         try:
-            response = self.session.post(url, headers=headers, json=payload, timeout=60)
-
-            if response.status_code == 200:
-                content = self._extract_response_content(response.json(), provider)
-                if content:
-                    return content, None
-                else:
-                    return None, f"API响应内容为空或无法解析。原始响应: {str(response.json())[:200]}"
-            else:
-                error_text = response.text[:200]
-                friendly_error = self._create_api_error_message(provider, response.status_code, error_text)
-                return None, friendly_error
-        except requests.exceptions.RequestException as e:
-            friendly_error = self._create_network_error_message(e)
-            return None, friendly_error
+            data = json.loads(response_text)
+        except json.JSONDecodeError:
+            # 状态码正常但响应体不是JSON，多为网关/代理的临时错误页
+            return None, ApiError(f"API响应不是有效的JSON。原始响应: {response_text[:200]}", SERVER, status_code)
+
+        content = self._extract_response_content(data, provider)
+        if content:
+            return ApiResponse(content, parse_usage(data, provider)), None
+        return None, ApiError(f"API响应内容为空或无法解析。原始响应: {str(data)[:200]}", EMPTY_RESPONSE, status_code)
 
     def _extract_response_content(self, data: Dict[str, Any], provider: str) -> Optional[str]:
         """从API响应中提取内容"""
@@ -460,6 +684,12 @@ class ApiService:
             return None # 解析失败
         return str(data) # Fallback
 
+    def _get_image_data_uri(self, img_str: str) -> str:
+        """返回JPEG图片的Data URI。截图已经是Data URI格式时原样返回，避免再拼接一份大字符串"""
+        if img_str.startswith(JPEG_DATA_URI_PREFIX):
+            return img_str
+        return JPEG_DATA_URI_PREFIX + self._get_pure_base64(img_str)
+
     def _get_pure_base64(self, img_str: str) -> str:
         if not img_str: return ""
         marker = "base64,"
@@ -469,27 +699,46 @@ class ApiService:
     # ==========================================================================
     #  各厂商专属的Payload构建函数
     # ==========================================================================
-    def _build_openai_compatible_payload(self, model_id, img_str, prompt):
+    def _build_response_format(self, structured_output: str) -> Dict[str, Any]:
+        """OpenAI兼容接口的 response_format 参数"""
+        if structured_output == "json_schema":
+            return {"type": "json_schema",
+                    "json_schema": {"name": "grading_result", "strict": True, "schema": GRADING_OUTPUT_SCHEMA}}
+        return {"type": "json_object"}
+
+    def _build_chat_messages(self, prompt, image_part, system_prompt=False):
+        """
+        OpenAI兼容格式的评分消息，图片在前，文本在后。
+        system_prompt 为 True 时Prompt放在 system 消息中作为可缓存的固定前缀，user 消息只有图片和固定指令。
+        """
+        if system_prompt:
+            return [{"role": "system", "content": prompt},
+                    {"role": "user", "content": [image_part, {"type": "text", "text": GRADING_USER_INSTRUCTION}]}]
+        return [{"role": "user", "content": [image_part, {"type": "text", "text": prompt}]}]
+
+    def _build_openai_compatible_payload(self, model_id, img_str, prompt, structured_output=None, system_prompt=False):
         """
         适用于大多数与OpenAI兼容的厂商 (Moonshot, 智谱, Baidu V2, Aliyun-Compatible等)
         核心原则: 图片在前，文本在后，以保证最大兼容性。
+        structured_output 为 "json_object"/"json_schema" 时附带 response_format，要求模型直接输出JSON。
+        system_prompt 见 _build_chat_messages。
         """
         if not img_str:
-            return {"model": model_id, "messages": [{"role": "user", "content": prompt}], "max_tokens": 4096}
-
-        pure_base64 = self._get_pure_base64(img_str)
-        return {
-            "model": model_id,
-            "messages": [{"role": "user", "content": [
-                {"type": "image_url", "image_url": {"url": f"data:image/jpeg;base64,{pure_base64}"}},
-                {"type": "text", "text": prompt}
-            ]}],
-            "max_tokens": 4096
-        }
+            payload = {"model": model_id, "messages": [{"role": "user", "content": prompt}], "max_tokens": 4096}
+        else:
+            image_part = {"type": "image_url", "image_url": {"url": self._get_image_data_uri(img_str)}}
+            payload = {
+                "model": model_id,
+                "messages": self._build_chat_messages(prompt, image_part, system_prompt),
+                "max_tokens": 4096
+            }
+        if structured_output:
+            payload["response_format"] = self._build_response_format(structured_output)
+        return payload
 
 
 
-    def _build_volcengine_payload(self, model_id, img_str, prompt):
+    def _build_volcengine_payload(self, model_id, img_str, prompt, structured_output=None, system_prompt=False):
         """
         专为火山引擎定制 - 符合官方API文档格式
 
@@ -513,35 +762,32 @@ class ApiService:
         """
         if not img_str:
             # 纯文本模式 - 不涉及图片时使用简单格式
-            return {
+            payload = {
                 "model": model_id,
                 "messages": [{"role": "user", "content": prompt}],
                 "max_tokens": 4096
             }
+            if structured_output:
+                payload["response_format"] = self._build_response_format(structured_output)
+            return payload
 
         # 视觉模式 - AI改卷专用配置
         # 按照火山引擎官方文档：image在前，text在后
-        pure_base64 = self._get_pure_base64(img_str)
-        return {
+        image_part = {
+            "type": "image_url",
+            "image_url": {
+                "url": self._get_image_data_uri(img_str),
+                "detail": "high"  # 高细节模式 - 优化手写文字识别
+            }
+        }
+        payload = {
             "model": model_id,
-            "messages": [{
-                "role": "user",
-                "content": [
-                    {
-                        "type": "image_url",
-                        "image_url": {
-                            "url": f"data:image/jpeg;base64,{pure_base64}",
-                            "detail": "high"  # 高细节模式 - 优化手写文字识别
-                        }
-                    },
-                    {
-                        "type": "text",
-                        "text": prompt
-                    }
-                ]
-            }],
+            "messages": self._build_chat_messages(prompt, image_part, system_prompt),
             "max_tokens": 4096
         }
+        if structured_output:
+            payload["response_format"] = self._build_response_format(structured_output)
+        return payload
 
 
 
@@ -591,14 +837,13 @@ class ApiService:
             }
 
         # 视觉模型支持图像输入
-        pure_base64 = self._get_pure_base64(img_str)
         return {
             "Model": model_id,
             "Messages": [{
                 "Role": "user",
                 "Contents": [
                     {"Type": "text", "Text": prompt},
-                    {"Type": "image_url", "ImageUrl": {"Url": f"data:image/jpeg;base64,{pure_base64}"}}
+                    {"Type": "image_url", "ImageUrl": {"Url": self._get_image_data_uri(img_str)}}
                 ]
             }],
             "Stream": False
@@ -645,19 +890,20 @@ class ApiService:
         return (f"【服务异常】{provider_name} 服务器返回了未处理的错误 (状态码: {status_code})。\n"
                 f"服务器响应(部分): {response_text[:100]}")
 
-    def _create_network_error_message(self, error: requests.exceptions.RequestException) -> str:
-        """根据网络异常类型，生成用户友好的信息"""
+    def _create_network_error_message(self, error: "requests.exceptions.RequestException") -> ApiError:
+        """根据网络异常类型，生成用户友好的信息（附带失败分类）"""
+        import requests  # 只在请求已经发出后调用，此时 requests 已导入
         error_str = str(error)
         if "Invalid leading whitespace" in error_str:
-            return ("【格式错误】您的 API Key 中可能包含了非法字符（如换行或多余的文字）。\n"
-                    "解决方案：请彻底清空API Key输入框，然后从官网【精确地】只复制Key本身，再粘贴回来。")
+            return ApiError("【格式错误】您的 API Key 中可能包含了非法字符（如换行或多余的文字）。\n"
+                            "解决方案：请彻底清空API Key输入框，然后从官网【精确地】只复制Key本身，再粘贴回来。", CONFIG)
 
-        if "timed out" in error_str.lower():
-            return ("【网络超时】连接API服务器超时。\n"
-                    "解决方案：请检查您的网络连接是否通畅，或稍后再试。")
+        if isinstance(error, requests.exceptions.Timeout) or "timed out" in error_str.lower():
+            return ApiError("【网络超时】连接API服务器超时。\n"
+                            "解决方案：请检查您的网络连接是否通畅，或稍后再试。", TIMEOUT)
 
         # 通用网络错误
-        return f"【网络连接失败】无法连接到API服务器。\n请检查您的网络设置和防火墙。错误详情: {error_str[:150]}"
+        return ApiError(f"【网络连接失败】无法连接到API服务器。\n请检查您的网络设置和防火墙。错误详情: {error_str[:150]}", NETWORK)
 
     def update_config_from_manager(self):
         """
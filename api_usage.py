@@ -0,0 +1,235 @@
+# --- START OF FILE api_usage.py ---
+#
+# ==============================================================================
+#  API用量 (Token Usage)
+#
+#  各供应商在响应中返回本次调用的token用量，格式各不相同:
+#  - OpenAI兼容接口: usage.prompt_tokens / completion_tokens，
+#    命中前缀缓存的输入token在 usage.prompt_tokens_details.cached_tokens（部分供应商为 usage.cached_tokens）
+#  - Gemini: usageMetadata.promptTokenCount / candidatesTokenCount / cachedContentTokenCount
+#  - 腾讯混元: Usage.PromptTokens / CompletionTokens
+#  这里统一解析为 ApiUsage。ApiService 返回的响应内容是 ApiResponse（普通字符串，
+#  另外附带 usage），调用方的 (content, error) 约定不变。
+#
+#  UsageLedger 按题目和模型累计一次运行的用量、图片大小和API耗时，并按单价表估算费用
+#  （config.ini 的 [Pricing] 段，每百万tokens的价格），用于比较供应商和控制超支。
+# ==============================================================================
+
+import threading
+from typing import Dict, NamedTuple, Optional
+
+
+class ApiUsage(NamedTuple):
+    """一次API调用的token用量（供应商未返回的字段为0）"""
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    cached_tokens: int = 0    # 输入中命中供应商前缀/上下文缓存的部分，已包含在 prompt_tokens 中
+
+    @property
+    def total_tokens(self) -> int:
+        return self.prompt_tokens + self.completion_tokens
+
+
+class ApiResponse(str):
+    """API返回的文本内容，附带本次调用的 usage（未返回用量时为 None）"""
+
+    def __new__(cls, content, usage=None):
+        response = super().__new__(cls, content)
+        response.usage = usage
+        return response
+
+
+def _to_int(value) -> int:
+    try:
+        return max(0, int(value or 0))
+    except (TypeError, ValueError):
+        return 0
+
+
+def parse_usage(data, provider: str = "") -> Optional[ApiUsage]:
+    """从响应JSON中解析token用量，没有用量信息时返回 None"""
+    if not isinstance(data, dict):
+        return None
+
+    metadata = data.get("usageMetadata")
+    if isinstance(metadata, dict):  # Gemini
+        return ApiUsage(_to_int(metadata.get("promptTokenCount")),
+                        _to_int(metadata.get("candidatesTokenCount")),
+                        _to_int(metadata.get("cachedContentTokenCount")))
+
+    usage = data.get("usage")
+    if usage is None and isinstance(data.get("Response"), dict):
+        data = data["Response"]
+    if usage is None:
+        usage = data.get("Usage")
+    if not isinstance(usage, dict):
+        return None
+
+    if "PromptTokens" in usage:  # 腾讯混元
+        return ApiUsage(_to_int(usage.get("PromptTokens")), _to_int(usage.get("CompletionTokens")))
+
+    details = usage.get("prompt_tokens_details")
+    cached = details.get("cached_tokens") if isinstance(details, dict) else usage.get("cached_tokens")
+    return ApiUsage(_to_int(usage.get("prompt_tokens")), _to_int(usage.get("completion_tokens")), _to_int(cached))
+
+
+def format_usage(usage: ApiUsage) -> str:
+    """用于日志的一行用量说明"""
+    text = f"输入 {usage.prompt_tokens} tokens"
+    if usage.cached_tokens:
+        text += f"（缓存命中 {usage.cached_tokens}）"
+    return f"{text}，输出 {usage.completion_tokens} tokens"
+
+
+class ModelPrice(NamedTuple):
+    """模型单价（每百万tokens），缓存命中的输入通常更便宜，未配置时按普通输入计价"""
+    input: float
+    output: float
+    cached_input: float
+
+
+def parse_price(text) -> Optional[ModelPrice]:
+    """解析 "输入单价, 输出单价[, 缓存输入单价]"，格式错误时返回 None"""
+    try:
+        values = [float(part) for part in str(text).replace('，', ',').split(',') if part.strip()]
+    except ValueError:
+        return None
+    if len(values) < 2 or any(value < 0 for value in values):
+        return None
+    return ModelPrice(values[0], values[1], values[2] if len(values) > 2 else values[0])
+
+
+def parse_price_table(raw_table) -> Dict[str, ModelPrice]:
+    """{"供应商/模型ID" 或 "模型ID" 或 "供应商": "单价文本"} -> {小写键: ModelPrice}，跳过格式错误的条目"""
+    table = {}
+    for key, text in (raw_table or {}).items():
+        price = parse_price(text)
+        if price is not None:
+            table[str(key).strip().lower()] = price
+    return table
+
+
+def lookup_price(price_table, provider: str, model_id: str) -> Optional[ModelPrice]:
+    """依次按 "供应商/模型ID"、"模型ID"、"供应商" 查找单价"""
+    for key in (f"{provider}/{model_id}", model_id, provider):
+        price = price_table.get(str(key).lower())
+        if price is not None:
+            return price
+    return None
+
+
+def estimate_cost(usage: ApiUsage, price: ModelPrice) -> float:
+    """按单价估算一次调用的费用"""
+    cached = min(usage.cached_tokens, usage.prompt_tokens)
+    return ((usage.prompt_tokens - cached) * price.input + cached * price.cached_input
+            + usage.completion_tokens * price.output) / 1_000_000
+
+
+def base64_byte_size(img_str) -> int:
+    """base64（或Data URI）图片解码后的字节数"""
+    if not img_str:
+        return 0
+    pos = img_str.find("base64,")
+    data_length = len(img_str) - (pos + len("base64,") if pos != -1 else 0)
+    return max(0, data_length * 3 // 4 - img_str.count('=', -2))
+
+
+def _new_bucket():
+    return {'calls': 0, 'prompt_tokens': 0, 'completion_tokens': 0, 'cached_tokens': 0,
+            'image_bytes': 0, 'api_seconds': 0.0, 'estimated_cost': 0.0, 'unpriced_calls': 0}
+
+
+class UsageLedger:
+    """累计一次阅卷运行的API用量与估算费用（可在多个线程中调用 record）"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self, raw_price_table=None):
+        """开始新的一次运行，raw_price_table 为配置中的单价表"""
+        with self._lock:
+            self._price_table = parse_price_table(raw_price_table)
+            self._total = _new_bucket()
+            self._by_question = {}
+            self._by_model = {}
+
+    def record(self, question_index, provider, model_id, usage: ApiUsage, image_bytes=0, api_seconds=0.0):
+        """
+        记录一次API调用。
+
+        Returns:
+            本次调用的估算费用；该模型未配置单价时为 None
+        """
+        price = lookup_price(self._price_table, provider, model_id)
+        cost = estimate_cost(usage, price) if price is not None else None
+        with self._lock:
+            buckets = (self._total,
+                       self._by_question.setdefault(question_index, _new_bucket()),
+                       self._by_model.setdefault(f"{provider}/{model_id}", _new_bucket()))
+            for bucket in buckets:
+                bucket['calls'] += 1
+                bucket['prompt_tokens'] += usage.prompt_tokens
+                bucket['completion_tokens'] += usage.completion_tokens
+                bucket['cached_tokens'] += usage.cached_tokens
+                bucket['image_bytes'] += image_bytes
+                bucket['api_seconds'] += api_seconds
+                if cost is None:
+                    bucket['unpriced_calls'] += 1
+                else:
+                    bucket['estimated_cost'] += cost
+        return cost
+
+    @property
+    def tokens_used(self) -> int:
+        with self._lock:
+            return self._total['prompt_tokens'] + self._total['completion_tokens']
+
+    @property
+    def estimated_cost(self) -> Optional[float]:
+        """已配置单价部分的累计费用；没有任何调用能计价时为 None"""
+        with self._lock:
+            if self._total['calls'] == self._total['unpriced_calls']:
+                return None
+            return self._total['estimated_cost']
+
+    def summary(self):
+        """
+        本次运行的用量汇总（写入汇总记录）。
+
+        Returns:
+            dict: 总计字段（calls, prompt_tokens, completion_tokens, cached_tokens, image_bytes,
+                  api_seconds, estimated_cost, unpriced_calls），以及按题目的 'by_question'
+                  和按 "供应商/模型ID" 的 'by_model'
+        """
+        with self._lock:
+            summary = dict(self._total)
+            summary['by_question'] = {str(q): dict(bucket) for q, bucket in self._by_question.items()}
+            summary['by_model'] = {model: dict(bucket) for model, bucket in self._by_model.items()}
+        return summary
+
+
+def _format_bucket(bucket):
+    text = (f"{bucket['calls']} 次调用，输入 {bucket['prompt_tokens']:,} tokens"
+            f"（缓存命中 {bucket['cached_tokens']:,}），输出 {bucket['completion_tokens']:,} tokens，"
+            f"图片 {bucket['image_bytes'] / 1024 / 1024:.1f} MB，API耗时 {bucket['api_seconds']:.1f} 秒")
+    if bucket['calls'] > bucket['unpriced_calls']:
+        text += f"，估算费用 {bucket['estimated_cost']:.4f}"
+        if bucket['unpriced_calls']:
+            text += f"（{bucket['unpriced_calls']} 次调用未配置单价，未计入）"
+    return text
+
+
+def format_usage_summary(summary):
+    """把 UsageLedger.summary() 格式化为多行文字（用于汇总记录和日志）"""
+    if not summary or not summary.get('calls'):
+        return []
+    lines = [f"合计: {_format_bucket(summary)}"]
+    for question_index, bucket in summary.get('by_question', {}).items():
+        lines.append(f"第{question_index}题: {_format_bucket(bucket)}")
+    if len(summary.get('by_model', {})) > 1:
+        for model, bucket in summary['by_model'].items():
+            lines.append(f"{model}: {_format_bucket(bucket)}")
+    return lines
+
+# --- END OF FILE api_usage.py ---
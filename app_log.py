@@ -0,0 +1,109 @@
+# --- START OF FILE app_log.py ---
+#
+# ==============================================================================
+#  运行日志 (Bounded Log View + Rotating Log File)
+#
+#  日志区原先每条消息都向 QTextBrowser 追加一段HTML，阅卷线程每题发出十几条日志，
+#  其中还有完整的AI原始响应和异常堆栈；阅几千份之后控件里有几MB富文本，追加越来越慢。
+#  现在:
+#  - 每条日志都写入滚动的日志文件（日志/运行日志.log，单个文件达到上限后轮换）
+#  - 界面只显示不低于日志级别的消息（默认不显示 DEBUG 级的过程细节），超长消息截断
+#  - 待显示的消息先放进 LogBuffer，由主窗口定时器合并成一次界面更新
+#  - 日志区最多保留 view_max_lines 条，更早的自动移除（环形缓冲）
+# ==============================================================================
+
+import collections
+import logging
+import logging.handlers
+import os
+import threading
+
+DEBUG = logging.DEBUG
+INFO = logging.INFO
+ERROR = logging.ERROR
+LEVEL_NAMES = {'DEBUG': DEBUG, 'INFO': INFO, 'ERROR': ERROR}
+
+LOGGER_NAME = "grading_app"
+LOG_FILE_NAME = "运行日志.log"
+LOG_FILE_BACKUPS = 5
+# 界面上单条消息最多显示的字符数，完整内容见日志文件
+MAX_VIEW_MESSAGE_CHARS = 2000
+
+_logger = logging.getLogger(LOGGER_NAME)
+
+
+def parse_level(level_name, default=INFO):
+    """把配置中的级别名称（DEBUG/INFO/ERROR）转换为 logging 级别"""
+    return LEVEL_NAMES.get(str(level_name).strip().upper(), default)
+
+
+def setup_file_logging(log_dir, max_mb=5, backup_count=LOG_FILE_BACKUPS):
+    """
+    配置滚动日志文件，所有级别的消息都会写入。重复调用时不会重复添加 handler。
+
+    Returns:
+        日志文件路径；创建失败时返回 None（只在界面显示日志）
+    """
+    log_path = os.path.join(log_dir, LOG_FILE_NAME)
+    for handler in _logger.handlers:
+        if isinstance(handler, logging.handlers.RotatingFileHandler):
+            return handler.baseFilename
+    try:
+        os.makedirs(log_dir, exist_ok=True)
+        handler = logging.handlers.RotatingFileHandler(
+            log_path, maxBytes=max(1, int(max_mb)) * 1024 * 1024, backupCount=backup_count, encoding='utf-8')
+    except OSError:
+        return None
+    handler.setFormatter(logging.Formatter("%(asctime)s [%(levelname)s] %(message)s"))
+    _logger.addHandler(handler)
+    _logger.setLevel(DEBUG)
+    _logger.propagate = False
+    return log_path
+
+
+def truncate_for_view(message):
+    """超长消息（原始响应、异常堆栈）在界面上只显示开头部分"""
+    if len(message) <= MAX_VIEW_MESSAGE_CHARS:
+        return message
+    return f"{message[:MAX_VIEW_MESSAGE_CHARS]} ...（共 {len(message)} 字，完整内容见日志文件）"
+
+
+class LogBuffer:
+    """
+    日志消息缓冲：写入日志文件，并把需要显示的消息暂存，等待界面定时取走。
+    可在任意线程调用 add。
+    """
+
+    def __init__(self, max_entries=5000, view_level=INFO):
+        self.max_entries = max(100, int(max_entries))
+        self.view_level = view_level
+        self._pending = collections.deque(maxlen=self.max_entries)
+        self._lock = threading.Lock()
+        self.dropped_count = 0  # 界面来不及显示、被挤出缓冲的消息数
+
+    def add(self, level, message):
+        """
+        记录一条日志。
+
+        Returns:
+            True 表示该消息需要在界面上显示
+        """
+        message = str(message)
+        _logger.log(level, message)
+        if level < self.view_level:
+            return False
+        with self._lock:
+            if len(self._pending) == self._pending.maxlen:
+                self.dropped_count += 1
+            self._pending.append((level, truncate_for_view(message)))
+        return True
+
+    def take_pending(self):
+        """取出所有待显示的消息 [(级别, 文本)]，以及此前被挤出的条数"""
+        with self._lock:
+            entries = list(self._pending)
+            self._pending.clear()
+            dropped, self.dropped_count = self.dropped_count, 0
+        return entries, dropped
+
+# --- END OF FILE app_log.py ---
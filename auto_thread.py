@@ -2,13 +2,24 @@ import os
 import time
 import base64
 import traceback
-import pyautogui
 import datetime
-from io import BytesIO
-from PIL import ImageGrab
 from PyQt5.QtCore import QThread, pyqtSignal
+from concurrent.futures import Future, ThreadPoolExecutor
+import threading
 import math
 import json
+import uuid
+
+from config_manager import get_app_base_dir
+from api_usage import UsageLedger, base64_byte_size, format_usage, format_usage_summary
+from grading_schema import build_json_repair_prompt
+from prompt_plan import PromptPlan, estimate_tokens
+from response_cache import ResponseCache
+from retry_policy import (CATEGORY_LABELS, EMPTY_RESPONSE, MALFORMED_OUTPUT, RetryPolicy, error_category)
+from run_tracer import RunTracer, format_stage_stats
+from image_processing import (DEFAULT_INK_RATIO_THRESHOLD, ImagePreprocessOptions, compute_fingerprint,
+                              detect_blank_answer, encode_jpeg, fingerprint_distance, load_blank_template,
+                              preprocess_answer_image)
 
 
 # 函数：将数值四舍五入到最接近的0.5的倍数
@@ -20,12 +31,25 @@ def round_to_nearest_half(value: float) -> float:
     return math.floor(value * 2 + 0.5) / 2.0
 
 
+def _get_pyautogui():
+    """pyautogui 导入较慢（会连带加载截图、消息框等依赖），首次操作网页时才导入，不拖慢程序启动"""
+    import pyautogui
+    return pyautogui
+
+
+def _grab_screen(bbox):
+    """截取屏幕区域；PIL.ImageGrab 同样在首次截图时才导入"""
+    from PIL import ImageGrab
+    return ImageGrab.grab(bbox=bbox)
+
+
 class AutoThread(QThread):
     """自动阅卷线程，负责执行自动阅卷流程"""
 
     # 定义信号
     # update_signal = pyqtSignal(str)  # 更新建议文本
     log_signal = pyqtSignal(str, bool)  # 日志信息，带错误标志
+    debug_log_signal = pyqtSignal(str)  # 过程细节日志（解析步骤、图片尺寸等），默认只写入日志文件
     progress_signal = pyqtSignal(int, int)  # 进度信息，当前进度和总进度
     record_signal = pyqtSignal(dict)  # 记录信号，发送阅卷记录
     error_signal = pyqtSignal(str)  # 错误信号
@@ -43,6 +67,7 @@ class AutoThread(QThread):
         self.completion_status = "running"
         self.completed_count = 0
         self.interrupt_reason = ""
+        self.run_id = ""  # 每次运行的唯一ID，关联同一次阅卷的详细记录与汇总记录
 
         # API配置信息存储
         self.first_model_id = ""
@@ -52,8 +77,32 @@ class AutoThread(QThread):
         self.is_single_question_one_run = False
         self.total_question_count_in_run = 0 # 本次运行的总题数
 
+        # AI响应缓存（跨多次运行复用，首次启用时创建）
+        self.response_cache = None
+        self._response_cache_instance = None
+
+        # 翻页检测：轮询间隔、判定"已变化"与"已稳定"的指纹差异比例
+        self.page_poll_interval = 0.15
+        self.page_changed_ratio = 0.01
+        self.page_stable_ratio = 0.003
+
+        # 本地空白作答检测
+        self.local_blank_count = 0
+        self._blank_templates = {}  # {question_index: 空白模板图像或None}，每次运行重新加载
+
+        # 各阶段耗时统计（截图、编码、API请求、分数输入等），每次运行重新开始
+        self.tracer = RunTracer()
+
+        # API用量与估算费用（按题目/模型汇总），每次运行重新开始
+        self.usage_ledger = UsageLedger()
+
+        # 预编译的Prompt: {(科目, 题型, 评分细则): Prompt文本}（跨运行复用），
+        # 以及本次运行各题使用的 {question_index: PromptPlan}
+        self._prompt_memo = {}
+        self._prompt_plans = {}
+
     # --- 新增的Prompt构建方法 ---
-    def _get_common_system_message(self):
+    def _get_subject(self):
         subject = "通用"  # 默认科目设置为 "通用"
 
         if hasattr(self.api_service, 'config_manager') and self.api_service.config_manager:
@@ -65,7 +114,10 @@ class AutoThread(QThread):
                 subject = subject_from_config
             # 否则 (配置为空、纯空格、或不存在科目配置), subject 保持为 "通用"
         # 如果 config_manager 本身不存在, subject 也保持为 "通用"
+        return subject
 
+    def _get_common_system_message(self):
+        subject = self._get_subject()
         return (
             f"你是一位经验丰富、严谨细致的【{subject}】资深阅卷老师。"
             "你的核心任务是：根据用户提供的【评分细则】和【题目类型说明】，对学生答案的图片内容进行深入分析和准确评分。"
@@ -107,7 +159,7 @@ class AutoThread(QThread):
             }
           }
         }
-        return json.dumps(prompt_json, ensure_ascii=False, indent=2)
+        return self._serialize_prompt(prompt_json)
 
     def _build_subjective_pointbased_prompt(self, standard_answer_rubric):
         prompt_json = {
@@ -132,7 +184,7 @@ class AutoThread(QThread):
             }
           }
         }
-        return json.dumps(prompt_json, ensure_ascii=False, indent=2)
+        return self._serialize_prompt(prompt_json)
 
     def _build_formula_proof_prompt(self, standard_answer_rubric):
         prompt_json = {
@@ -157,7 +209,7 @@ class AutoThread(QThread):
             }
           }
         }
-        return json.dumps(prompt_json, ensure_ascii=False, indent=2)
+        return self._serialize_prompt(prompt_json)
 
     def _build_holistic_evaluation_prompt(self, standard_answer_rubric):
         prompt_json = {
@@ -182,11 +234,19 @@ class AutoThread(QThread):
             }
           }
         }
-        return json.dumps(prompt_json, ensure_ascii=False, indent=2)
+        return self._serialize_prompt(prompt_json)
+
+    def _serialize_prompt(self, prompt_json):
+        """紧凑序列化（无缩进和多余空格），内容与带缩进的版本相同但输入token更少"""
+        return json.dumps(prompt_json, ensure_ascii=False, separators=(',', ':'))
+
+    # Prompt缓存的最大条目数（科目/题型/评分细则的组合），超出后清空重建
+    MAX_PROMPT_MEMO_ENTRIES = 64
 
     def select_and_build_prompt(self, standard_answer, question_type):
         """
         根据题目类型选择并构建相应的Prompt。
+        相同的 (科目, 题型, 评分细则) 只构建一次，之后直接返回缓存的文本。
         """
         # 确保 standard_answer 是字符串类型，如果不是，尝试转换或记录错误
         if not isinstance(standard_answer, str):
@@ -206,18 +266,56 @@ class AutoThread(QThread):
             self._set_error_state(error_msg)
             return None # 中断处理
 
+        memo_key = (self._get_subject(), question_type, standard_answer)
+        prompt = self._prompt_memo.get(memo_key)
+        if prompt is not None:
+            return prompt
 
         if question_type == "Objective_FillInTheBlank": # 更新了类型名称
-            return self._build_objective_fillintheblank_prompt(standard_answer)
+            prompt = self._build_objective_fillintheblank_prompt(standard_answer)
         elif question_type == "Subjective_PointBased_QA":
-            return self._build_subjective_pointbased_prompt(standard_answer)
+            prompt = self._build_subjective_pointbased_prompt(standard_answer)
         elif question_type == "Formula_Proof_StepBased":
-            return self._build_formula_proof_prompt(standard_answer)
+            prompt = self._build_formula_proof_prompt(standard_answer)
         elif question_type == "Holistic_Evaluation_Open":
-            return self._build_holistic_evaluation_prompt(standard_answer)
+            prompt = self._build_holistic_evaluation_prompt(standard_answer)
         else:
             self.log_signal.emit(f"未知的题目类型: '{question_type}'，将使用默认的按点给分主观题Prompt。", True)
-            return self._build_subjective_pointbased_prompt(standard_answer)
+            prompt = self._build_subjective_pointbased_prompt(standard_answer)
+
+        if len(self._prompt_memo) >= self.MAX_PROMPT_MEMO_ENTRIES:
+            self._prompt_memo.clear()
+        self._prompt_memo[memo_key] = prompt
+        return prompt
+
+    def compile_prompt_plans(self, question_configs):
+        """
+        运行开始时为每道题编译一次Prompt，本次运行的所有答卷复用，并在日志中给出估算token数。
+
+        Returns:
+            {question_index: PromptPlan}；评分细则无效时返回 None（已设置错误状态）
+        """
+        plans = {}
+        subject = self._get_subject()
+        for q_idx, q_config in enumerate(question_configs):
+            question_index = q_config.get('question_index', q_idx + 1)
+            question_type = q_config.get('question_type', 'Subjective_PointBased_QA') # 提供一个默认值
+            if not question_type: # 如果配置中 question_type 为空字符串或None
+                self.log_signal.emit(f"警告：第 {question_index} 题未配置题目类型，将使用默认类型 'Subjective_PointBased_QA'。", True)
+                question_type = 'Subjective_PointBased_QA'
+
+            with self.tracer.span("构建Prompt", question=question_index):
+                prompt = self.select_and_build_prompt(q_config.get('standard_answer', ''), question_type)
+            if prompt is None:
+                # select_and_build_prompt 内部已调用 _set_error_state 并记录了详细错误
+                return None
+
+            plan = PromptPlan(question_index, question_type, subject, prompt, estimate_tokens(prompt))
+            plans[question_index] = plan
+            self.log_signal.emit(
+                f"第 {question_index} 题Prompt已编译（{question_type}）：{len(prompt)} 字，约 {plan.estimated_tokens} tokens", False)
+        self._prompt_plans = plans
+        return plans
     # --- 结束新增的Prompt构建方法 ---
 
     def _set_error_state(self, reason):
@@ -233,6 +331,11 @@ class AutoThread(QThread):
         self.completion_status = "running"
         self.completed_count = 0
         self.interrupt_reason = ""
+        self.run_id = uuid.uuid4().hex
+        self.local_blank_count = 0
+        self._blank_templates = {}
+        self.tracer.reset()
+        self.usage_ledger.reset(self.parameters.get('price_table'))
         self.running = True
         self.log_signal.emit("自动阅卷线程已启动", False)
 
@@ -243,6 +346,8 @@ class AutoThread(QThread):
             question_configs = self.parameters.get('question_configs', [])
             dual_evaluation = self.parameters.get('dual_evaluation', False)
             score_diff_threshold = self.parameters.get('score_diff_threshold', 10)
+            concurrent_grading = self.parameters.get('concurrent_grading', False)
+            self._setup_response_cache()
 
             if not question_configs:
                 self._set_error_state("未配置题目信息")
@@ -251,134 +356,47 @@ class AutoThread(QThread):
             # 在运行开始时，获取本次运行的总题目数
             self.total_question_count_in_run = len(question_configs)
 
+            # 科目、题型和评分细则在本次运行中不变，Prompt只编译一次
+            if self.compile_prompt_plans(question_configs) is None:
+                return
+
+            # 多题并发模式：要求所有启用题目的答案区域同屏显示，
+            # 即除最后一题外，其余题目均不能配置翻页
+            if concurrent_grading and len(question_configs) > 1:
+                if any(q.get('enable_next_button', False) for q in question_configs[:-1]):
+                    self.log_signal.emit("多题并发模式要求各题答案区域同屏显示（仅最后一题可配置翻页），已回退为逐题阅卷。", True)
+                    concurrent_grading = False
+            else:
+                concurrent_grading = False
+
             # 记录开始时间
             start_time = time.time()
             elapsed_time = 0
 
-            # 执行循环
-            for i in range(cycle_number):
-                if not self.running:
-                    break
-
-                self.log_signal.emit(f"开始第 {i+1}/{cycle_number} 次阅卷", False)
-
-                # 遍历每个题目
-                for q_idx, q_config in enumerate(question_configs):
-                    if not self.running:
-                        break
-
-                    question_index = q_config.get('question_index', q_idx + 1)
-                    self.log_signal.emit(f"正在处理第 {question_index} 题", False)
-
-                    # 设置当前题目索引
-                    self.api_service.set_current_question(question_index)
-
-                    # 获取题目配置
-                    score_input_pos = q_config.get('score_input_pos', (0, 0))
-                    confirm_button_pos = q_config.get('confirm_button_pos', (0, 0))
-                    standard_answer = q_config.get('standard_answer', '')
-                    # subject = q_config.get('subject', '')
-
-                    # 检查位置配置
-                    if score_input_pos == (0, 0) or confirm_button_pos == (0, 0):
-                        self._set_error_state(f"第 {question_index} 题未配置位置信息")
-                        break
-
-                    # 获取当前题目的答案区域
-                    answer_area_data = q_config.get('answer_area', {})
-                    if not answer_area_data or not all(key in answer_area_data for key in ['x1', 'y1', 'x2', 'y2']):
-                        self._set_error_state(f"第 {question_index} 题未配置答案区域")
-                        break
-
-                    # --- 新增：获取题目类型 ---
-                    question_type = q_config.get('question_type', 'Subjective_PointBased_QA') # 提供一个默认值
-                    if not question_type: # 如果配置中 question_type 为空字符串或None
-                        self.log_signal.emit(f"警告：第 {question_index} 题未配置题目类型，将使用默认类型 'Subjective_PointBased_QA'。", True)
-                        question_type = 'Subjective_PointBased_QA'
-                    # --- 结束新增 ---
-
-                    # 截取答案区域
-                    x1 = answer_area_data.get('x1', 0)
-                    y1 = answer_area_data.get('y1', 0)
-                    x2 = answer_area_data.get('x2', 0)
-                    y2 = answer_area_data.get('y2', 0)
-
-                    # 确保 x1, y1 是左上角坐标
-                    x = min(x1, x2)
-                    y = min(y1, y2)
-                    width = abs(x2 - x1)
-                    height = abs(y2 - y1)
-
-                    answer_area_tuple = (x, y, width, height)
-
-                    img_str = self.capture_answer_area(answer_area_tuple)
-                    if not img_str:
-                        # capture_answer_area 内部如果失败会调用 _set_error_state 并设置 self.running = False
-                        if not self.running: break # 如果截取失败导致线程停止
-                        continue # 跳过当前题目
-
-                    # --- 构建新的JSON Prompt ---
-                    self.log_signal.emit(f"为第 {question_index} 题 (类型: {question_type}) 构建Prompt...", False)
-                    text_prompt_for_api = self.select_and_build_prompt(standard_answer, question_type)
-
-                    if text_prompt_for_api is None:
-                        # select_and_build_prompt 内部已调用 _set_error_state,
-                        # self.running 应该已经是 False.
-                        # _set_error_state 已经记录了详细错误，这里不再重复记录。
-                        if not self.running: break # 确保跳出内层题目循环
-                        continue # 理论上不应执行到这里如果 self.running 为 False
-                    # --- 结束构建Prompt ---
-
-                    # 调用API进行评分
-                    eval_result = self.evaluate_answer(
-                        img_str, text_prompt_for_api, q_config, dual_evaluation, score_diff_threshold
-                    )
-
-                    # 检查是否完全失败（线程已停止）
-                    if eval_result is None:
-                        if not self.running: break
-                        continue
-
-                    score, reasoning_data, itemized_scores_data, confidence_data, raw_ai_response = eval_result
-
-                    # 如果评分处理失败，仍然记录错误信息，但不输入分数
-                    if score is None:
-                        self.log_signal.emit(f"第 {question_index} 题评分失败，将记录错误信息但跳过分数输入", True)
-                        # 记录失败的阅卷结果
-                        self.record_grading_result(question_index, 0, img_str, reasoning_data, itemized_scores_data, confidence_data)
-                        if not self.running: break
-                        continue
-
-                    # 输入分数
-                    self.input_score(score, score_input_pos, confirm_button_pos, q_config)
+            executor = None
+            if concurrent_grading:
+                max_workers = max(1, int(self.parameters.get('max_concurrent_requests', len(question_configs))))
+                executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="grading")
+                self.log_signal.emit(f"已启用多题并发阅卷，最大并发请求数: {max_workers}", False)
 
+            try:
+                # 执行循环
+                for i in range(cycle_number):
                     if not self.running:
                         break
 
-                    # 更新进度和已完成数量
-                    self.completed_count = (q_idx + 1) + i * len(question_configs)
-                    total = cycle_number * len(question_configs)
-                    self.progress_signal.emit(self.completed_count, total)
+                    self.log_signal.emit(f"开始第 {i+1}/{cycle_number} 次阅卷", False)
 
-                    # 记录阅卷结果
-                    self.record_grading_result(question_index, score, img_str, reasoning_data, itemized_scores_data, confidence_data, raw_ai_response)
-
-                    # ... (后续的等待和翻页逻辑不变) ...
-
-                    # 等待指定时间
-                    if self.running and wait_time > 0:
-                        time.sleep(wait_time)
-
-                    # 获取当前小题的翻页配置
-                    current_q_enable_next = q_config.get('enable_next_button', False)
-                    current_q_next_pos = q_config.get('next_button_pos', None)
-
-                    if self.running and current_q_enable_next and current_q_next_pos and current_q_next_pos != (0, 0):
-                        self.log_signal.emit(f"第 {question_index} 题配置了翻页，正在执行翻页...", False)
-                        pyautogui.click(current_q_next_pos[0], current_q_next_pos[1])
-                        time.sleep(2)  # 等待页面加载
-
-                # 翻页逻辑已移至每个小题处理之后
+                    with self.tracer.span("整份答卷", cycle=i + 1):
+                        if executor:
+                            self._grade_paper_concurrently(executor, i, cycle_number, question_configs, wait_time,
+                                                           dual_evaluation, score_diff_threshold)
+                        else:
+                            self._grade_paper_sequentially(i, cycle_number, question_configs, wait_time,
+                                                           dual_evaluation, score_diff_threshold)
+            finally:
+                if executor:
+                    executor.shutdown(wait=False)
 
             # 计算总用时
             elapsed_time = time.time() - start_time
@@ -412,6 +430,346 @@ class AutoThread(QThread):
             else:
                 self.error_signal.emit(self.interrupt_reason or "未知错误")
 
+    def _setup_response_cache(self):
+        """根据运行参数启用/停用响应缓存，并清零本次运行的命中计数"""
+        if not self.parameters.get('response_cache_enabled', False):
+            self.response_cache = None
+            return
+        max_bytes = int(self.parameters.get('response_cache_max_mb', 200)) * 1024 * 1024
+        try:
+            if self._response_cache_instance is None:
+                cache_dir = os.path.join(get_app_base_dir(), "阅卷记录", ".response_cache")
+                self._response_cache_instance = ResponseCache(cache_dir, max_bytes)
+            else:
+                self._response_cache_instance.max_bytes = max_bytes
+        except OSError as e:
+            self.log_signal.emit(f"响应缓存初始化失败，本次不使用缓存: {e}", True)
+            self.response_cache = None
+            return
+        self._response_cache_instance.reset_stats()
+        self.response_cache = self._response_cache_instance
+
+    def _grade_paper_sequentially(self, cycle_index, cycle_number, question_configs, wait_time,
+                                  dual_evaluation, score_diff_threshold):
+        """逐题阅卷：截图 -> 调用API -> 输入分数，完成一题后再处理下一题"""
+        for q_idx, q_config in enumerate(question_configs):
+            if not self.running:
+                break
+
+            prepared = self._prepare_question(q_config, q_idx)
+            if prepared is None:
+                # _prepare_question 内部出错时已调用 _set_error_state
+                if not self.running: break
+                continue
+            question_index, img_str, text_prompt_for_api, blank_check = prepared
+
+            if blank_check is not None:
+                # 本地判定为空白作答，不调用API
+                eval_result = self._build_local_blank_result(q_config, blank_check)
+            else:
+                # 调用API进行评分
+                eval_result = self.evaluate_answer(
+                    img_str, text_prompt_for_api, q_config, dual_evaluation, score_diff_threshold
+                )
+
+            self._finish_question(eval_result, q_config, q_idx, question_index, img_str,
+                                  cycle_index, cycle_number, len(question_configs), wait_time,
+                                  grading_source="local-blank" if blank_check is not None else "api")
+
+    def _grade_paper_concurrently(self, executor, cycle_index, cycle_number, question_configs, wait_time,
+                                  dual_evaluation, score_diff_threshold):
+        """
+        多题并发阅卷：先截取本页所有题目的答案区域，再把各题的API调用并行提交到线程池，
+        最后按题目顺序依次等待结果并输入分数。整页耗时约等于最慢的一次API调用。
+        """
+        prepared_questions = []
+        for q_idx, q_config in enumerate(question_configs):
+            if not self.running:
+                return
+            prepared = self._prepare_question(q_config, q_idx)
+            if prepared is None:
+                # 并发模式下各题分数需按顺序输入，任何一题准备失败都不再继续本页
+                if self.running:
+                    self._set_error_state(f"第 {q_config.get('question_index', q_idx + 1)} 题准备失败，多题并发阅卷中止")
+                return
+            prepared_questions.append((q_idx, q_config, prepared))
+
+        futures = []
+        for q_idx, q_config, (question_index, img_str, text_prompt_for_api, blank_check) in prepared_questions:
+            if blank_check is not None:
+                # 本地判定为空白作答，直接生成结果，不占用API并发名额
+                future = Future()
+                future.set_result(self._build_local_blank_result(q_config, blank_check))
+            else:
+                future = executor.submit(
+                    self.evaluate_answer, img_str, text_prompt_for_api, q_config, dual_evaluation, score_diff_threshold
+                )
+            futures.append(future)
+
+        last_q_idx = len(question_configs) - 1
+        try:
+            for (q_idx, q_config, (question_index, img_str, _, blank_check)), future in zip(prepared_questions, futures):
+                if not self.running:
+                    break
+                eval_result = future.result()
+                if not self.running:
+                    break
+                # 同屏的各题只在最后一题输入完成后等待/翻页
+                self._finish_question(eval_result, q_config, q_idx, question_index, img_str,
+                                      cycle_index, cycle_number, len(question_configs),
+                                      wait_time if q_idx == last_q_idx else 0,
+                                      grading_source="local-blank" if blank_check is not None else "api")
+        finally:
+            # 中途停止时取消尚未开始的请求（兼容 Python 3.8，不依赖 shutdown 的 cancel_futures 参数）
+            for future in futures:
+                future.cancel()
+
+    def _prepare_question(self, q_config, q_idx):
+        """
+        校验题目配置、截取答案区域，并取出运行开始时编译好的Prompt。
+
+        Returns:
+            (question_index, img_str, prompt, blank_check) 元组；失败时返回 None。
+            本地判定为空白作答时 blank_check 为 BlankCheckResult 且 prompt 为 None，否则 blank_check 为 None
+        """
+        question_index = q_config.get('question_index', q_idx + 1)
+        self.log_signal.emit(f"正在处理第 {question_index} 题", False)
+
+        # 设置当前题目索引
+        self.api_service.set_current_question(question_index)
+
+        # 获取题目配置
+        score_input_pos = q_config.get('score_input_pos', (0, 0))
+        confirm_button_pos = q_config.get('confirm_button_pos', (0, 0))
+        # 检查位置配置
+        if score_input_pos == (0, 0) or confirm_button_pos == (0, 0):
+            self._set_error_state(f"第 {question_index} 题未配置位置信息")
+            return None
+
+        # 获取当前题目的答案区域
+        answer_area_data = q_config.get('answer_area', {})
+        if not answer_area_data or not all(key in answer_area_data for key in ['x1', 'y1', 'x2', 'y2']):
+            self._set_error_state(f"第 {question_index} 题未配置答案区域")
+            return None
+
+        screenshot = self.grab_answer_area(self._get_answer_area_tuple(answer_area_data))
+        if screenshot is None:
+            # grab_answer_area 内部如果失败会调用 _set_error_state 并设置 self.running = False
+            return None
+
+        img_str = self.encode_answer_image(screenshot, q_config)
+        if not img_str:
+            return None
+
+        blank_check = self._check_blank_answer(screenshot, question_index)
+        if blank_check is not None:
+            self.log_signal.emit(
+                f"第 {question_index} 题判定为空白作答（墨迹占比 {blank_check.ink_ratio:.2%}），跳过API调用", False)
+            return question_index, img_str, None, blank_check
+
+        # Prompt已在运行开始时编译（见 compile_prompt_plans）
+        plan = self._prompt_plans.get(question_index)
+        if plan is None:
+            self._set_error_state(f"第 {question_index} 题的Prompt未编译")
+            return None
+        return question_index, img_str, plan.prompt, None
+
+    def _check_blank_answer(self, screenshot, question_index):
+        """本地空白作答检测，判定为空白时返回 BlankCheckResult，否则（或未启用时）返回 None"""
+        if not self.parameters.get('blank_detection_enabled', False):
+            return None
+        span_start = time.perf_counter()
+        try:
+            if question_index not in self._blank_templates:
+                self._blank_templates[question_index] = load_blank_template(
+                    self.parameters.get('blank_template_dir'), question_index, screenshot.size)
+            result = detect_blank_answer(
+                screenshot,
+                template=self._blank_templates[question_index],
+                ink_ratio_threshold=self.parameters.get('blank_ink_ratio_threshold', DEFAULT_INK_RATIO_THRESHOLD)
+            )
+        except Exception as e:
+            # 检测失败不影响阅卷，交由AI评分
+            self.log_signal.emit(f"第 {question_index} 题空白检测出错，将调用API评分: {str(e)}", True)
+            return None
+        finally:
+            self.tracer.add("空白检测", span_start, time.perf_counter() - span_start, question=question_index)
+        return result if result.is_blank else None
+
+    def _build_local_blank_result(self, q_config, blank_check):
+        """为本地判定的空白作答构造与 evaluate_answer 相同格式的结果，得分为该题最低分"""
+        self.local_blank_count += 1
+        min_score = q_config.get('min_score', self.min_score)
+        template_note = "，已与空白模板比较" if blank_check.used_template else ""
+        reasoning = (
+            "空白作答（本地检测）",
+            f"答案区域墨迹占比 {blank_check.ink_ratio:.2%}{template_note}，判定为未作答，按最低分 {min_score} 分处理，未调用AI。"
+        )
+        return float(min_score), reasoning, [], None, None
+
+    def _get_answer_area_tuple(self, answer_area_data):
+        """将配置中的答案区域 {'x1','y1','x2','y2'} 转换为 (x, y, width, height)"""
+        x1 = answer_area_data.get('x1', 0)
+        y1 = answer_area_data.get('y1', 0)
+        x2 = answer_area_data.get('x2', 0)
+        y2 = answer_area_data.get('y2', 0)
+
+        # 确保 x, y 是左上角坐标
+        return min(x1, x2), min(y1, y2), abs(x2 - x1), abs(y2 - y1)
+
+    def _finish_question(self, eval_result, q_config, q_idx, question_index, img_str,
+                         cycle_index, cycle_number, question_count, wait_time, grading_source="api"):
+        """
+        处理单题评分结果：输入分数、更新进度、记录结果、等待与翻页
+
+        grading_source: 评分来源，"api" 为AI评分，"local-blank" 为本地空白检测
+        """
+        # 检查是否完全失败（线程已停止）
+        if eval_result is None:
+            return
+
+        score, reasoning_data, itemized_scores_data, confidence_data, raw_ai_response = eval_result
+
+        # 如果评分处理失败，仍然记录错误信息，但不输入分数
+        if score is None:
+            self.log_signal.emit(f"第 {question_index} 题评分失败，将记录错误信息但跳过分数输入", True)
+            self.record_grading_result(question_index, 0, img_str, reasoning_data, itemized_scores_data, confidence_data)
+            return
+
+        # 提交分数前记录下一个待截图区域的指纹，提交/翻页后据此判断网页是否已切换到下一份答卷
+        page_watch = self._start_page_watch(q_config, q_idx, cycle_index, cycle_number)
+
+        # 输入分数
+        with self.tracer.span("分数输入", question=question_index):
+            self.input_score(score, q_config.get('score_input_pos', (0, 0)), q_config.get('confirm_button_pos', (0, 0)), q_config)
+
+        if not self.running:
+            return
+
+        # 更新进度和已完成数量
+        self.completed_count = (q_idx + 1) + cycle_index * question_count
+        total = cycle_number * question_count
+        self.progress_signal.emit(self.completed_count, total)
+
+        # 记录阅卷结果
+        with self.tracer.span("记录保存", question=question_index):
+            self.record_grading_result(question_index, score, img_str, reasoning_data, itemized_scores_data, confidence_data,
+                                       raw_ai_response, grading_source=grading_source)
+
+        # 等待指定时间（启用翻页检测时由检测结果决定何时继续）
+        if self.running and wait_time > 0 and page_watch is None:
+            with self.tracer.span("固定等待", seconds=wait_time):
+                time.sleep(wait_time)
+
+        # 获取当前小题的翻页配置
+        current_q_enable_next = q_config.get('enable_next_button', False)
+        current_q_next_pos = q_config.get('next_button_pos', None)
+
+        if self.running and current_q_enable_next and current_q_next_pos and current_q_next_pos != (0, 0):
+            self.debug_log_signal.emit(f"第 {question_index} 题配置了翻页，正在执行翻页...")
+            with self.tracer.span("翻页点击", question=question_index):
+                _get_pyautogui().click(current_q_next_pos[0], current_q_next_pos[1])
+            if page_watch is None:
+                with self.tracer.span("固定等待", seconds=2):
+                    time.sleep(2)  # 等待页面加载
+
+        if self.running and page_watch is not None:
+            with self.tracer.span("翻页检测", question=page_watch[0]):
+                self._wait_for_page_advance(page_watch)
+
+    def _start_page_watch(self, q_config, q_idx, cycle_index, cycle_number):
+        """
+        若本题完成后网页应切换到下一份答卷（或下一页），截取下一个待截图区域并记录其指纹。
+
+        Returns:
+            (目标题号, 区域(x, y, w, h), 指纹, 当前是否为空白) 元组；无需检测时返回 None
+        """
+        if not self.parameters.get('page_change_detection', False):
+            return None
+
+        question_configs = self.parameters.get('question_configs', [])
+        is_last_question = q_idx == len(question_configs) - 1
+        if is_last_question:
+            # 整份答卷阅完：最后一轮之后不再需要等待
+            if cycle_index >= cycle_number - 1:
+                return None
+            target_config = question_configs[0]
+        elif q_config.get('enable_next_button', False):
+            target_config = question_configs[q_idx + 1]
+        else:
+            # 同一页上的下一题，不会翻页
+            return None
+
+        target_index = target_config.get('question_index', 1)
+        area = self._get_answer_area_tuple(target_config.get('answer_area') or {})
+        try:
+            before_image = _grab_screen((area[0], area[1], area[0] + area[2], area[1] + area[3]))
+            # 翻页前后都是空白作答时画面可能完全相同，此时超时不视为错误
+            template = self._blank_templates.get(target_index)
+            if template is not None and template.size != before_image.size:
+                template = None
+            is_blank = detect_blank_answer(
+                before_image, template=template,
+                ink_ratio_threshold=self.parameters.get('blank_ink_ratio_threshold', DEFAULT_INK_RATIO_THRESHOLD)
+            ).is_blank
+            return target_index, area, compute_fingerprint(before_image), is_blank
+        except Exception as e:
+            self.log_signal.emit(f"翻页检测截图失败，改用固定等待: {str(e)}", True)
+            return None
+
+    def _wait_for_page_advance(self, page_watch):
+        """
+        轮询目标区域，直到画面与提交前不同，且连续若干帧保持稳定（网页加载完成）。
+        超时仍未变化时中止阅卷，避免对同一份答卷重复评分。
+        """
+        target_index, area, before_fingerprint, before_was_blank = page_watch
+        timeout = float(self.parameters.get('page_change_timeout', 10))
+        stable_frames_required = max(1, int(self.parameters.get('page_stable_frames', 3)))
+        bbox = (area[0], area[1], area[0] + area[2], area[1] + area[3])
+
+        start_time = time.perf_counter()
+        changed = False
+        last_fingerprint = None
+        stable_frames = 0
+        while self.running:
+            elapsed = time.perf_counter() - start_time
+            if elapsed > timeout:
+                break
+            time.sleep(self.page_poll_interval)
+            try:
+                fingerprint = compute_fingerprint(_grab_screen(bbox))
+            except Exception as e:
+                self.log_signal.emit(f"翻页检测截图失败: {str(e)}", True)
+                continue
+
+            if not changed:
+                changed = fingerprint_distance(fingerprint, before_fingerprint) >= self.page_changed_ratio
+            if changed:
+                if last_fingerprint is not None and fingerprint_distance(fingerprint, last_fingerprint) <= self.page_stable_ratio:
+                    stable_frames += 1
+                else:
+                    stable_frames = 1
+                if stable_frames >= stable_frames_required:
+                    self.log_signal.emit(f"已检测到翻页（第 {target_index} 题区域），用时 {time.perf_counter() - start_time:.2f} 秒", False)
+                    return True
+            last_fingerprint = fingerprint
+
+        if not self.running:
+            return False
+
+        if changed:
+            # 画面已变化但一直未稳定（如动画、加载图标），按已翻页处理
+            self.log_signal.emit(f"第 {target_index} 题区域在 {timeout:.0f} 秒内未稳定，按已翻页继续", True)
+            return True
+        if before_was_blank:
+            # 前后两份答卷在该区域都是空白时画面无法区分，按已翻页继续
+            self.log_signal.emit(f"第 {target_index} 题区域在 {timeout:.0f} 秒内无变化（提交前为空白作答，可能下一份也是空白），继续阅卷", True)
+            return True
+
+        self._set_error_state(f"等待翻页超时（{timeout:.0f} 秒）：第 {target_index} 题答案区域未发生变化，"
+                              f"阅卷网页可能未翻到下一份答卷，已停止以免重复评分")
+        return False
+
     def set_parameters(self, **kwargs):
         """设置线程参数"""
         self.parameters = kwargs
@@ -442,6 +800,20 @@ class AutoThread(QThread):
         Returns:
             base64编码的图片字符串
         """
+        screenshot = self.grab_answer_area(area)
+        if screenshot is None:
+            return None
+        return self.encode_answer_image(screenshot)
+
+    def grab_answer_area(self, area):
+        """截取答案区域屏幕图像
+
+        Args:
+            area: 答案区域坐标 (x, y, width, height)
+
+        Returns:
+            PIL.Image 对象，失败时返回 None
+        """
         try:
             x, y, width, height = area
 
@@ -454,17 +826,34 @@ class AutoThread(QThread):
                 height = abs(height)
 
             # 截取屏幕指定区域
-            screenshot = ImageGrab.grab(bbox=(x, y, x + width, y + height))
+            with self.tracer.span("截图"):
+                return _grab_screen((x, y, x + width, y + height))
+        except Exception as e:
+            self._set_error_state(f"截取答案区域出错: {str(e)}")
+            return None
 
-            # 转换为带Data URI前缀的base64字符串
-            buffered = BytesIO()
-            screenshot.save(buffered, format="JPEG")
-            base64_data = base64.b64encode(buffered.getvalue()).decode()
+    def encode_answer_image(self, screenshot, q_config=None):
+        """按题目的图片预处理配置处理截图，编码为带Data URI前缀的base64字符串，失败时返回 None"""
+        try:
+            start_time = time.perf_counter()
+            options = ImagePreprocessOptions.from_question_config(q_config)
+            processed = preprocess_answer_image(screenshot, options)
+            jpeg_bytes = encode_jpeg(processed, options.jpeg_quality)
+            base64_data = base64.b64encode(jpeg_bytes).decode()
             img_str = f"data:image/jpeg;base64,{base64_data}"
+            elapsed_ms = (time.perf_counter() - start_time) * 1000
+            self.tracer.add("图片编码", start_time, elapsed_ms / 1000)
+
+            raw_bytes = screenshot.size[0] * screenshot.size[1] * len(screenshot.getbands())
+            question_label = f"第 {q_config.get('question_index')} 题" if q_config else "答案区域"
+            self.debug_log_signal.emit(
+                f"{question_label}图片: {screenshot.size[0]}x{screenshot.size[1]} -> {processed.size[0]}x{processed.size[1]}, "
+                f"原始截图 {raw_bytes / 1024:.0f} KB(未压缩) -> 上传 {len(jpeg_bytes) / 1024:.1f} KB, "
+                f"预处理与编码耗时 {elapsed_ms:.1f} ms")
 
             return img_str
         except Exception as e:
-            self._set_error_state(f"截取答案区域出错: {str(e)}")
+            self._set_error_state(f"编码答案区域图片出错: {str(e)}")
             return None
 
 
@@ -472,34 +861,52 @@ class AutoThread(QThread):
         """
         评估答案（重构后）。
         协调API调用和响应处理，支持单评和双评模式。
-        """
-        # 调用第一个API并处理结果
-        score1, reasoning1, scores1, confidence1, response_text1, error1 = self._call_and_process_single_api(
-            self.api_service.call_first_api,
-            img_str,
-            prompt,
-            current_question_config,
-            api_name="第一个API"
-        )
-        if error1:
-            self._set_error_state(error1)
-            return None, error1, None, None
+        双评模式下两组API相互独立，并行调用后再汇合比较分差。
 
-        # 如果不启用双评，直接返回第一个API的结果
+        Returns:
+            (score, reasoning, itemized_scores, confidence, raw_ai_response) 元组；失败时 score 为 None
+        """
+        # 如果不启用双评，直接调用第一个API并返回结果
         if not dual_evaluation:
+            score1, reasoning1, scores1, confidence1, response_text1, error1 = self._call_and_process_single_api(
+                self.api_service.call_first_api,
+                img_str,
+                prompt,
+                current_question_config,
+                api_name="第一个API",
+                api_group="first"
+            )
+            if error1:
+                self._handle_evaluation_error(error1)
+                return None, error1, None, None, response_text1
             return score1, reasoning1, scores1, confidence1, response_text1
 
-        # 如果启用双评，继续调用第二个API
-        score2, reasoning2, scores2, confidence2, error2 = self._call_and_process_single_api(
-            self.api_service.call_second_api,
-            img_str,
-            prompt,
-            current_question_config,
-            api_name="第二个API"
-        )
-        if error2:
-            self._set_error_state(error2)
-            return None, error2, None, None
+        # 双评模式：两组API并行调用。任一分支最终失败时通过 cancel_event 通知另一分支停止重试
+        cancel_event = threading.Event()
+
+        def run_branch(api_call_func, api_name, api_group):
+            result = self._call_and_process_single_api(
+                api_call_func, img_str, prompt, current_question_config,
+                api_name=api_name, cancel_event=cancel_event, api_group=api_group
+            )
+            if result[-1]:
+                cancel_event.set()
+            return result
+
+        with ThreadPoolExecutor(max_workers=2, thread_name_prefix="dual-eval") as executor:
+            future1 = executor.submit(run_branch, self.api_service.call_first_api, "第一个API", "first")
+            future2 = executor.submit(run_branch, self.api_service.call_second_api, "第二个API", "second")
+            score1, reasoning1, scores1, confidence1, response_text1, error1 = future1.result()
+            score2, reasoning2, scores2, confidence2, response_text2, error2 = future2.result()
+
+        if error1 or error2:
+            # 优先报告真正失败的分支，而不是因另一分支失败而被取消的分支
+            if error1 and not (error2 and self._is_cancelled_error(error1)):
+                error_msg, failed_response = error1, response_text1
+            else:
+                error_msg, failed_response = error2, response_text2
+            self._handle_evaluation_error(error_msg)
+            return None, error_msg, None, None, failed_response
 
         # 处理双评结果
         final_score, combined_reasoning, combined_scores, combined_confidence, error_dual = self._handle_dual_evaluation(
@@ -508,18 +915,42 @@ class AutoThread(QThread):
             score_diff_threshold
         )
         if error_dual:
+            if not self.stop_on_evaluation_error:
+                self.log_signal.emit(f"{error_dual}，该份答卷需人工复核", True)
+                return None, error_dual, None, None, None
             # 双评特有的错误（如分差过大）需要设置线程状态
             self.completion_status = "threshold_exceeded"
             self.interrupt_reason = error_dual
             self.running = False
-            return None, error_dual, None, None
+            return None, error_dual, None, None, None
 
-        return final_score, combined_reasoning, combined_scores, combined_confidence
+        # 双评的原始响应已包含在 combined_reasoning 中
+        return final_score, combined_reasoning, combined_scores, combined_confidence, None
 
+    CANCELLED_ERROR_MARK = "评分已取消"
 
-    def _call_and_process_single_api(self, api_call_func, img_str, prompt, q_config, api_name="API", max_retries=3):
+    # 阅卷方式，写入每条阅卷记录（离线批量阅卷为 "batch"）
+    run_mode = "screen"
+
+    # 单份答卷评分失败时是否中止整个阅卷流程。屏幕阅卷必须停下等待人工处理，
+    # 离线批量阅卷（见 batch_grader.BatchGradingThread）则记录失败后继续下一份
+    stop_on_evaluation_error = True
+
+    def _handle_evaluation_error(self, error_msg):
+        """评分失败时按 stop_on_evaluation_error 决定中止阅卷还是仅记录日志"""
+        if self.stop_on_evaluation_error:
+            self._set_error_state(error_msg)
+        else:
+            self.log_signal.emit(f"评分失败，已跳过: {error_msg}", True)
+
+    def _is_cancelled_error(self, error_msg):
+        """判断错误信息是否来自被取消的API调用分支"""
+        return isinstance(error_msg, str) and self.CANCELLED_ERROR_MARK in error_msg
+
+    def _call_and_process_single_api(self, api_call_func, img_str, prompt, q_config, api_name="API", max_retries=None,
+                                     cancel_event=None, api_group=None):
         """
-        调用指定的API函数，并处理其响应。支持重试机制以提高稳定性。
+        调用指定的API函数，并处理其响应。按失败原因决定是否重试及退避时间（见 retry_policy）。
 
         Args:
             api_call_func: 要调用的API服务方法 (e.g., self.api_service.call_first_api)
@@ -527,21 +958,64 @@ class AutoThread(QThread):
             prompt: 提示词
             q_config: 当前题目配置
             api_name: 用于日志的API名称
-            max_retries: 最大重试次数，默认3次
+            max_retries: 最大尝试次数，默认使用该组供应商重试策略中的 max_attempts
+            cancel_event: 可选的 threading.Event，被设置后不再发起新的尝试（双评并行时由另一分支触发）
+            api_group: 可选，"first"/"second"，提供时按该组的供应商和模型查询/写入响应缓存及重试策略
 
         Returns:
-            一个元组 (score, reasoning, itemized_scores, confidence, error_message)
+            一个元组 (score, reasoning, itemized_scores, confidence, response_text, error_message)
         """
+        cache = self.response_cache
+        cache_key, provider, model_id = None, "", ""
+        if cache is not None and api_group:
+            group_settings = self.api_service.get_api_group_settings(api_group)
+            if group_settings:
+                provider, _, model_id = group_settings
+                cache_key = cache.make_key(img_str, prompt, provider, model_id)
+                cached_text = cache.get(cache_key)
+                if cached_text:
+                    success, result_data = self.process_api_response((cached_text, None), q_config)
+                    if success:
+                        self.log_signal.emit(f"{api_name}命中响应缓存，跳过API调用", False)
+                        score, reasoning, itemized_scores, confidence = result_data
+                        return score, reasoning, itemized_scores, confidence, cached_text, None
+                    # 缓存的响应已无法按当前题目配置解析（如分值范围已修改），丢弃后重新调用
+                    cache.invalidate(cache_key)
+
+        policy = self._get_retry_policy(api_group)
+        if max_retries is None:
+            max_retries = policy.max_attempts
+
+        response_text = None
+        category, retry_after = None, None
         for attempt in range(max_retries):
-            if attempt > 0:
-                self.log_signal.emit(f"{api_name}第{attempt}次重试...", False)
-                time.sleep(1)  # 短暂延迟，避免过于频繁的请求
+            if not self.running or (cancel_event is not None and cancel_event.is_set()):
+                return self._cancelled_api_result(api_name, response_text)
 
-            self.log_signal.emit(f"正在调用{api_name}进行评分... (尝试 {attempt + 1}/{max_retries})", False)
-            response_text, error_from_call = api_call_func(img_str, prompt)
+            if attempt > 0:
+                delay = policy.compute_delay(category, attempt, retry_after)
+                self.log_signal.emit(
+                    f"{api_name}第{attempt}次重试（{CATEGORY_LABELS.get(category, category)}，等待 {delay:.1f} 秒）...", False)
+                with self.tracer.span("重试等待", api=api_name, category=category):
+                    completed = self._sleep_unless_cancelled(delay, cancel_event)
+                if not completed:
+                    return self._cancelled_api_result(api_name, response_text)
+
+            self.debug_log_signal.emit(f"正在调用{api_name}进行评分... (尝试 {attempt + 1}/{max_retries})")
+            call_start = time.perf_counter()
+            with self.tracer.span("API请求", api=api_name, attempt=attempt + 1):
+                response_text, error_from_call = api_call_func(img_str, prompt)
+            self._record_api_usage(api_group, api_name, q_config, response_text, img_str,
+                                   time.perf_counter() - call_start)
 
             if error_from_call or not response_text:
                 error_msg = f"{api_name}调用失败或响应为空: {error_from_call}"
+                category = error_category(error_from_call) if error_from_call else EMPTY_RESPONSE
+                retry_after = getattr(error_from_call, 'retry_after', None)
+                if not policy.is_retryable(category):
+                    # 认证失败、额度不足等重试也不会成功，直接报错让用户处理
+                    self.log_signal.emit(f"{error_msg}（{CATEGORY_LABELS.get(category, category)}，不再重试）", True)
+                    return None, None, None, None, response_text, error_msg
                 if attempt == max_retries - 1:  # 最后一次尝试失败
                     self.log_signal.emit(error_msg, True)
                     return None, None, None, None, response_text, error_msg
@@ -549,13 +1023,24 @@ class AutoThread(QThread):
                     self.log_signal.emit(f"{error_msg}，准备重试...", True)
                     continue
 
-            success, result_data = self.process_api_response((response_text, None), q_config)
+            with self.tracer.span("JSON解析", api=api_name):
+                success, result_data = self.process_api_response((response_text, None), q_config)
 
             if success:
+                if cache_key:
+                    cache.put(cache_key, response_text, provider, model_id)
                 score, reasoning, itemized_scores, confidence = result_data
                 return score, reasoning, itemized_scores, confidence, response_text, None
             else:
                 error_info = result_data
+                # 网络请求本身成功，只是输出格式不对：先用纯文本请求整理格式，避免重新上传图片评分
+                repaired = self._repair_malformed_response(api_group, api_name, response_text, q_config, cancel_event)
+                if repaired is not None:
+                    repaired_text, (score, reasoning, itemized_scores, confidence) = repaired
+                    if cache_key:
+                        cache.put(cache_key, repaired_text, provider, model_id)
+                    return score, reasoning, itemized_scores, confidence, repaired_text, None
+                category, retry_after = MALFORMED_OUTPUT, None
                 if attempt == max_retries - 1:  # 最后一次尝试的处理失败
                     error_msg = f"{api_name}评分处理失败（已重试{max_retries}次）。错误: {error_info}"
                     self.log_signal.emit(error_msg, True)
@@ -565,22 +1050,131 @@ class AutoThread(QThread):
                     continue
 
         # 理论上不会到达这里，但为了安全
-        return None, None, None, None, f"{api_name}重试后仍失败"
+        return None, None, None, None, response_text, f"{api_name}重试后仍失败"
+
+    # 每次格式错误的输出最多发起几次JSON修复请求，都失败后才重新调用视觉模型评分
+    MAX_JSON_REPAIR_ATTEMPTS = 2
+
+    def _repair_malformed_response(self, api_group, api_name, response_text, q_config, cancel_event=None):
+        """
+        把格式错误的评分输出和要求的JSON结构以纯文本请求（不含图片）发给该组API整理，
+        整理结果仍经 process_api_response 正常解析和校验。
+
+        Returns:
+            成功时为 (修复后的响应文本, (score, reasoning, itemized_scores, confidence))；
+            无法修复（未指定组别、请求失败、整理后仍无法解析）时为 None
+        """
+        call_text_api = getattr(self.api_service, 'call_text_api', None)
+        if not api_group or not response_text or call_text_api is None:
+            return None
+
+        repair_prompt = build_json_repair_prompt(response_text)
+        for repair_attempt in range(1, self.MAX_JSON_REPAIR_ATTEMPTS + 1):
+            if not self.running or (cancel_event is not None and cancel_event.is_set()):
+                return None
+            self.log_signal.emit(f"{api_name}输出格式错误，尝试纯文本修复（第{repair_attempt}次）...", False)
+            call_start = time.perf_counter()
+            with self.tracer.span("JSON修复", api=api_name, attempt=repair_attempt):
+                repaired_text, error_from_call = call_text_api(api_group, repair_prompt)
+            self._record_api_usage(api_group, api_name, q_config, repaired_text, "", time.perf_counter() - call_start)
+            if error_from_call or not repaired_text:
+                self.log_signal.emit(f"{api_name}JSON修复请求失败: {error_from_call}", True)
+                if not self._get_retry_policy(api_group).is_retryable(error_category(error_from_call)):
+                    return None
+                continue
+
+            with self.tracer.span("JSON解析", api=api_name):
+                success, result_data = self.process_api_response((repaired_text, None), q_config)
+            if success:
+                self.log_signal.emit(f"{api_name}输出已通过纯文本请求修复，无需重新评分", False)
+                return repaired_text, result_data
+        self.log_signal.emit(f"{api_name}JSON修复未成功，将重新调用模型评分", True)
+        return None
+
+    @property
+    def tokens_used(self):
+        """本次运行已消耗的token数（实时进度面板使用）"""
+        return self.usage_ledger.tokens_used
+
+    @property
+    def estimated_cost(self):
+        """本次运行已配置单价部分的估算费用，未配置单价时为 None"""
+        return self.usage_ledger.estimated_cost
+
+    def _record_api_usage(self, api_group, api_name, q_config, response_text, img_str, api_seconds):
+        """记录一次API调用的用量（供应商返回了 usage 时），并检查是否超出预算"""
+        usage = getattr(response_text, 'usage', None)
+        if usage is None:
+            return
+        group_settings = self.api_service.get_api_group_settings(api_group) if api_group else None
+        provider, _, model_id = group_settings or ("", "", "")
+        image_bytes = base64_byte_size(img_str)
+        cost = self.usage_ledger.record(q_config.get('question_index', 0), provider, model_id, usage,
+                                        image_bytes, api_seconds)
+        cost_text = f"，估算费用 {cost:.4f}" if cost is not None else ""
+        self.debug_log_signal.emit(f"{api_name}用量 ({provider}/{model_id}): {format_usage(usage)}，"
+                                   f"图片 {image_bytes / 1024:.0f} KB，耗时 {api_seconds:.1f} 秒{cost_text}")
+        self._check_usage_budget()
+
+    def _check_usage_budget(self):
+        """超出配置的费用或token上限时停止阅卷（已发出的请求仍会完成）"""
+        if not self.running:
+            return
+        budget = float(self.parameters.get('usage_budget') or 0)
+        token_budget = int(self.parameters.get('usage_token_budget') or 0)
+        cost = self.usage_ledger.estimated_cost
+        tokens = self.usage_ledger.tokens_used
+        if budget and cost is not None and cost > budget:
+            self._set_error_state(f"估算费用 {cost:.4f} 已超出预算上限 {budget:g}，阅卷已停止")
+        elif token_budget and tokens > token_budget:
+            self._set_error_state(f"已消耗 {tokens:,} tokens，超出上限 {token_budget:,}，阅卷已停止")
+
+    def _get_retry_policy(self, api_group):
+        """该组API供应商的重试策略；未指定组别时使用默认策略"""
+        get_policy = getattr(self.api_service, 'get_retry_policy', None)
+        if api_group and get_policy is not None:
+            return get_policy(api_group)
+        return RetryPolicy()
+
+    def _cancelled_api_result(self, api_name, response_text):
+        error_msg = f"{api_name}{self.CANCELLED_ERROR_MARK}（阅卷已停止或另一组API已失败）"
+        self.log_signal.emit(error_msg, False)
+        return None, None, None, None, response_text, error_msg
+
+    # 重试等待期间检查停止/取消的间隔（秒）
+    RETRY_SLEEP_SLICE = 0.2
+
+    def _sleep_unless_cancelled(self, seconds, cancel_event=None):
+        """
+        分段等待 seconds 秒，期间阅卷被停止或 cancel_event 被设置时立即返回。
+        限流退避可能长达数十秒，不能让"停止"按钮等这么久才生效。
+
+        Returns:
+            True 表示完整等待结束，False 表示被中断
+        """
+        deadline = time.monotonic() + seconds
+        while True:
+            if not self.running or (cancel_event is not None and cancel_event.is_set()):
+                return False
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return True
+            time.sleep(min(remaining, self.RETRY_SLEEP_SLICE))
 
     def _handle_dual_evaluation(self, result1, result2, score_diff_threshold):
         """
         处理双评逻辑，比较分数，合并结果。
 
         Args:
-            result1: 第一个API的处理结果元组 (score, reasoning, itemized_scores, confidence)
-            result2: 第二个API的处理结果元组 (score, reasoning, itemized_scores, confidence)
+            result1: 第一个API的处理结果元组 (score, reasoning, itemized_scores, confidence, response_text)
+            result2: 第二个API的处理结果元组 (score, reasoning, itemized_scores, confidence, response_text)
             score_diff_threshold: 分差阈值
 
         Returns:
             一个元组 (final_score, combined_reasoning, combined_scores, combined_confidence, error_message)
         """
-        score1, reasoning1, itemized_scores1, confidence1 = result1
-        score2, reasoning2, itemized_scores2, confidence2 = result2
+        score1, reasoning1, itemized_scores1, confidence1, response_text1 = result1
+        score2, reasoning2, itemized_scores2, confidence2, response_text2 = result2
 
         score_diff = abs(score1 - score2)
         self.log_signal.emit(f"API-1得分: {score1}, API-2得分: {score2}, 分差: {score_diff}", False)
@@ -644,7 +1238,7 @@ class AutoThread(QThread):
             return False, error_msg
 
         try:
-            self.log_signal.emit("尝试解析API响应JSON...", False)
+            self.debug_log_signal.emit("尝试解析API响应JSON...")
 
             # 首先尝试直接解析
             data = None
@@ -652,12 +1246,12 @@ class AutoThread(QThread):
                 data = json.loads(response_text)
             except json.JSONDecodeError:
                 # 如果直接解析失败，尝试提取JSON部分
-                self.log_signal.emit("直接解析失败，尝试提取JSON部分...", False)
+                self.debug_log_signal.emit("直接解析失败，尝试提取JSON部分...")
                 extracted_json = self._extract_json_from_text(response_text)
                 if extracted_json:
                     try:
                         data = json.loads(extracted_json)
-                        self.log_signal.emit("成功从响应中提取并解析JSON", False)
+                        self.debug_log_signal.emit("成功从响应中提取并解析JSON")
                     except json.JSONDecodeError:
                         pass  # 仍然失败，继续到外层的异常处理
 
@@ -669,8 +1263,8 @@ class AutoThread(QThread):
             itemized_scores_from_json = data.get("itemized_scores")
             confidence_data = {}  # 置信度功能暂时停用
 
-            self.log_signal.emit(f"从JSON提取的学生答案摘要: {student_answer_summary}", False)
-            self.log_signal.emit(f"从JSON提取的分项得分列表: {itemized_scores_from_json}", False)
+            self.debug_log_signal.emit(f"从JSON提取的学生答案摘要: {student_answer_summary}")
+            self.debug_log_signal.emit(f"从JSON提取的分项得分列表: {itemized_scores_from_json}")
 
             calculated_total_score = 0.0
             numeric_scores_list_for_return = []
@@ -681,7 +1275,7 @@ class AutoThread(QThread):
                 return False, error_msg
 
             if not itemized_scores_from_json:
-                self.log_signal.emit("分项得分列表为空，判定总分为0。", False)
+                self.debug_log_signal.emit("分项得分列表为空，判定总分为0。")
                 calculated_total_score = 0.0
                 numeric_scores_list_for_return = []
             else:
@@ -693,7 +1287,7 @@ class AutoThread(QThread):
                     self.log_signal.emit(error_msg, True)
                     return False, error_msg
 
-            self.log_signal.emit(f"根据itemized_scores计算得到的原始总分: {calculated_total_score}", False)
+            self.debug_log_signal.emit(f"根据itemized_scores计算得到的原始总分: {calculated_total_score}")
 
             final_score = self._validate_and_finalize_score(calculated_total_score, current_question_config)
 
@@ -713,6 +1307,7 @@ class AutoThread(QThread):
                          "2. 您使用的模型可能不完全兼容当前Prompt的JSON输出要求。\n"
                          "解决方案：请尝试重新运行。如果问题反复出现，建议更换模型或检查供应商服务状态。")
             self.log_signal.emit(f"{error_msg}\n原始响应(前200字符): '{response_text[:200]}...'", True)
+            self.debug_log_signal.emit(f"完整原始响应: {response_text}")
             return False, (error_msg, response_text)
         except (KeyError, IndexError) as e_key:
             error_msg = (f"【API响应结构错误】模型返回的JSON中缺少关键信息 (如: {str(e_key)})。\n"
@@ -753,7 +1348,7 @@ class AutoThread(QThread):
                 self.log_signal.emit(f"计算总分 {final_score} 超出题目满分 {q_max_score} (原始AI总分: {total_score_from_json})，将修正为满分 {q_max_score}。", True)
                 final_score = q_max_score # 修正为满分
 
-            self.log_signal.emit(f"AI原始总分: {total_score_from_json}, 校验后最终得分: {final_score}", False)
+            self.debug_log_signal.emit(f"AI原始总分: {total_score_from_json}, 校验后最终得分: {final_score}")
             return final_score
 
         except Exception as e:
@@ -843,6 +1438,7 @@ class AutoThread(QThread):
             return False # 表示输入失败
 
         try:
+            pyautogui = _get_pyautogui()
             pyautogui.click(input_pos[0], input_pos[1])
             time.sleep(0.5)
             pyautogui.hotkey('ctrl', 'a')
@@ -871,7 +1467,7 @@ class AutoThread(QThread):
             # 获取当前题目的最小分值，用于最终修正 (q_max_score 已在上方获取并更新为使用 self.max_score 作为默认值)
             q_min_score = float(current_question_config.get('min_score', self.min_score)) 
 
-            self.log_signal.emit(f"AI得分 (原始范围 [{q_min_score}-{q_max_score}]): {final_score_to_input}, 四舍五入到0.5倍数后: {final_score_processed}", False)
+            self.debug_log_signal.emit(f"AI得分 (原始范围 [{q_min_score}-{q_max_score}]): {final_score_to_input}, 四舍五入到0.5倍数后: {final_score_processed}")
 
             # 2. 修正四舍五入后的分数，确保其严格在 [q_min_score, q_max_score] 范围内
             #    final_score_to_input 已经由 _validate_and_finalize_score 保证在原始 [min_score, max_score] 内。
@@ -908,7 +1504,7 @@ class AutoThread(QThread):
                 s3 = max(0, final_score_processed - s1 - s2)
 
                 # 由于 final_score_processed 和 score_per_step_cap 都是0.5的倍数, s1,s2,s3也都是
-                self.log_signal.emit(f"三步拆分结果: s1={s1}, s2={s2}, s3={s3} (总和: {round_to_nearest_half(s1+s2+s3)})", False)
+                self.debug_log_signal.emit(f"三步拆分结果: s1={s1}, s2={s2}, s3={s3} (总和: {round_to_nearest_half(s1+s2+s3)})")
 
                 if not self._perform_single_input(s1, q_score_input_pos_step1):
                     self._set_error_state("三步打分输入失败 (步骤1)")
@@ -922,7 +1518,7 @@ class AutoThread(QThread):
                 input_successful = True
 
             else: # 标准单点输入
-                self.log_signal.emit(f"标准单点输入模式 (题目 {current_processing_q_index})，得分: {final_score_processed}", False)
+                self.debug_log_signal.emit(f"标准单点输入模式 (题目 {current_processing_q_index})，得分: {final_score_processed}")
                 if not default_score_pos:
                     self._set_error_state(f"题目 {current_processing_q_index} 的分数输入位置未配置，阅卷中止。")
                     return
@@ -935,7 +1531,7 @@ class AutoThread(QThread):
                 if not confirm_button_pos:
                     self._set_error_state("确认按钮位置未配置，阅卷中止。")
                     return
-                pyautogui.click(confirm_button_pos[0], confirm_button_pos[1])
+                _get_pyautogui().click(confirm_button_pos[0], confirm_button_pos[1])
                 time.sleep(0.5) # 轻微延时确保点击生效
                 self.log_signal.emit(f"已输入总分: {final_score_processed} (题目 {current_processing_q_index}) 并点击确认", False)
             # else 分支的错误已在各自的输入逻辑中通过 return 处理，或由 self.running 状态控制
@@ -946,8 +1542,13 @@ class AutoThread(QThread):
             if self.running: # 避免在已停止时重复设置错误
                 self._set_error_state(f"输入分数严重错误: {str(e)}")
 
-    def record_grading_result(self, question_index, score, img_str, reasoning_data, itemized_scores_data, confidence_data, raw_ai_response=None):
-        """记录阅卷结果，并发送信号 (重构后)"""
+    def record_grading_result(self, question_index, score, img_str, reasoning_data, itemized_scores_data, confidence_data,
+                              raw_ai_response=None, grading_source="api", extra_fields=None):
+        """记录阅卷结果，并发送信号 (重构后)
+
+        grading_source: 评分来源，"api" 为AI评分，"local-blank" 为本地空白检测（未调用API）
+        extra_fields: 可选，附加到记录中的字段（如离线批量阅卷的 source_image）
+        """
         try:
             # 1. 构建基础记录字典
             record = {
@@ -957,14 +1558,30 @@ class AutoThread(QThread):
                 'total_score': score,
                 'is_dual_evaluation_run': self.parameters.get('dual_evaluation', False),
                 'total_questions_in_run': self.total_question_count_in_run,
+                'grading_source': grading_source,
+                'run_mode': self.run_mode,
+                'run_id': self.run_id,
+                'first_model_id': self.first_model_id,
             }
+            if extra_fields:
+                record.update(extra_fields)
 
             # 2. 根据模式填充特定字段
             is_dual = isinstance(reasoning_data, dict) and reasoning_data.get('is_dual')
 
             record['is_dual_evaluation'] = is_dual
 
-            if is_dual:
+            if grading_source == "local-blank":
+                # 本地空白检测，未调用AI
+                summary, basis = reasoning_data
+                record.update({
+                    'student_answer': summary,
+                    'reasoning_basis': basis,
+                    'sub_scores': "local-blank",
+                })
+                if record['is_dual_evaluation_run']:
+                    record['score_diff_threshold'] = self.parameters.get('score_diff_threshold', "未提供")
+            elif is_dual:
                 # 双评模式
                 record.update({
                     'api1_student_answer_summary': reasoning_data.get('api1_summary', 'AI未提供'),
@@ -977,6 +1594,7 @@ class AutoThread(QThread):
                     'api2_raw_response': reasoning_data.get('api2_raw_response', 'AI未提供'),
                     'score_difference': reasoning_data.get('score_difference', 0.0),
                     'score_diff_threshold': self.parameters.get('score_diff_threshold', "AI未提供"),
+                    'second_model_id': self.second_model_id,
                 })
                 if isinstance(itemized_scores_data, dict):
                     record['api1_itemized_scores'] = itemized_scores_data.get('api1_scores', [])
@@ -995,8 +1613,9 @@ class AutoThread(QThread):
 
             elif isinstance(reasoning_data, tuple) and len(reasoning_data) == 2:
                 # 检查是否为错误模式 (error_msg, raw_response)
+                # 成功评分时一定带有AI原始响应，据此区分，而不是猜测第二个元素的格式
                 first_elem, second_elem = reasoning_data
-                if isinstance(second_elem, str) and not second_elem.startswith('{') and not second_elem.startswith('['):
+                if raw_ai_response is None:
                     # 这是错误模式，second_elem是原始响应
                     error_info = first_elem
                     raw_response = second_elem
@@ -1039,14 +1658,34 @@ class AutoThread(QThread):
             error_detail = traceback.format_exc()
             self.log_signal.emit(f"记录阅卷结果时发生严重错误: {str(e)}\n{error_detail}", True)
 
+    def _write_run_trace(self, now):
+        """把本次运行的阶段耗时写成 Chrome trace 文件（与当天的阅卷记录放在同一目录），返回文件路径"""
+        trace_dir = os.path.join(get_app_base_dir(), "阅卷记录", now.strftime('%Y年%m月%d日'))
+        trace_path = os.path.join(trace_dir, f"阅卷耗时追踪_{now.strftime('%H点%M分%S秒')}_{self.run_id[:8]}.trace.json")
+        try:
+            self.tracer.write_chrome_trace(trace_path, metadata={
+                'run_id': self.run_id,
+                'run_mode': self.run_mode,
+                'first_model_id': self.first_model_id,
+                'second_model_id': self.second_model_id,
+            })
+        except Exception as e:
+            self.log_signal.emit(f"写入耗时追踪文件失败: {str(e)}", True)
+            return ""
+        return trace_path
+
     def generate_summary_record(self, cycle_number, dual_evaluation, score_diff_threshold, elapsed_time):
-        """生成阅卷汇总记录"""
+        """生成阅卷汇总记录（含各阶段耗时统计），并写出本次运行的耗时追踪文件"""
         # 确保已完成数量和总题目数量正确
         total_questions = cycle_number * len(self.parameters.get('question_configs', []))
+        now = datetime.datetime.now()
+        stage_timings = self.tracer.stage_stats()
 
         summary_record = {
-            'timestamp': datetime.datetime.now().strftime('%Y年%m月%d日_%H点%M分%S秒'),
+            'timestamp': now.strftime('%Y年%m月%d日_%H点%M分%S秒'),
             'record_type': 'summary', # <--- 新增此行
+            'run_mode': self.run_mode,
+            'run_id': self.run_id,
             'total_cycles': cycle_number,
             'total_questions_attempted': total_questions,
             'questions_completed': self.completed_count,
@@ -1057,8 +1696,27 @@ class AutoThread(QThread):
             'score_diff_threshold': score_diff_threshold if dual_evaluation else None,
             'first_model_id': self.first_model_id,
             'second_model_id': self.second_model_id if dual_evaluation else None,
-            'is_single_question_one_run': self.is_single_question_one_run
+            'is_single_question_one_run': self.is_single_question_one_run,
+            'local_blank_count': self.local_blank_count,
+            'stage_timings': stage_timings,
         }
+        if stage_timings:
+            summary_record['trace_file'] = self._write_run_trace(now)
+            self.log_signal.emit("各阶段耗时:", False)
+            for line in format_stage_stats(stage_timings):
+                self.log_signal.emit(f"  {line}", False)
+
+        if self.response_cache is not None:
+            hits, misses, _, _ = self.response_cache.get_stats()
+            summary_record['response_cache_hits'] = hits
+            summary_record['response_cache_misses'] = misses
+
+        api_usage = self.usage_ledger.summary()
+        if api_usage['calls']:
+            summary_record['api_usage'] = api_usage
+            self.log_signal.emit("API用量:", False)
+            for line in format_usage_summary(api_usage):
+                self.log_signal.emit(f"  {line}", False)
 
         # 将汇总记录发送给Application层
         self.record_signal.emit(summary_record)
@@ -0,0 +1,253 @@
+# --- START OF FILE batch_grader.py ---
+#
+# ==============================================================================
+#  离线批量阅卷 (Offline Batch Grading)
+#
+#  AutoThread 的流程绑定屏幕截图与 pyautogui 输入，速度受限于网页点击。
+#  扫描的答卷或阅卷平台导出的答题图片可以直接从文件夹/zip压缩包读取，
+#  复用同一套 Prompt 构建 -> ApiService -> 响应解析 -> 分数校验 流程，
+#  多份答卷并发调用API，并发出与屏幕阅卷相同格式的阅卷记录。
+# ==============================================================================
+
+import os
+import re
+import time
+import traceback
+import uuid
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+
+from auto_thread import AutoThread
+
+SUPPORTED_IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.bmp', '.tif', '.tiff', '.webp')
+DEFAULT_BATCH_CONCURRENCY = 8
+
+
+def _natural_sort_key(name):
+    """按文件名中的数字自然排序，使 "2.jpg" 排在 "10.jpg" 之前"""
+    return [int(part) if part.isdigit() else part.lower() for part in re.split(r'(\d+)', name)]
+
+
+class AnswerImageSource:
+    """
+    文件夹或zip压缩包中的答题图片。
+
+    images 为 [(图片名称, 读取函数), ...]，读取函数返回 PIL.Image；按文件名自然排序。
+    zip压缩包在 close() 之前保持打开（读取函数共用），用完必须关闭，否则Windows下压缩包一直被占用。
+    """
+
+    def __init__(self, images, archive=None):
+        self.images = images
+        self._archive = archive
+
+    def close(self):
+        if self._archive is not None:
+            self._archive.close()
+            self._archive = None
+
+
+def open_answer_images(source_path):
+    """
+    打开文件夹或zip压缩包中的答题图片。
+
+    Returns:
+        AnswerImageSource，调用方负责 close()
+    """
+    from PIL import Image  # 首次批量阅卷时才导入，不拖慢程序启动
+
+    if os.path.isdir(source_path):
+        names = []
+        for root, _dirs, files in os.walk(source_path):
+            for file_name in files:
+                if file_name.lower().endswith(SUPPORTED_IMAGE_EXTENSIONS):
+                    names.append(os.path.relpath(os.path.join(root, file_name), source_path))
+        names.sort(key=_natural_sort_key)
+
+        def make_loader(relative_path):
+            def load():
+                with Image.open(os.path.join(source_path, relative_path)) as image:
+                    image.load()
+                    return image.copy()
+            return load
+        return AnswerImageSource([(name, make_loader(name)) for name in names])
+
+    if zipfile.is_zipfile(source_path):
+        # ZipFile 支持多线程并发读取不同成员
+        archive = zipfile.ZipFile(source_path)
+        names = [info.filename for info in archive.infolist()
+                 if not info.is_dir() and info.filename.lower().endswith(SUPPORTED_IMAGE_EXTENSIONS)]
+        names.sort(key=_natural_sort_key)
+
+        def make_loader(member_name):
+            def load():
+                with Image.open(BytesIO(archive.read(member_name))) as image:
+                    image.load()
+                    return image.copy()
+            return load
+        return AnswerImageSource([(name, make_loader(name)) for name in names], archive)
+
+    raise ValueError(f"不是文件夹或zip压缩包: {source_path}")
+
+
+class BatchGradingThread(AutoThread):
+    """离线批量阅卷线程：从文件夹/zip读取同一道题的答题图片，并发评分并发出阅卷记录"""
+
+    run_mode = "batch"
+    # 批量模式下单份答卷失败只记录，不中止整批
+    stop_on_evaluation_error = False
+
+    def run(self):
+        """线程主函数，执行离线批量阅卷流程"""
+        self.completion_status = "running"
+        self.completed_count = 0
+        self.interrupt_reason = ""
+        self.run_id = uuid.uuid4().hex
+        self.local_blank_count = 0
+        self._blank_templates = {}
+        self.tracer.reset()
+        self.usage_ledger.reset(self.parameters.get('price_table'))
+        self.running = True
+        self.log_signal.emit("离线批量阅卷线程已启动", False)
+
+        source_path = self.parameters.get('source_path', '')
+        question_configs = self.parameters.get('question_configs', [])
+        dual_evaluation = self.parameters.get('dual_evaluation', False)
+        score_diff_threshold = self.parameters.get('score_diff_threshold', 10)
+        concurrency = max(1, int(self.parameters.get('batch_concurrency', DEFAULT_BATCH_CONCURRENCY)))
+
+        start_time = time.time()
+        elapsed_time = 0
+        image_source = None
+        images = []
+        try:
+            if len(question_configs) != 1:
+                self._set_error_state("离线批量阅卷一次只能处理一道题")
+                return
+            q_config = question_configs[0]
+            self.total_question_count_in_run = 1
+            self._setup_response_cache()
+
+            image_source = open_answer_images(source_path)
+            images = image_source.images
+            if not images:
+                self._set_error_state(f"未在 {source_path} 中找到答题图片")
+                return
+
+            question_index = q_config.get('question_index', 1)
+            plans = self.compile_prompt_plans([q_config])
+            if plans is None:
+                return
+            prompt = plans[question_index].prompt
+
+            total = len(images)
+            # 实际在途的API请求还受各供应商的并发上限约束（ApiService 内按供应商排队）
+            self.log_signal.emit(f"共 {total} 份答题图片，第 {question_index} 题，并发数 {concurrency}"
+                                 f"（{self._describe_provider_caps(dual_evaluation)}）", False)
+            self.progress_signal.emit(0, total)
+
+            with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="batch-grading") as executor:
+                futures = [
+                    executor.submit(self._grade_image, name, loader, q_config, prompt, dual_evaluation, score_diff_threshold)
+                    for name, loader in images
+                ]
+                try:
+                    # 按文件顺序取结果并发出记录，阅卷记录中的顺序与文件顺序一致
+                    for (name, _), future in zip(images, futures):
+                        if not self.running:
+                            break
+                        eval_result, grading_source = future.result()
+                        with self.tracer.span("记录保存", image=name):
+                            self._record_image_result(name, question_index, eval_result, grading_source)
+                        self.completed_count += 1
+                        self.progress_signal.emit(self.completed_count, total)
+                finally:
+                    for future in futures:
+                        future.cancel()
+
+            elapsed_time = time.time() - start_time
+            if self.running:
+                self.log_signal.emit(f"离线批量阅卷完成，共 {self.completed_count} 份，总用时: {elapsed_time:.2f} 秒", False)
+                self.completion_status = "completed"
+            elif self.completion_status == "running":
+                self.completion_status = "error"
+                self.interrupt_reason = "未知错误导致中断"
+
+        except Exception as e:
+            error_detail = traceback.format_exc()
+            self.log_signal.emit(f"离线批量阅卷出错: {str(e)}\n{error_detail}", True)
+            self.completion_status = "error"
+            self.interrupt_reason = f"系统错误: {str(e)}"
+
+        finally:
+            self.running = False
+            if image_source is not None:
+                image_source.close()
+            if not elapsed_time:
+                elapsed_time = time.time() - start_time
+            try:
+                # 每份答题图片视为一轮（每轮一道题）
+                self.generate_summary_record(max(1, len(images)), dual_evaluation, score_diff_threshold, elapsed_time)
+            except Exception as summary_error:
+                self.log_signal.emit(f"生成汇总记录失败: {str(summary_error)}", True)
+
+            if self.completion_status == "completed":
+                self.finished_signal.emit()
+            else:
+                self.error_signal.emit(self.interrupt_reason or "未知错误")
+
+    def _describe_provider_caps(self, dual_evaluation):
+        """本次使用的各供应商并发上限，用于日志"""
+        groups = ("first", "second") if dual_evaluation else ("first",)
+        caps = {}
+        for api_group in groups:
+            settings = self.api_service.get_api_group_settings(api_group)
+            if settings and settings[0]:
+                caps[settings[0]] = self.api_service.get_provider_concurrency(settings[0])
+        return "，".join(f"{provider} 最多 {cap} 个在途请求" for provider, cap in caps.items()) or "未配置API"
+
+    def _grade_image(self, name, loader, q_config, prompt, dual_evaluation, score_diff_threshold):
+        """
+        在线程池中评分一份答题图片。
+
+        Returns:
+            (eval_result, grading_source)，eval_result 与 evaluate_answer 的返回格式相同
+        """
+        if not self.running:
+            return None, "api"
+        with self.tracer.span("整份答卷", image=name):
+            return self._grade_loaded_image(name, loader, q_config, prompt, dual_evaluation, score_diff_threshold)
+
+    def _grade_loaded_image(self, name, loader, q_config, prompt, dual_evaluation, score_diff_threshold):
+        """读取图片、空白检测、编码并调用API评分（_grade_image 的主体）"""
+        try:
+            with self.tracer.span("读取图片", image=name):
+                image = loader()
+        except Exception as e:
+            return (None, f"读取图片失败: {str(e)}", None, None, None), "api"
+
+        question_index = q_config.get('question_index', 1)
+        blank_check = self._check_blank_answer(image, question_index)
+        if blank_check is not None:
+            return self._build_local_blank_result(q_config, blank_check), "local-blank"
+
+        img_str = self.encode_answer_image(image, q_config)
+        if not img_str:
+            return (None, "图片编码失败", None, None, None), "api"
+        return self.evaluate_answer(img_str, prompt, q_config, dual_evaluation, score_diff_threshold), "api"
+
+    def _record_image_result(self, name, question_index, eval_result, grading_source):
+        """发出一份答题图片的阅卷记录（格式与屏幕阅卷相同，附加图片名称）"""
+        if eval_result is None:
+            return
+        score, reasoning_data, itemized_scores_data, confidence_data, raw_ai_response = eval_result
+        extra_fields = {'source_image': name}
+        if score is None:
+            self.log_signal.emit(f"{name} 评分失败: {reasoning_data}", True)
+            self.record_grading_result(question_index, 0, None, reasoning_data, itemized_scores_data, confidence_data,
+                                       extra_fields=extra_fields)
+            return
+        self.record_grading_result(question_index, score, None, reasoning_data, itemized_scores_data, confidence_data,
+                                   raw_ai_response, grading_source=grading_source, extra_fields=extra_fields)
+
+# --- END OF FILE batch_grader.py ---
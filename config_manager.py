@@ -5,6 +5,14 @@ import os
 import sys
 import appdirs
 
+
+def get_app_base_dir():
+    """获取程序所在目录（打包后为exe所在目录，开发环境为源码目录），阅卷记录等数据存放于此"""
+    if getattr(sys, 'frozen', False):
+        return os.path.dirname(sys.executable)
+    return os.path.dirname(os.path.abspath(__file__))
+
+
 class ConfigManager:
     """配置管理器,负责保存和加载配置"""
     _instance = None
@@ -51,6 +59,22 @@ class ConfigManager:
         self.subject = ""
         self.cycle_number = 1
         self.wait_time = 2
+        self.concurrent_grading_enabled = False # 多题并发阅卷（各题答案区域同屏时可用）
+        self.max_concurrent_requests = 4
+        self.page_change_detection = True # 通过截图判断网页翻页完成，替代固定等待
+        self.page_change_timeout = 10
+        self.page_stable_frames = 3
+        self.batch_concurrency = 8 # 离线批量阅卷同时评分的答卷数
+        self.response_cache_enabled = True # 相同答案图片复用已缓存的AI评分响应
+        self.response_cache_max_mb = 200
+        self.blank_detection_enabled = True # 本地空白作答检测，判定为空白时直接给最低分
+        self.blank_ink_ratio_threshold = 0.0005
+        self.log_level = "INFO" # 日志区显示的最低级别（DEBUG/INFO/ERROR），日志文件始终记录全部
+        self.log_view_max_lines = 5000 # 日志区最多保留的消息条数
+        self.log_file_max_mb = 5 # 单个日志文件大小上限，超过后轮换
+        self.usage_budget = 0.0 # 单次运行的费用上限（与单价同一货币），0 表示不限
+        self.usage_token_budget = 0 # 单次运行的token上限，0 表示不限
+        self.price_table = {} # {"供应商/模型ID": "输入单价, 输出单价[, 缓存输入单价]"}，每百万tokens
         
         self.question_configs = {}
         for i in range(1, self.max_questions + 1):
@@ -66,6 +90,12 @@ class ConfigManager:
                 'enable_next_button': False,
                 'next_button_pos': None,
                 'question_type': 'Subjective_PointBased_QA',
+                # 上传前的图片预处理
+                'image_auto_trim': True,
+                'image_grayscale': False,
+                'image_max_edge': 1600,
+                'image_autocontrast': False,
+                'image_jpeg_quality': 75,
             }
             if is_q1:
                 self.question_configs[str(i)].update({
@@ -103,6 +133,22 @@ class ConfigManager:
         self.subject = self._get_config_safe('UI', 'subject', "")
         self.cycle_number = self._get_config_safe('Auto', 'cycle_number', 1, int)
         self.wait_time = self._get_config_safe('Auto', 'wait_time', 2, int)
+        self.concurrent_grading_enabled = self._get_config_safe('Auto', 'concurrent_grading', False, bool)
+        self.max_concurrent_requests = max(1, self._get_config_safe('Auto', 'max_concurrent_requests', 4, int))
+        self.page_change_detection = self._get_config_safe('Auto', 'page_change_detection', True, bool)
+        self.page_change_timeout = max(1, self._get_config_safe('Auto', 'page_change_timeout', 10, int))
+        self.page_stable_frames = max(1, self._get_config_safe('Auto', 'page_stable_frames', 3, int))
+        self.batch_concurrency = max(1, self._get_config_safe('Auto', 'batch_concurrency', 8, int))
+        self.response_cache_enabled = self._get_config_safe('Cache', 'enabled', True, bool)
+        self.response_cache_max_mb = max(1, self._get_config_safe('Cache', 'max_size_mb', 200, int))
+        self.blank_detection_enabled = self._get_config_safe('BlankDetection', 'enabled', True, bool)
+        self.blank_ink_ratio_threshold = self._get_config_safe('BlankDetection', 'ink_ratio_threshold', 0.0005, float)
+        self.log_level = self._get_config_safe('Log', 'level', "INFO").strip().upper() or "INFO"
+        self.log_view_max_lines = max(100, self._get_config_safe('Log', 'view_max_lines', 5000, int))
+        self.log_file_max_mb = max(1, self._get_config_safe('Log', 'file_max_mb', 5, int))
+        self.usage_budget = max(0.0, self._get_config_safe('Usage', 'budget', 0.0, float))
+        self.usage_token_budget = max(0, self._get_config_safe('Usage', 'token_budget', 0, int))
+        self.price_table = dict(self.parser.items('Pricing')) if self.parser.has_section('Pricing') else {}
         
         for i in range(1, self.max_questions + 1):
             section_name = f'Question{i}'
@@ -121,7 +167,12 @@ class ConfigManager:
                 'max_score': self._get_config_safe(section_name, 'max_score', 100, int),
                 'enable_next_button': self._get_config_safe(section_name, 'enable_next_button', False, bool),
                 'next_button_pos': self._parse_position(self._get_config_safe(section_name, 'next_button_pos', None)),
-                'question_type': self._get_config_safe(section_name, 'question_type', 'Subjective_PointBased_QA', str)
+                'question_type': self._get_config_safe(section_name, 'question_type', 'Subjective_PointBased_QA', str),
+                'image_auto_trim': self._get_config_safe(section_name, 'image_auto_trim', True, bool),
+                'image_grayscale': self._get_config_safe(section_name, 'image_grayscale', False, bool),
+                'image_max_edge': max(0, self._get_config_safe(section_name, 'image_max_edge', 1600, int)),
+                'image_autocontrast': self._get_config_safe(section_name, 'image_autocontrast', False, bool),
+                'image_jpeg_quality': min(95, max(30, self._get_config_safe(section_name, 'image_jpeg_quality', 75, int))),
             }
             if i == 1:
                 current_q_config['enable_three_step_scoring'] = self._get_config_safe(section_name, 'enable_three_step_scoring', False, bool)
@@ -142,6 +193,7 @@ class ConfigManager:
             raw_val = self.parser.get(section, option)
             if value_type == str: return raw_val
             elif value_type == int: return int(raw_val) if raw_val and raw_val.strip() else default_value
+            elif value_type == float: return float(raw_val) if raw_val and raw_val.strip() else default_value
             elif value_type == bool: return self.parser.getboolean(section, option)
             return default_value
         except (ValueError, TypeError):
@@ -181,6 +233,21 @@ class ConfigManager:
         elif field_name == 'subject': self.subject = str(value) if value else ""
         elif field_name == 'cycle_number': self.cycle_number = max(1, int(value)) if value else 1
         elif field_name == 'wait_time': self.wait_time = max(2, int(value)) if value else 2
+        elif field_name == 'concurrent_grading_enabled': self.concurrent_grading_enabled = bool(value)
+        elif field_name == 'max_concurrent_requests': self.max_concurrent_requests = max(1, int(value)) if value else 4
+        elif field_name == 'page_change_detection': self.page_change_detection = bool(value)
+        elif field_name == 'page_change_timeout': self.page_change_timeout = max(1, int(value)) if value else 10
+        elif field_name == 'page_stable_frames': self.page_stable_frames = max(1, int(value)) if value else 3
+        elif field_name == 'batch_concurrency': self.batch_concurrency = max(1, int(value)) if value else 8
+        elif field_name == 'response_cache_enabled': self.response_cache_enabled = bool(value)
+        elif field_name == 'response_cache_max_mb': self.response_cache_max_mb = max(1, int(value)) if value else 200
+        elif field_name == 'blank_detection_enabled': self.blank_detection_enabled = bool(value)
+        elif field_name == 'blank_ink_ratio_threshold': self.blank_ink_ratio_threshold = max(0.0, float(value)) if value is not None else 0.0005
+        elif field_name == 'log_level': self.log_level = str(value).strip().upper() if value else "INFO"
+        elif field_name == 'log_view_max_lines': self.log_view_max_lines = max(100, int(value)) if value else 5000
+        elif field_name == 'log_file_max_mb': self.log_file_max_mb = max(1, int(value)) if value else 5
+        elif field_name == 'usage_budget': self.usage_budget = max(0.0, float(value)) if value else 0.0
+        elif field_name == 'usage_token_budget': self.usage_token_budget = max(0, int(value)) if value else 0
         elif field_name == 'dual_evaluation_enabled': self.dual_evaluation_enabled = bool(value)
         elif field_name == 'score_diff_threshold': self.score_diff_threshold = max(1, int(value)) if value else 5
         elif field_name.startswith('question_'): self._update_question_config_from_field_name(field_name, value)
@@ -207,6 +274,11 @@ class ConfigManager:
         elif field_type == 'enable_next_button': self.question_configs[q_index]['enable_next_button'] = bool(value)
         elif field_type == 'next_button_pos': self.question_configs[q_index]['next_button_pos'] = value
         elif field_type == 'question_type': self.question_configs[q_index]['question_type'] = str(value) if value else 'Subjective_PointBased_QA'
+        elif field_type == 'image_auto_trim': self.question_configs[q_index]['image_auto_trim'] = bool(value)
+        elif field_type == 'image_grayscale': self.question_configs[q_index]['image_grayscale'] = bool(value)
+        elif field_type == 'image_max_edge': self.question_configs[q_index]['image_max_edge'] = max(0, int(value)) if value is not None else 1600
+        elif field_type == 'image_autocontrast': self.question_configs[q_index]['image_autocontrast'] = bool(value)
+        elif field_type == 'image_jpeg_quality': self.question_configs[q_index]['image_jpeg_quality'] = min(95, max(30, int(value))) if value is not None else 75
         elif q_index == '1': # 仅第一题
             if field_type == 'enable_three_step_scoring': self.question_configs[q_index]['enable_three_step_scoring'] = bool(value)
             elif field_type == 'score_input_pos_step1': self.question_configs[q_index]['score_input_pos_step1'] = value
@@ -235,7 +307,34 @@ class ConfigManager:
                 'second_modelID': self.second_modelID,
             }
             config['UI'] = {'subject': self.subject}
-            config['Auto'] = {'cycle_number': str(self.cycle_number), 'wait_time': str(self.wait_time)}
+            config['Auto'] = {
+                'cycle_number': str(self.cycle_number),
+                'wait_time': str(self.wait_time),
+                'concurrent_grading': str(self.concurrent_grading_enabled),
+                'max_concurrent_requests': str(self.max_concurrent_requests),
+                'page_change_detection': str(self.page_change_detection),
+                'page_change_timeout': str(self.page_change_timeout),
+                'page_stable_frames': str(self.page_stable_frames),
+                'batch_concurrency': str(self.batch_concurrency),
+            }
+            config['Cache'] = {
+                'enabled': str(self.response_cache_enabled),
+                'max_size_mb': str(self.response_cache_max_mb),
+            }
+            config['BlankDetection'] = {
+                'enabled': str(self.blank_detection_enabled),
+                'ink_ratio_threshold': str(self.blank_ink_ratio_threshold),
+            }
+            config['Log'] = {
+                'level': self.log_level,
+                'view_max_lines': str(self.log_view_max_lines),
+                'file_max_mb': str(self.log_file_max_mb),
+            }
+            config['Usage'] = {
+                'budget': str(self.usage_budget),
+                'token_budget': str(self.usage_token_budget),
+            }
+            config['Pricing'] = dict(self.price_table)
             config['DualEvaluation'] = {'enabled': str(self.dual_evaluation_enabled), 'score_diff_threshold': str(self.score_diff_threshold)}
             
             for i in range(1, self.max_questions + 1):
@@ -257,6 +356,11 @@ class ConfigManager:
                     'confirm_button': f"{q_config['confirm_button_pos'][0]},{q_config['confirm_button_pos'][1]}" if q_config['confirm_button_pos'] else "",
                     'next_button_pos': f"{q_config['next_button_pos'][0]},{q_config['next_button_pos'][1]}" if q_config['next_button_pos'] else "",
                     'answer_area': f"{q_config['answer_area']['x1']},{q_config['answer_area']['y1']},{q_config['answer_area']['x2']},{q_config['answer_area']['y2']}" if q_config['answer_area'] else "",
+                    'image_auto_trim': str(q_config.get('image_auto_trim', True)),
+                    'image_grayscale': str(q_config.get('image_grayscale', False)),
+                    'image_max_edge': str(q_config.get('image_max_edge', 1600)),
+                    'image_autocontrast': str(q_config.get('image_autocontrast', False)),
+                    'image_jpeg_quality': str(q_config.get('image_jpeg_quality', 75)),
                 }
                 
                 if q_idx_str == '1':
@@ -277,6 +381,10 @@ class ConfigManager:
             print(f"保存配置文件失败: {e}")
             return False
 
+    def get_blank_template_dir(self):
+        """空白答题卡模板的保存目录（与配置文件同目录）"""
+        return os.path.join(self.config_dir, "blank_templates")
+
     def get_enabled_questions(self):
         return [i for i in range(1, self.max_questions + 1) if self.question_configs.get(str(i), {}).get('enabled', False)]
 
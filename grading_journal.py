@@ -0,0 +1,391 @@
+# --- START OF FILE grading_journal.py ---
+#
+# ==============================================================================
+#  阅卷记录日志 (Append-Only Grading Journal)
+#
+#  原来每条阅卷记录都要读出当天整个Excel、追加一两行、再整体重写并逐格设置格式，
+#  阅卷N份的磁盘开销是 O(N²)，几百份之后明显变慢。现在改为:
+#  - 每条记录（含批次汇总）先以一行JSON追加到与Excel同名的 .jsonl 日志，并 fsync 落盘
+#  - 阅卷结束（收到汇总记录）或手动“添加最新阅卷记录”时，从日志一次性生成Excel
+#    （write-only 流式写出，逐条读取日志，内存占用与记录数无关）
+#  Excel 只是日志的导出结果，被占用无法写入时日志不受影响，稍后重新导出即可。
+# ==============================================================================
+
+import itertools
+import json
+import os
+import threading
+
+from api_usage import format_usage_summary
+from run_tracer import format_stage_stats
+
+JOURNAL_SUFFIX = ".jsonl"
+# 升级前已存在的Excel在首次写日志时导入为一条 legacy_rows 记录，避免导出时丢失
+LEGACY_RECORD_TYPE = "legacy_rows"
+
+SHEET_NAME = "阅卷记录"
+SINGLE_HEADERS = ["时间", "题目编号", "学生答案摘要", "评分依据", "AI分项得分", "最终得分"]
+DUAL_HEADERS = ["时间", "题目编号", "API标识", "分差阈值", "学生答案摘要", "评分依据", "AI分项得分", "AI原始总分", "双评分差", "最终得分"]
+SUMMARY_HEADERS = ["汇总信息"]
+COLUMN_WIDTHS = {
+    'A': 15,  # 时间
+    'B': 10,  # 题目编号
+    'C': 10,  # API标识
+    'D': 10,  # 分差阈值
+    'E': 80,  # 学生答案摘要（增加宽度以容纳较长的AI回答）
+    'F': 100, # 评分依据（增加宽度以容纳详细的评分理由）
+    'G': 20,  # AI分项得分
+    'H': 15,  # AI原始总分/最终得分
+    'I': 12,  # 双评分差
+    'J': 12   # 最终得分
+}
+SUMMARY_COLUMN_WIDTHS = {'A': 80}  # 只有汇总信息时
+
+
+def get_journal_path(excel_filepath):
+    """Excel文件对应的日志路径（同目录、同名、.jsonl 后缀）"""
+    root, _ext = os.path.splitext(str(excel_filepath))
+    return root + JOURNAL_SUFFIX
+
+
+def get_excel_path(journal_path):
+    """日志对应的Excel文件路径"""
+    root, _ext = os.path.splitext(str(journal_path))
+    return root + ".xlsx"
+
+
+def _format_time(timestamp_raw):
+    """'2025年09月20日_143005' -> '14点30分05秒'"""
+    if '_' in timestamp_raw:
+        time_part = timestamp_raw.split('_')[1]
+        if len(time_part) == 6:
+            return f"{time_part[:2]}点{time_part[2:4]}分{time_part[4:6]}秒"
+        return time_part
+    return timestamp_raw
+
+
+def build_detail_rows(record_data):
+    """
+    将一条详细阅卷记录转换为Excel行。
+
+    Returns:
+        (headers, rows)，双评记录通常为两行（API-1、API-2）
+    """
+    is_dual = record_data.get('is_dual_evaluation', False)
+    is_local_blank = record_data.get('grading_source') == 'local-blank'
+    if is_local_blank:
+        # 本地空白检测的记录跟随本次运行的模式，保证与同一文件中其他记录的列一致
+        is_dual = record_data.get('is_dual_evaluation_run', False)
+
+    timestamp_str = _format_time(record_data.get('timestamp', ''))
+    question_index_str = f"题目{record_data.get('question_index', 0)}"
+    if record_data.get('source_image'):
+        # 离线批量阅卷：附上答题图片名称，便于对照原卷
+        question_index_str += f" ({record_data['source_image']})"
+    final_total_score_str = str(record_data.get('total_score', 0))
+
+    if is_dual and is_local_blank:
+        return DUAL_HEADERS, [[timestamp_str, question_index_str, "本地检测",
+                               str(record_data.get('score_diff_threshold', "未提供")),
+                               record_data.get('student_answer', '未提供'),
+                               record_data.get('reasoning_basis', '未提供'),
+                               record_data.get('sub_scores', 'local-blank'),
+                               "-", "-", final_total_score_str]]
+    if is_dual:
+        rows = []
+        for api_label, prefix in (("API-1", "api1"), ("API-2", "api2")):
+            rows.append([timestamp_str, question_index_str, api_label,
+                         str(record_data.get('score_diff_threshold', "未提供")),
+                         record_data.get(f'{prefix}_student_answer_summary', '未提供'),
+                         record_data.get(f'{prefix}_scoring_basis', '未提供'),
+                         str(record_data.get(f'{prefix}_itemized_scores', [])),
+                         str(record_data.get(f'{prefix}_raw_score', 0.0)),
+                         f"{record_data.get('score_difference', 0.0):.2f}",
+                         final_total_score_str])
+        return DUAL_HEADERS, rows
+
+    # 单评模式
+    return SINGLE_HEADERS, [[timestamp_str, question_index_str,
+                             record_data.get('student_answer', '无法提取'),
+                             record_data.get('reasoning_basis', '无法提取'),
+                             record_data.get('sub_scores', '未提供'),
+                             final_total_score_str]]
+
+
+def build_summary_row(record_data):
+    """将批次汇总记录转换为一行汇总信息（每项一个单元格）"""
+    status_map = {
+        "completed": "正常完成",
+        "error": "因错误中断",
+        "threshold_exceeded": "因双评分差过大中断"
+    }
+    status_text = status_map.get(record_data.get('completion_status', 'unknown'), "未知状态")
+
+    interrupt_reason = record_data.get('interrupt_reason')
+    if interrupt_reason:
+        status_text += f" ({interrupt_reason})"
+
+    formatted_summary_time = _format_time(record_data.get('timestamp', '未提供_未提供'))
+    summary_title = "离线批量阅卷汇总" if record_data.get('run_mode') == 'batch' else "批次阅卷汇总"
+
+    summary_data = [
+        f"--- {summary_title} ({formatted_summary_time}) ---",
+        f"状态: {status_text}",
+        f"计划/完成: {record_data.get('total_questions_attempted', '未提供')} / {record_data.get('questions_completed', '未提供')} 个",
+        f"总用时: {record_data.get('total_elapsed_time_seconds', 0):.2f} 秒",
+        f"模式: {'双评' if record_data.get('dual_evaluation_enabled') else '单评'}",
+    ]
+
+    if record_data.get('dual_evaluation_enabled'):
+        summary_data.append(f"模型: {record_data.get('first_model_id', '未指定')} vs {record_data.get('second_model_id', '未指定')}")
+    else:
+        summary_data.append(f"模型: {record_data.get('first_model_id', '未指定')}")
+
+    if record_data.get('local_blank_count'):
+        summary_data.append(f"本地空白判定: {record_data['local_blank_count']} 题（未调用API）")
+
+    if 'response_cache_hits' in record_data:
+        summary_data.append(f"响应缓存: 命中 {record_data['response_cache_hits']} 次 / 未命中 {record_data['response_cache_misses']} 次")
+
+    for line in format_usage_summary(record_data.get('api_usage')):
+        summary_data.append(f"API用量 {line}")
+
+    for line in format_stage_stats(record_data.get('stage_timings') or {}):
+        summary_data.append(f"阶段耗时 {line}")
+    if record_data.get('trace_file'):
+        summary_data.append(f"耗时追踪文件: {os.path.basename(record_data['trace_file'])}")
+
+    return summary_data
+
+
+def is_file_locked(filepath):
+    """检查文件是否被锁定（主要因被其他进程打开）"""
+    try:
+        with open(filepath, 'a'):
+            pass
+        return False
+    except PermissionError:
+        return True
+    except Exception:
+        return False
+
+
+def read_excel_rows(excel_filepath):
+    """读取已有Excel中的全部行（含表头），读取失败返回空列表"""
+    try:
+        from openpyxl import load_workbook
+        workbook = load_workbook(excel_filepath, read_only=True)
+        try:
+            worksheet = workbook.active
+            return [["" if value is None else value for value in row] for row in worksheet.iter_rows(values_only=True)]
+        finally:
+            workbook.close()
+    except Exception:
+        return []
+
+
+class GradingJournal:
+    """追加写入的阅卷记录日志，每行一条JSON记录，线程安全"""
+
+    _locks = {}
+    _locks_guard = threading.Lock()
+
+    def __init__(self, journal_path):
+        self.journal_path = str(journal_path)
+        # 同一日志文件的所有实例共用一把锁，保证多线程追加时行不交错
+        with GradingJournal._locks_guard:
+            self._lock = GradingJournal._locks.setdefault(os.path.abspath(self.journal_path), threading.Lock())
+
+    @classmethod
+    def for_excel(cls, excel_filepath):
+        return cls(get_journal_path(excel_filepath))
+
+    def exists(self):
+        return os.path.exists(self.journal_path)
+
+    def append(self, record_data):
+        """追加一条记录并落盘（flush + fsync），返回后即使程序崩溃记录也不会丢失"""
+        self.append_many([record_data])
+
+    def append_many(self, records):
+        """一次写入多条记录，只做一次 fsync"""
+        if not records:
+            return
+        data = "".join(json.dumps(record_data, ensure_ascii=False, default=str) + "\n" for record_data in records)
+        with self._lock:
+            if not os.path.exists(self.journal_path):
+                os.makedirs(os.path.dirname(os.path.abspath(self.journal_path)), exist_ok=True)
+                self._import_legacy_excel_locked()
+            with open(self.journal_path, "a", encoding="utf-8") as f:
+                f.write(data)
+                f.flush()
+                os.fsync(f.fileno())
+
+    def _import_legacy_excel_locked(self):
+        excel_filepath = get_excel_path(self.journal_path)
+        if not os.path.exists(excel_filepath):
+            return
+        legacy_rows = read_excel_rows(excel_filepath)
+        if not legacy_rows:
+            return
+        with open(self.journal_path, "a", encoding="utf-8") as f:
+            f.write(json.dumps({'record_type': LEGACY_RECORD_TYPE, 'rows': legacy_rows}, ensure_ascii=False, default=str) + "\n")
+
+    def iter_records(self):
+        """
+        按写入顺序逐条读取记录（流式，不把整个日志读入内存）。
+        跳过无法解析的行（如写入中断留下的半行）。
+        """
+        if not os.path.exists(self.journal_path):
+            return
+        with open(self.journal_path, "r", encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    yield json.loads(line)
+                except ValueError:
+                    continue
+
+    def is_export_stale(self):
+        """日志是否比对应的Excel新（Excel不存在或在最后一次追加之前生成）"""
+        excel_filepath = get_excel_path(self.journal_path)
+        if not self.exists():
+            return False
+        if not os.path.exists(excel_filepath):
+            return True
+        return os.path.getmtime(self.journal_path) > os.path.getmtime(excel_filepath)
+
+    def find_headers(self):
+        """表头由第一条详细记录（或导入的旧Excel）决定；只有汇总记录时返回 None"""
+        for record_data in self.iter_records():
+            record_type = record_data.get('record_type')
+            if record_type == LEGACY_RECORD_TYPE:
+                legacy_rows = record_data.get('rows') or []
+                if legacy_rows:
+                    return list(legacy_rows[0])
+            elif record_type != 'summary':
+                return build_detail_rows(record_data)[0]
+        return None
+
+    def iter_sheet_rows(self, stats=None):
+        """
+        按Excel中的排列逐行生成数据行（不含表头）。
+
+        Args:
+            stats: 可选 dict，生成结束后 stats['record_count'] 为详细记录条数
+        """
+        record_count = 0
+        for record_data in self.iter_records():
+            record_type = record_data.get('record_type')
+            if record_type == LEGACY_RECORD_TYPE:
+                legacy_rows = record_data.get('rows') or []
+                yield from legacy_rows[1:]
+            elif record_type == 'summary':
+                # 汇总信息与上方记录之间空两行，之后空四行，与原有格式一致
+                yield from ([], [])
+                yield build_summary_row(record_data)
+                yield from ([], [], [], [])
+            else:
+                yield from build_detail_rows(record_data)[1]
+                record_count += 1
+        if stats is not None:
+            stats['record_count'] = record_count
+
+
+def write_excel(excel_filepath, headers, rows, column_widths=None):
+    """
+    以 openpyxl 的 write-only 模式流式写入Excel（覆盖原文件），内存占用与行数无关。
+
+    列宽按列设置一次；换行/加粗使用两个命名样式，所有单元格共用同一样式，
+    不再逐格创建 Alignment/Font 对象。
+
+    Args:
+        headers: 表头
+        rows: 可迭代的数据行，可以是生成器
+        column_widths: {列字母: 宽度}，默认按阅卷记录的列宽
+    """
+    from openpyxl import Workbook
+    from openpyxl.cell import WriteOnlyCell
+    from openpyxl.styles import Alignment, Font, NamedStyle
+
+    if column_widths is None:
+        column_widths = COLUMN_WIDTHS
+
+    workbook = Workbook(write_only=True)
+    worksheet = workbook.create_sheet(SHEET_NAME)
+    # write-only 模式下列宽必须在写入第一行之前设置
+    for col, width in column_widths.items():
+        worksheet.column_dimensions[col].width = width
+
+    body_style = NamedStyle(name="阅卷记录正文", alignment=Alignment(wrap_text=True, vertical='top'))
+    header_style = NamedStyle(name="阅卷记录表头", font=Font(bold=True), alignment=Alignment(wrap_text=True, vertical='top'))
+    workbook.add_named_style(body_style)
+    workbook.add_named_style(header_style)
+
+    def styled_row(values, style_name):
+        cells = []
+        for value in values:
+            cell = WriteOnlyCell(worksheet, value=value)
+            cell.style = style_name
+            cells.append(cell)
+        return cells
+
+    worksheet.append(styled_row(headers, header_style.name))
+    for row in rows:
+        worksheet.append(styled_row(row, body_style.name))
+
+    # 先写临时文件再替换，避免导出中途失败留下损坏的Excel
+    excel_filepath = str(excel_filepath)
+    tmp_path = excel_filepath + ".tmp"
+    workbook.save(tmp_path)
+    try:
+        os.replace(tmp_path, excel_filepath)
+    except OSError:
+        os.remove(tmp_path)
+        raise
+
+
+def export_journal_to_excel(journal_path, excel_filepath=None):
+    """
+    从日志流式生成Excel文件（覆盖原文件）：逐条读取日志、逐行写出，不构建完整的表格数据。
+
+    Returns:
+        导出的详细记录条数
+    """
+    journal = GradingJournal(journal_path)
+    excel_filepath = str(excel_filepath or get_excel_path(journal_path))
+
+    headers = journal.find_headers()
+    stats = {}
+    rows = journal.iter_sheet_rows(stats)
+    if headers is None:
+        # 只有汇总记录（例如第一题就中断）：去掉开头的空行
+        headers = list(SUMMARY_HEADERS)
+        column_widths = SUMMARY_COLUMN_WIDTHS
+        rows = itertools.dropwhile(lambda row: not row, rows)
+    else:
+        column_widths = COLUMN_WIDTHS
+
+    write_excel(excel_filepath, headers, rows, column_widths)
+    return stats.get('record_count', 0)
+
+
+def find_stale_journals(record_dir):
+    """查找记录目录下尚未导出到Excel（或导出后又有新记录）的日志"""
+    stale = []
+    if not os.path.isdir(record_dir):
+        return stale
+    for date_dir in os.listdir(record_dir):
+        date_path = os.path.join(record_dir, date_dir)
+        if date_dir.startswith('.') or not os.path.isdir(date_path):
+            continue
+        for name in os.listdir(date_path):
+            if name.endswith(JOURNAL_SUFFIX):
+                journal_path = os.path.join(date_path, name)
+                if GradingJournal(journal_path).is_export_stale():
+                    stale.append(journal_path)
+    return sorted(stale)
+
+# --- END OF FILE grading_journal.py ---
@@ -0,0 +1,59 @@
+# --- START OF FILE grading_schema.py ---
+#
+# ==============================================================================
+#  评分结果的JSON输出格式 (Grading Output Schema)
+#
+#  各题型的Prompt都要求模型输出同一个JSON结构:
+#      student_answer_summary  字符串，学生答案摘要
+#      scoring_basis           字符串，评分依据
+#      itemized_scores         数字列表，分项得分（整体评估题只有一个总分）
+#  这里集中定义该结构，供以下场景共用:
+#  - 原生结构化输出: 支持 response_format=json_schema 的供应商直接按该结构约束输出
+#  - JSON修复: 模型输出格式不对时，把原始输出和该结构以纯文本请求发给模型整理，
+#    不必重新上传图片、重新评分
+# ==============================================================================
+
+import json
+
+# 评分结果的 JSON Schema（字段说明与各题型Prompt中的 output_format_specification 一致）
+GRADING_OUTPUT_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "student_answer_summary": {"type": "string", "description": "学生手写答案的客观概括"},
+        "scoring_basis": {"type": "string", "description": "逐个得分点的评分判断与理由"},
+        "itemized_scores": {
+            "type": "array",
+            "items": {"type": "number"},
+            "description": "按评分细则顺序的各得分点实际得分；整体评估题只有一个总分",
+        },
+    },
+    "required": ["student_answer_summary", "scoring_basis", "itemized_scores"],
+    "additionalProperties": False,
+}
+
+# 修复请求中最多附带的原始输出字符数（评分依据通常远小于此值，超长输出多为模型异常）
+MAX_REPAIR_INPUT_CHARS = 12000
+
+
+def build_json_repair_prompt(malformed_text):
+    """
+    构建JSON修复请求的提示词（纯文本，不含图片）。
+
+    只要求整理格式，不允许重新评分或修改分数，修复后的输出仍按正常流程解析和校验。
+    """
+    text = malformed_text or ""
+    if len(text) > MAX_REPAIR_INPUT_CHARS:
+        text = text[:MAX_REPAIR_INPUT_CHARS]
+    schema_text = json.dumps(GRADING_OUTPUT_SCHEMA, ensure_ascii=False, separators=(',', ':'))
+    return (
+        "下面是一位阅卷老师给出的评分结果，但它不是合法的JSON，或者缺少/写错了字段。"
+        "请把它整理为符合以下JSON Schema的一个JSON对象。\n"
+        "要求：\n"
+        "1. 只整理格式，不得重新评分，不得修改任何分数、增删得分点或改写评分理由的含义。\n"
+        "2. itemized_scores 必须是纯数字列表（如 [2, 0, 1.5]），去掉“分”等单位和文字。\n"
+        "3. 只输出JSON对象本身，不要添加代码块标记或任何解释。\n\n"
+        f"【JSON Schema】\n{schema_text}\n\n"
+        f"【原始评分结果】\n{text}"
+    )
+
+# --- END OF FILE grading_schema.py ---
@@ -0,0 +1,241 @@
+# --- START OF FILE image_processing.py ---
+#
+# ==============================================================================
+#  答案区域图像处理 (Answer Area Image Processing)
+#
+#  截图后、调用AI前在本地完成的图像分析，只依赖 Pillow：
+#  - 空白作答检测：根据墨迹占比判断答案区域是否未作答（同时给出灰度标准差），
+#    可选地与设置阶段采集的空白模板逐像素比较，排除印刷的横线/方格
+#  - 上传前预处理：裁去空白边距、灰度化、限制最长边、对比度拉伸、JPEG质量控制（按题目配置）
+#  - 页面指纹：缩略灰度图，用于判断阅卷网页是否已翻到下一份答卷
+# ==============================================================================
+
+import os
+from io import BytesIO
+from typing import TYPE_CHECKING, NamedTuple, Optional
+
+# PIL 导入较慢（程序启动时窗口显示前不需要），各函数在首次使用时才导入
+if TYPE_CHECKING:
+    from PIL import Image
+
+# 比纸面背景暗多少灰度级才算作墨迹（与模板比较时为差值阈值），可容忍扫描底色和轻微噪点
+INK_DELTA = 50
+# 比纸面背景暗多少灰度级就算作可能的笔迹。远低于 INK_DELTA，浅色铅笔字、淡色修改痕迹也计入。
+# 空白检测和自动裁边的外框都按该阈值计算：宁可把空白交给AI、多留空白，也不能漏判或裁掉答案
+FAINT_INK_DELTA = 12
+# 墨迹像素绝对数量上限：大面积答案区域中写一个短答案时占比可能很低，
+# 只有墨迹像素同时少于该值（只剩零星噪点）才判定为空白
+BLANK_MAX_INK_PIXELS = 40
+# 默认墨迹占比阈值：低于 0.05% 判定为空白。取值偏保守，
+# 填空题中单个数字的笔画通常也会超过该值，宁可交给AI也不误判为空白
+DEFAULT_INK_RATIO_THRESHOLD = 0.0005
+
+
+class BlankCheckResult(NamedTuple):
+    """空白检测结果"""
+    is_blank: bool
+    ink_ratio: float     # 笔迹像素占比 (0~1)，含浅色笔迹
+    stddev: float        # 灰度标准差
+    used_template: bool  # 是否与空白模板比较
+
+
+def _estimate_background_level(histogram) -> int:
+    """以亮度的90分位数估计纸面背景灰度（作答区域中纸面像素占绝大多数）"""
+    total = sum(histogram)
+    target = total * 0.9
+    cumulative = 0
+    for level, count in enumerate(histogram):
+        cumulative += count
+        if cumulative >= target:
+            return level
+    return 255
+
+
+def detect_blank_answer(image: "Image.Image", template: Optional["Image.Image"] = None,
+                        ink_ratio_threshold: float = DEFAULT_INK_RATIO_THRESHOLD) -> BlankCheckResult:
+    """
+    判断答案区域截图是否为空白作答。
+
+    在原始分辨率的灰度图上统计，不做缩放或平滑，以免细笔画被冲淡而误判为空白。
+    比背景暗 FAINT_INK_DELTA 以上的像素都算作笔迹，浅色铅笔作答不会被判为空白而跳过AI评分。
+    灰度标准差随结果返回，便于在日志中排查误判。
+
+    Args:
+        image: 答案区域截图
+        template: 可选，同一区域的空白答题卡截图；提供时以与模板的差异作为墨迹
+        ink_ratio_threshold: 墨迹占比低于该值（且墨迹像素不超过 BLANK_MAX_INK_PIXELS）判定为空白
+
+    Returns:
+        BlankCheckResult
+    """
+    from PIL import Image, ImageChops, ImageStat
+
+    gray = image.convert("L")
+    total_pixels = gray.size[0] * gray.size[1]
+    if total_pixels == 0:
+        return BlankCheckResult(False, 0.0, 0.0, False)
+
+    stddev = ImageStat.Stat(gray).stddev[0]
+
+    used_template = template is not None
+    if used_template:
+        template_gray = template.convert("L")
+        if template_gray.size != gray.size:
+            template_gray = template_gray.resize(gray.size, Image.BILINEAR)
+        diff_histogram = ImageChops.difference(gray, template_gray).histogram()
+        ink_pixels = sum(diff_histogram[FAINT_INK_DELTA:])
+    else:
+        histogram = gray.histogram()
+        ink_level = _estimate_background_level(histogram) - FAINT_INK_DELTA
+        ink_pixels = sum(histogram[:max(0, ink_level)])
+
+    ink_ratio = ink_pixels / total_pixels
+    is_blank = ink_ratio < ink_ratio_threshold and ink_pixels <= BLANK_MAX_INK_PIXELS
+    return BlankCheckResult(is_blank, ink_ratio, stddev, used_template)
+
+
+# 上传图片预处理的默认参数：手写识别不需要全屏分辨率，长边1600像素已足够清晰
+DEFAULT_IMAGE_MAX_EDGE = 1600
+DEFAULT_JPEG_QUALITY = 75
+
+
+# 自动裁边：内容外框四周保留的边距（像素）
+TRIM_PADDING = 48
+# 墨迹像素少于该值时不裁边（可能是浅色笔迹未被识别为墨迹），直接使用完整区域
+TRIM_MIN_INK_PIXELS = 150
+# 裁剪后面积仍超过原图该比例时不裁边，避免为少量收益引入额外处理
+TRIM_MIN_SAVING_RATIO = 0.9
+
+
+def find_content_bbox(image: "Image.Image", padding: int = TRIM_PADDING):
+    """
+    计算答案区域中墨迹内容的外框（含边距）。
+
+    是否裁边按深色墨迹（INK_DELTA）判断，外框则按浅得多的阈值（FAINT_INK_DELTA）计算，
+    远离深色笔迹的浅色笔画同样保留。
+
+    Returns:
+        (left, top, right, bottom)；墨迹过少或外框几乎覆盖整图时返回 None，表示应使用完整区域
+    """
+    gray = image.convert("L")
+    histogram = gray.histogram()
+    background_level = _estimate_background_level(histogram)
+    ink_level = max(0, background_level - INK_DELTA)
+    if sum(histogram[:ink_level]) < TRIM_MIN_INK_PIXELS:
+        return None
+
+    content_level = max(0, background_level - FAINT_INK_DELTA)
+    content_mask = gray.point(lambda value: 255 if value < content_level else 0)
+    content_bbox = content_mask.getbbox()
+    if content_bbox is None:
+        return None
+
+    width, height = gray.size
+    left, top, right, bottom = content_bbox
+    bbox = (max(0, left - padding), max(0, top - padding), min(width, right + padding), min(height, bottom + padding))
+    if (bbox[2] - bbox[0]) * (bbox[3] - bbox[1]) > width * height * TRIM_MIN_SAVING_RATIO:
+        return None
+    return bbox
+
+
+class ImagePreprocessOptions(NamedTuple):
+    """上传前的图片预处理参数"""
+    auto_trim: bool = True
+    grayscale: bool = False
+    max_long_edge: int = DEFAULT_IMAGE_MAX_EDGE  # 0 表示不缩放
+    autocontrast: bool = False
+    jpeg_quality: int = DEFAULT_JPEG_QUALITY
+
+    @classmethod
+    def from_question_config(cls, q_config) -> "ImagePreprocessOptions":
+        """从题目配置中读取预处理参数，缺失项使用默认值"""
+        q_config = q_config or {}
+        return cls(
+            auto_trim=bool(q_config.get('image_auto_trim', True)),
+            grayscale=bool(q_config.get('image_grayscale', False)),
+            max_long_edge=max(0, int(q_config.get('image_max_edge', DEFAULT_IMAGE_MAX_EDGE) or 0)),
+            autocontrast=bool(q_config.get('image_autocontrast', False)),
+            jpeg_quality=min(95, max(30, int(q_config.get('image_jpeg_quality', DEFAULT_JPEG_QUALITY) or DEFAULT_JPEG_QUALITY))),
+        )
+
+
+def preprocess_answer_image(image: "Image.Image", options: ImagePreprocessOptions) -> "Image.Image":
+    """按预处理参数处理截图，返回可直接编码为JPEG的图像（RGB或L模式）"""
+    from PIL import Image, ImageOps
+
+    if options.auto_trim:
+        bbox = find_content_bbox(image)
+        if bbox is not None:
+            image = image.crop(bbox)
+
+    if options.grayscale:
+        image = image.convert("L")
+    elif image.mode not in ("RGB", "L"):
+        image = image.convert("RGB")
+
+    if options.max_long_edge and max(image.size) > options.max_long_edge:
+        scale = options.max_long_edge / max(image.size)
+        new_size = (max(1, round(image.size[0] * scale)), max(1, round(image.size[1] * scale)))
+        image = image.resize(new_size, Image.LANCZOS)
+
+    if options.autocontrast:
+        # 裁掉两端1%的像素后拉伸灰度范围，使浅色笔迹更清晰
+        image = ImageOps.autocontrast(image, cutoff=1)
+
+    return image
+
+
+def encode_jpeg(image: "Image.Image", quality: int = DEFAULT_JPEG_QUALITY) -> bytes:
+    """将图像编码为JPEG字节串"""
+    buffered = BytesIO()
+    image.save(buffered, format="JPEG", quality=quality)
+    return buffered.getvalue()
+
+
+# 页面指纹：缩成 64x64 灰度缩略图，逐格比较
+FINGERPRINT_SIZE = (64, 64)
+# 单格灰度差超过该值视为该格发生变化
+FINGERPRINT_CELL_DELTA = 16
+
+
+def compute_fingerprint(image: "Image.Image") -> bytes:
+    """计算图像的页面指纹（缩略灰度图的原始字节）"""
+    from PIL import Image
+    return image.convert("L").resize(FINGERPRINT_SIZE, Image.BOX).tobytes()
+
+
+def fingerprint_distance(fingerprint_a: bytes, fingerprint_b: bytes) -> float:
+    """两个页面指纹之间发生变化的格子比例 (0~1)"""
+    if len(fingerprint_a) != len(fingerprint_b) or not fingerprint_a:
+        return 1.0
+    changed = sum(1 for a, b in zip(fingerprint_a, fingerprint_b) if abs(a - b) > FINGERPRINT_CELL_DELTA)
+    return changed / len(fingerprint_a)
+
+
+def get_blank_template_path(template_dir: str, question_index) -> str:
+    """第 question_index 题空白模板的保存路径"""
+    return os.path.join(template_dir, f"question_{question_index}_blank.png")
+
+
+def load_blank_template(template_dir: str, question_index, expected_size=None) -> Optional["Image.Image"]:
+    """
+    加载第 question_index 题的空白模板。
+    模板不存在、无法读取，或与当前截图尺寸不一致（答案区域已重新框定）时返回 None。
+    """
+    from PIL import Image
+
+    if not template_dir:
+        return None
+    path = get_blank_template_path(template_dir, question_index)
+    if not os.path.exists(path):
+        return None
+    try:
+        with Image.open(path) as template:
+            template.load()
+            if expected_size is not None and template.size != tuple(expected_size):
+                return None
+            return template.copy()
+    except OSError:
+        return None
+
+# --- END OF FILE image_processing.py ---
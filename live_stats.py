@@ -0,0 +1,133 @@
+# --- START OF FILE live_stats.py ---
+#
+# ==============================================================================
+#  实时进度统计 (Live Throughput / ETA)
+#
+#  监考/阅卷老师需要在运行中知道：每分钟阅多少份、API 响应有多快、已经重试了几次、
+#  剩余的答卷大约什么时候阅完、按当前速度一共要消耗多少 token。
+#  - progress_signal 只更新计数（很轻），不在每条日志上刷新界面
+#  - 主窗口用 QTimer 定时调用 snapshot() 汇总一次并刷新面板
+#  - 速度使用最近几分钟的滑动窗口，刚开始或中途变慢时也能较快反映真实速度
+# ==============================================================================
+
+import collections
+import datetime
+import time
+
+from run_tracer import percentile
+
+# 计算速度的滑动窗口（秒）
+RATE_WINDOW_SECONDS = 300
+# API 延迟统计使用最近多少次请求
+LATENCY_SAMPLE_SIZE = 50
+
+
+class LiveProgressTracker:
+    """汇总一次阅卷运行的实时进度（在 GUI 线程中使用）"""
+
+    def __init__(self):
+        self.record_queue_depth = 0  # 阅卷记录写入线程的积压任务数，与运行无关，reset 时不清零
+        self.reset()
+
+    def reset(self):
+        """开始新的一次运行"""
+        self.start_time = time.monotonic()
+        self.completed = 0
+        self.total = 0
+        self._progress_points = collections.deque()  # [(时间, 已完成数)]
+        self._progress_points.append((self.start_time, 0))
+
+    def update_progress(self, completed, total):
+        """progress_signal 的槽：只记录计数"""
+        now = time.monotonic()
+        self.completed = completed
+        self.total = total
+        self._progress_points.append((now, completed))
+        while len(self._progress_points) > 2 and now - self._progress_points[1][0] > RATE_WINDOW_SECONDS:
+            self._progress_points.popleft()
+
+    def update_record_queue_depth(self, depth):
+        """RecordWriterThread.queue_depth_signal 的槽"""
+        self.record_queue_depth = depth
+
+    def _items_per_second(self, now):
+        """最近窗口内的完成速度（题/秒）；窗口内数据不足时使用整体平均速度"""
+        first_time, first_completed = self._progress_points[0]
+        if self.completed > first_completed and now > first_time:
+            return (self.completed - first_completed) / (now - first_time)
+        elapsed = now - self.start_time
+        return self.completed / elapsed if elapsed > 0 and self.completed else 0.0
+
+    def snapshot(self, worker):
+        """
+        汇总当前运行状态。
+
+        Args:
+            worker: 正在运行的阅卷线程（AutoThread 或 BatchGradingThread）
+
+        Returns:
+            dict，字段见 format_live_stats
+        """
+        now = time.monotonic()
+        questions_per_paper = max(1, getattr(worker, 'total_question_count_in_run', 0) or 1)
+        rate = self._items_per_second(now)
+        remaining = max(0, self.total - self.completed)
+
+        tracer = getattr(worker, 'tracer', None)
+        latencies = sorted(tracer.recent_durations("API请求", LATENCY_SAMPLE_SIZE)) if tracer else []
+        retries = tracer.count("重试等待") if tracer else 0
+
+        eta_seconds = remaining / rate if rate > 0 and remaining else None
+        tokens_used = getattr(worker, 'tokens_used', None)
+        projected_tokens = None
+        if tokens_used and self.completed and self.total:
+            projected_tokens = int(tokens_used / self.completed * self.total)
+
+        return {
+            'elapsed_seconds': now - self.start_time,
+            'completed': self.completed,
+            'total': self.total,
+            'papers_per_minute': rate * 60 / questions_per_paper,
+            'api_p50_ms': percentile(latencies, 0.50) * 1000 if latencies else None,
+            'api_p95_ms': percentile(latencies, 0.95) * 1000 if latencies else None,
+            'retries': retries,
+            'eta_seconds': eta_seconds,
+            'tokens_used': tokens_used,
+            'projected_tokens': projected_tokens,
+            'estimated_cost': getattr(worker, 'estimated_cost', None),
+            'record_queue_depth': self.record_queue_depth,
+        }
+
+
+def _format_duration(seconds):
+    seconds = int(seconds)
+    hours, remainder = divmod(seconds, 3600)
+    minutes, seconds = divmod(remainder, 60)
+    if hours:
+        return f"{hours}小时{minutes:02d}分"
+    return f"{minutes}分{seconds:02d}秒"
+
+
+def format_live_stats(stats):
+    """把 snapshot() 的结果格式化为面板上显示的一行文字"""
+    parts = [f"进度 {stats['completed']}/{stats['total'] or '?'}",
+             f"速度 {stats['papers_per_minute']:.1f} 份/分钟"]
+    if stats['api_p50_ms'] is not None:
+        parts.append(f"API延迟 p50 {stats['api_p50_ms'] / 1000:.1f}s / p95 {stats['api_p95_ms'] / 1000:.1f}s")
+    parts.append(f"重试 {stats['retries']} 次")
+    if stats['eta_seconds'] is not None:
+        finish_at = datetime.datetime.now() + datetime.timedelta(seconds=stats['eta_seconds'])
+        parts.append(f"剩余约 {_format_duration(stats['eta_seconds'])}（预计 {finish_at.strftime('%H:%M')} 完成）")
+    if stats['tokens_used']:
+        token_text = f"已用 {stats['tokens_used']:,} tokens"
+        if stats['projected_tokens']:
+            token_text += f"，预计共 {stats['projected_tokens']:,}"
+        parts.append(token_text)
+    if stats.get('estimated_cost') is not None:
+        parts.append(f"估算费用 {stats['estimated_cost']:.2f}")
+    if stats.get('record_queue_depth'):
+        parts.append(f"待写入记录 {stats['record_queue_depth']} 条")
+    parts.append(f"已用时 {_format_duration(stats['elapsed_seconds'])}")
+    return " | ".join(parts)
+
+# --- END OF FILE live_stats.py ---
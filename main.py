@@ -1,18 +1,31 @@
+import time
+_startup_begin = time.perf_counter()
+
 import sys
 import os
 import datetime
 import pathlib
+from startup_timer import StartupTimer
+startup_timer = StartupTimer(_startup_begin)
+startup_timer.mark("导入标准库")
 from PyQt5.QtWidgets import QApplication, QDialog, QVBoxLayout, QHBoxLayout, QLabel, QPushButton
 from PyQt5.QtCore import Qt, QTimer
 from PyQt5.QtGui import QFont
+startup_timer.mark("导入PyQt5")
 from ui_components.main_window import MainWindow
+startup_timer.mark("导入主窗口模块 (ui_components.main_window, api_service)")
 from api_service import ApiService
-from config_manager import ConfigManager
+from config_manager import ConfigManager, get_app_base_dir
 from auto_thread import AutoThread
+startup_timer.mark("导入阅卷线程模块 (auto_thread)")
+from grading_journal import get_excel_path, read_excel_rows, write_excel
+from record_writer import RecordWriterThread
+from results_store import RESULTS_DB_FILENAME
+startup_timer.mark("导入记录模块 (grading_journal, record_writer, sqlite3)")
 import winsound
 import csv
 import traceback
-import pandas as pd
+import itertools
 
 class SimpleNotificationDialog(QDialog):
     def __init__(self, title, message, sound_type='info', parent=None):
@@ -115,17 +128,32 @@ class SignalConnectionManager:
 class Application:
     def __init__(self):
         self.app = QApplication(sys.argv)
+        startup_timer.mark("创建QApplication")
         self.config_manager = ConfigManager()
         self.api_service = ApiService(self.config_manager)
         self.worker = AutoThread(self.api_service)
+        startup_timer.mark("读取配置、创建服务与线程")
         self.main_window = MainWindow(self.config_manager, self.api_service, self.worker)
+        startup_timer.mark("构建主窗口")
         self.signal_manager = SignalConnectionManager()
 
+        # 离线批量阅卷线程，与屏幕阅卷线程分开，阅卷记录通过 run_mode 区分；
+        # 首次使用时才创建（batch_grader 会导入 PIL），见 create_batch_worker
+        self.batch_worker = None
+        self.main_window.batch_worker_factory = self.create_batch_worker
+        self.batch_signal_manager = SignalConnectionManager()
+
         # 初始化缓存系统
         self.cache_dir = pathlib.Path(__file__).parent / "阅卷记录" / ".cache"
         self.cache_dir.mkdir(exist_ok=True, parents=True)
+        self.pending_exports = set() # 尚未成功导出到Excel的日志路径
+
+        # 阅卷记录的磁盘写入全部交给后台线程，GUI线程只负责入队
+        self.record_writer = RecordWriterThread(os.path.join(get_app_base_dir(), "阅卷记录", RESULTS_DB_FILENAME))
+        self.app.aboutToQuit.connect(self.record_writer.stop)
 
         self._setup_application()
+        startup_timer.mark("连接信号、加载配置到界面")
 
     def _setup_global_exception_hook(self):
         """设置全局异常钩子"""
@@ -175,6 +203,8 @@ class Application:
         try:
             self._setup_global_exception_hook()
             self.connect_worker_signals()
+            self.connect_record_writer_signals()
+            self.record_writer.start()
             self.load_config()
             self._create_record_directory()
         except Exception as e:
@@ -192,6 +222,11 @@ class Application:
                 base_dir = pathlib.Path(__file__).parent
             record_dir = base_dir / "阅卷记录"
             record_dir.mkdir(exist_ok=True)
+
+            # 上次运行中断（未生成汇总）或导出失败的日志，由写入线程扫描后提示用户导出
+            self.record_writer.request_scan(record_dir)
+            if any(self.cache_dir.glob('*.json')):
+                self.main_window.show_merge_button(True)
         except OSError as e:
             self.main_window.log_message(f"创建记录目录失败: {str(e)}", is_error=True)
 
@@ -208,10 +243,14 @@ class Application:
                 self.worker.log_signal,
                 self.main_window.log_message
             )
-            # self.signal_manager.connect(
-            #     self.worker.progress_signal,
-            #     self.main_window.update_progress
-            # )
+            self.signal_manager.connect(
+                self.worker.debug_log_signal,
+                self.main_window.log_debug
+            )
+            self.signal_manager.connect(
+                self.worker.progress_signal,
+                self.main_window.update_progress
+            )
             self.signal_manager.connect(
                 self.worker.record_signal,
                 self.save_grading_record
@@ -250,6 +289,44 @@ class Application:
             if hasattr(self.main_window, 'log_message'):
                  self.main_window.log_message(f"连接工作线程信号时出错: {str(e)}", is_error=True)
 
+    def create_batch_worker(self):
+        """首次离线批量阅卷时创建批量阅卷线程并连接信号"""
+        if self.batch_worker is None:
+            from batch_grader import BatchGradingThread
+            self.batch_worker = BatchGradingThread(self.api_service)
+            self.main_window.batch_worker = self.batch_worker
+            self.connect_batch_worker_signals()
+        return self.batch_worker
+
+    def connect_batch_worker_signals(self):
+        """连接离线批量阅卷线程信号"""
+        try:
+            self.batch_signal_manager.disconnect_all()
+            self.batch_signal_manager.connect(self.batch_worker.log_signal, self.main_window.log_message)
+            self.batch_signal_manager.connect(self.batch_worker.debug_log_signal, self.main_window.log_debug)
+            self.batch_signal_manager.connect(self.batch_worker.record_signal, self.save_grading_record)
+            self.batch_signal_manager.connect(self.batch_worker.progress_signal, self.main_window.update_progress)
+            self.batch_signal_manager.connect(self.batch_worker.finished_signal, self.show_completion_notification)
+            self.batch_signal_manager.connect(self.batch_worker.error_signal, self.show_error_notification)
+        except Exception as e:
+            print(f"[CRITICAL_ERROR] 连接离线批量阅卷线程信号时出错: {str(e)}")
+            if hasattr(self.main_window, 'log_message'):
+                self.main_window.log_message(f"连接离线批量阅卷线程信号时出错: {str(e)}", is_error=True)
+
+    def connect_record_writer_signals(self):
+        """连接阅卷记录写入线程信号"""
+        self.record_writer.log_signal.connect(self.main_window.log_message)
+        self.record_writer.export_succeeded_signal.connect(self.on_export_succeeded)
+        self.record_writer.export_failed_signal.connect(self.on_export_failed)
+        self.record_writer.stale_journals_signal.connect(self.on_stale_journals_found)
+        self.record_writer.queue_depth_signal.connect(self.main_window.update_record_queue_depth)
+
+    def _get_record_worker(self, record_data):
+        """返回产生该条记录的线程（屏幕阅卷或离线批量阅卷）"""
+        if record_data.get('run_mode') == 'batch':
+            return self.batch_worker
+        return self.worker
+
     def show_completion_notification(self):
         """显示任务完成通知"""
         # 先调用原有的完成处理
@@ -313,44 +390,8 @@ class Application:
 
         self.main_window.log_message("配置已成功加载并应用。")
 
-    def is_file_locked(self, filepath):
-        """检查文件是否被锁定（主要因被其他进程打开）"""
-        try:
-            with open(filepath, 'a'):
-                pass
-            return False
-        except PermissionError:
-            return True
-        except Exception:
-            return False
-
-    def cache_records(self, excel_filepath, rows, headers=None):
-        """缓存无法写入的记录"""
-        import json
-        excel_name = excel_filepath.name
-        cache_file = self.cache_dir / f"{excel_name}.json"
-
-        if cache_file.exists():
-            with open(cache_file, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-            data['records'].extend(rows)
-        else:
-            data = {
-                'excel_path': str(excel_filepath),
-                'headers': headers,
-                'records': rows
-            }
-
-        with open(cache_file, 'w', encoding='utf-8') as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
-
-        count = len(data['records'])
-        excel_display_name = excel_name.replace('.xlsx', '')
-        self.main_window.update_cache_status(f"有{count}条新阅卷记录等待添加进[{excel_display_name}]，请选择 添加最新阅卷记录")
-        self.main_window.show_merge_button(True)
-
     def check_and_merge_cache(self, excel_name):
-        """检查并合并指定Excel的缓存记录"""
+        """检查并合并指定Excel的缓存记录（旧版本在文件被占用时写入 .cache 的记录）"""
         import json
         cache_file = self.cache_dir / f"{excel_name}.json"
         if not cache_file.exists():
@@ -364,57 +405,11 @@ class Application:
         records = cache_data['records']
 
         try:
-            # 读取现有Excel文件或创建新的
-            if excel_filepath.exists():
-                try:
-                    existing_df = pd.read_excel(excel_filepath, header=0)
-                    new_df = pd.DataFrame(records, columns=headers)
-                    combined_df = pd.concat([existing_df, new_df], ignore_index=True)
-                except Exception as e:
-                    self.main_window.log_message(f"读取现有Excel文件失败: {str(e)}，将覆盖文件", True)
-                    combined_df = pd.DataFrame(records, columns=headers)
-            else:
-                combined_df = pd.DataFrame(records, columns=headers)
-
-            # 写入Excel文件并设置格式
-            with pd.ExcelWriter(excel_filepath, engine='openpyxl') as writer:
-                combined_df.to_excel(writer, index=False, sheet_name='阅卷记录')
-
-                # 获取工作簿和工作表
-                workbook = writer.book
-                worksheet = writer.sheets['阅卷记录']
-
-                # 设置列宽
-                column_widths = {
-                    'A': 15,  # 时间
-                    'B': 10,  # 题目编号
-                    'C': 10,  # API标识
-                    'D': 10,  # 分差阈值
-                    'E': 80,  # 学生答案摘要（增加宽度以容纳较长的AI回答）
-                    'F': 100, # 评分依据（增加宽度以容纳详细的评分理由）
-                    'G': 20,  # AI分项得分
-                    'H': 15,  # AI原始总分/最终得分
-                    'I': 12,  # 双评分差
-                    'J': 12   # 最终得分
-                }
-
-                for col, width in column_widths.items():
-                    if col in worksheet.column_dimensions:
-                        worksheet.column_dimensions[col].width = width
-
-                # 设置自动换行
-                from openpyxl.styles import Alignment
-                wrap_alignment = Alignment(wrap_text=True, vertical='top')
-
-                for row in worksheet.iter_rows():
-                    for cell in row:
-                        cell.alignment = wrap_alignment
-
-                # 设置标题行格式
-                from openpyxl.styles import Font
-                header_font = Font(bold=True)
-                for cell in worksheet[1]:
-                    cell.font = header_font
+            # 读取现有Excel的全部行，追加缓存的记录后流式写回
+            existing_rows = read_excel_rows(excel_filepath) if excel_filepath.exists() else []
+            if existing_rows:
+                headers = existing_rows[0]
+            write_excel(excel_filepath, headers, itertools.chain(existing_rows[1:], records))
 
             self.main_window.log_message(f"成功合并 {len(records)} 条记录到 {excel_name}")
             cache_file.unlink()
@@ -426,7 +421,9 @@ class Application:
             self.main_window.update_cache_status(f"有{len(records)}条记录等待添加进[{excel_display_name}]，请选择 添加最新阅卷记录")
 
     def manual_merge_records(self):
-        """手动触发合并所有缓存记录"""
+        """手动触发：导出所有待导出的日志，并合并旧版本遗留的缓存记录"""
+        for journal_path in sorted(self.pending_exports):
+            self.record_writer.request_export(get_excel_path(journal_path))
         for cache_file in self.cache_dir.glob('*.json'):
             excel_name = cache_file.stem
             self.check_and_merge_cache(excel_name)
@@ -463,17 +460,14 @@ class Application:
         else:
             base_dir = pathlib.Path(__file__).parent
 
-        record_dir = base_dir / "阅卷记录"
-        record_dir.mkdir(exist_ok=True)
-
-        date_dir = record_dir / date_str
-        date_dir.mkdir(exist_ok=True)
+        # 目录由写入线程在首次追加日志时创建
+        date_dir = base_dir / "阅卷记录" / date_str
 
         if worker:
             dual_evaluation = worker.parameters.get('dual_evaluation', False)
-            question_configs = worker.parameters.get('question_configs', {})
+            question_configs = worker.parameters.get('question_configs', [])
             question_count = len(question_configs)
-            full_score = question_configs.get('1', {}).get('max_score', 100)
+            full_score = question_configs[0].get('max_score', 100) if question_configs else 100
         else:
             dual_evaluation = record_data.get('is_dual_evaluation_run', False)
             question_count = record_data.get('total_questions_in_run', 1)
@@ -494,227 +488,79 @@ class Application:
         return excel_filepath
 
     def _save_summary_record(self, record_data):
-        """保存汇总记录到对应的Excel文件
+        """将汇总记录写入日志，并从日志一次性导出本次阅卷的Excel
 
         Args:
             record_data: 汇总记录数据
         """
         try:
-            excel_filepath = self._get_excel_filepath(record_data, self.worker)
-            excel_filename = excel_filepath.name
-
-            # 从 record_data 构建汇总行
-            status_map = {
-                "completed": "正常完成",
-                "error": "因错误中断",
-                "threshold_exceeded": "因双评分差过大中断"
-            }
-            status_text = status_map.get(record_data.get('completion_status', 'unknown'), "未知状态")
-
-            interrupt_reason = record_data.get('interrupt_reason')
-            if interrupt_reason:
-                status_text += f" ({interrupt_reason})"
-
-            # 格式化汇总时间戳
-            timestamp_raw = record_data.get('timestamp', '未提供_未提供')
-            if '_' in timestamp_raw:
-                time_part = timestamp_raw.split('_')[1]
-                if len(time_part) == 6:
-                    formatted_summary_time = f"{time_part[:2]}点{time_part[2:4]}分{time_part[4:6]}秒"
-                else:
-                    formatted_summary_time = time_part
-            else:
-                formatted_summary_time = timestamp_raw
-
-            summary_data = [
-                f"--- 批次阅卷汇总 ({formatted_summary_time}) ---",
-                f"状态: {status_text}",
-                f"计划/完成: {record_data.get('total_questions_attempted', '未提供')} / {record_data.get('questions_completed', '未提供')} 个",
-                f"总用时: {record_data.get('total_elapsed_time_seconds', 0):.2f} 秒",
-                f"模式: {'双评' if record_data.get('dual_evaluation_enabled') else '单评'}",
-            ]
-
-            if record_data.get('dual_evaluation_enabled'):
-                summary_data.append(f"模型: {record_data.get('first_model_id', '未指定')} vs {record_data.get('second_model_id', '未指定')}")
-            else:
-                summary_data.append(f"模型: {record_data.get('first_model_id', '未指定')}")
-
-            # 读取现有Excel文件或创建新的
-            if excel_filepath.exists():
-                try:
-                    existing_df = pd.read_excel(excel_filepath, header=0)
-                    # 添加空白行
-                    blank_rows = pd.DataFrame([[""] * len(existing_df.columns)] * 2)
-                    summary_df = pd.DataFrame([summary_data + [""] * (len(existing_df.columns) - len(summary_data))], columns=existing_df.columns)
-                    more_blank_rows = pd.DataFrame([[""] * len(existing_df.columns)] * 4)
-                    combined_df = pd.concat([existing_df, blank_rows, summary_df, more_blank_rows], ignore_index=True)
-                except Exception as e:
-                    self.main_window.log_message(f"读取现有Excel文件失败: {str(e)}，将创建新文件", True)
-                    combined_df = pd.DataFrame([summary_data], columns=["汇总信息"])
-            else:
-                combined_df = pd.DataFrame([summary_data], columns=["汇总信息"])
-
-            # 写入Excel文件
-            with pd.ExcelWriter(excel_filepath, engine='openpyxl') as writer:
-                combined_df.to_excel(writer, index=False, sheet_name='阅卷记录')
-
-                # 获取工作簿和工作表
-                workbook = writer.book
-                worksheet = writer.sheets['阅卷记录']
-
-                # 设置列宽
-                column_widths = {
-                    'A': 80,  # 汇总信息列
-                }
-
-                for col, width in column_widths.items():
-                    if col in worksheet.column_dimensions:
-                        worksheet.column_dimensions[col].width = width
-
-                # 设置自动换行
-                from openpyxl.styles import Alignment
-                wrap_alignment = Alignment(wrap_text=True, vertical='top')
-
-                for row in worksheet.iter_rows():
-                    for cell in row:
-                        cell.alignment = wrap_alignment
-
-            self.main_window.log_message(f"已保存汇总记录到: {excel_filename}")
-            return excel_filepath
-
+            excel_filepath = self._get_excel_filepath(record_data, self._get_record_worker(record_data))
+            self.record_writer.submit_record(excel_filepath, record_data)
         except Exception as e:
             self.main_window.log_message(f"保存汇总记录失败: {str(e)}", is_error=True)
             return None
 
+        # 阅卷结束，从日志生成Excel（写入线程会先写完之前入队的记录）
+        self.record_writer.request_export(excel_filepath)
+        return excel_filepath
+
     def save_grading_record(self, record_data):
         """
-        重构后的保存阅卷记录到Excel文件的方法。
-        - 动态构建Excel表头和行数据，支持单评和双评模式。
-        - 设置列宽和格式，便于在Excel中查看。
+        保存一条阅卷记录：交给写入线程追加到与Excel同名的 .jsonl 日志（fsync落盘）。
+        Excel 在本次阅卷结束（收到汇总记录）或手动“添加最新阅卷记录”时从日志一次性生成，
+        GUI线程不做任何磁盘操作。
         """
         try:
             # 记录汇总信息
             if record_data.get('record_type') == 'summary':
                 return self._save_summary_record(record_data)
 
-            # --- 1. 准备文件路径 ---
-            excel_filepath = self._get_excel_filepath(record_data, self.worker)
-            excel_filename = excel_filepath.name
-            file_exists = excel_filepath.exists()
-
-            # --- 2. 动态构建表头和行 ---
-            is_dual = record_data.get('is_dual_evaluation', False)
-            timestamp_raw = record_data.get('timestamp', '')
-            if '_' in timestamp_raw:
-                time_part = timestamp_raw.split('_')[1]
-                if len(time_part) == 6:
-                    timestamp_str = f"{time_part[:2]}点{time_part[2:4]}分{time_part[4:6]}秒"
-                else:
-                    timestamp_str = time_part
-            else:
-                timestamp_str = timestamp_raw
-            question_index_str = f"题目{record_data.get('question_index', 0)}"
-            final_total_score_str = str(record_data.get('total_score', 0))
-
-            headers = ["时间", "题目编号"]
-            rows_to_write = []
-
-            if is_dual:
-                headers.extend(["API标识", "分差阈值", "学生答案摘要", "评分依据", "AI分项得分", "AI原始总分", "双评分差", "最终得分"])
-
-                row1 = [timestamp_str, question_index_str, "API-1",
-                       str(record_data.get('score_diff_threshold', "未提供")),
-                       record_data.get('api1_student_answer_summary', '未提供'),
-                       record_data.get('api1_scoring_basis', '未提供'),
-                       str(record_data.get('api1_itemized_scores', [])),
-                       str(record_data.get('api1_raw_score', 0.0)),
-                       f"{record_data.get('score_difference', 0.0):.2f}",
-                       final_total_score_str]
-                row2 = [timestamp_str, question_index_str, "API-2",
-                       str(record_data.get('score_diff_threshold', "未提供")),
-                       record_data.get('api2_student_answer_summary', '未提供'),
-                       record_data.get('api2_scoring_basis', '未提供'),
-                       str(record_data.get('api2_itemized_scores', [])),
-                       str(record_data.get('api2_raw_score', 0.0)),
-                       f"{record_data.get('score_difference', 0.0):.2f}",
-                       final_total_score_str]
-                rows_to_write.extend([row1, row2])
-            else: # 单评模式
-                headers.extend(["学生答案摘要", "评分依据", "AI分项得分", "最终得分"])
-
-                single_row = [timestamp_str, question_index_str,
-                             record_data.get('student_answer', '无法提取'),
-                             record_data.get('reasoning_basis', '无法提取'),
-                             record_data.get('sub_scores', '未提供'),
-                             final_total_score_str]
-                rows_to_write.append(single_row)
-
-            # --- 3. 写入Excel文件 ---
-            if file_exists:
-                # 如果文件存在，读取现有数据并追加
-                try:
-                    existing_df = pd.read_excel(excel_filepath, header=0)
-                    new_df = pd.DataFrame(rows_to_write, columns=headers)
-                    combined_df = pd.concat([existing_df, new_df], ignore_index=True)
-                except Exception as e:
-                    self.main_window.log_message(f"读取现有Excel文件失败: {str(e)}，将覆盖文件", True)
-                    combined_df = pd.DataFrame(rows_to_write, columns=headers)
-            else:
-                combined_df = pd.DataFrame(rows_to_write, columns=headers)
-
-            # 使用openpyxl引擎写入并设置格式
-            with pd.ExcelWriter(excel_filepath, engine='openpyxl') as writer:
-                combined_df.to_excel(writer, index=False, sheet_name='阅卷记录')
-
-                # 获取工作簿和工作表
-                workbook = writer.book
-                worksheet = writer.sheets['阅卷记录']
-
-                # 设置列宽
-                column_widths = {
-                    'A': 15,  # 时间
-                    'B': 10,  # 题目编号
-                    'C': 10,  # API标识
-                    'D': 10,  # 分差阈值
-                    'E': 80,  # 学生答案摘要（增加宽度以容纳较长的AI回答）
-                    'F': 100, # 评分依据（增加宽度以容纳详细的评分理由）
-                    'G': 20,  # AI分项得分
-                    'H': 15,  # AI原始总分/最终得分
-                    'I': 12,  # 双评分差
-                    'J': 12   # 最终得分
-                }
-
-                for col, width in column_widths.items():
-                    if col in worksheet.column_dimensions:
-                        worksheet.column_dimensions[col].width = width
-
-                # 设置自动换行
-                from openpyxl.styles import Alignment
-                wrap_alignment = Alignment(wrap_text=True, vertical='top')
-
-                for row in worksheet.iter_rows():
-                    for cell in row:
-                        cell.alignment = wrap_alignment
-
-                # 设置标题行格式
-                from openpyxl.styles import Font
-                header_font = Font(bold=True)
-                for cell in worksheet[1]:
-                    cell.font = header_font
-
-            self.main_window.log_message(f"已保存阅卷记录到: {excel_filename}")
+            excel_filepath = self._get_excel_filepath(record_data, self._get_record_worker(record_data))
+            self.record_writer.submit_record(excel_filepath, record_data)
+            self.main_window.log_message(f"已记录第{record_data.get('question_index', 0)}题阅卷结果（{excel_filepath.stem}）")
             return excel_filepath
 
         except Exception as e:
             error_detail_full = traceback.format_exc()
-            # 尝试缓存失败的记录
-            if self.is_file_locked(excel_filepath):
-                self.main_window.log_message("文件被占用，缓存记录以便稍后合并", True)
-                self.cache_records(excel_filepath, rows_to_write, headers)
-            else:
-                self.main_window.log_message(f"保存阅卷记录失败: {str(e)}\n详细错误:\n{error_detail_full}", is_error=True)
+            self.main_window.log_message(f"保存阅卷记录失败: {str(e)}\n详细错误:\n{error_detail_full}", is_error=True)
             return None
 
+    def on_export_succeeded(self, journal_path, record_count):
+        """写入线程导出Excel成功"""
+        self.pending_exports.discard(journal_path)
+        self._update_pending_export_status()
+        self.main_window.log_message(f"已导出 {record_count} 条阅卷记录到: {pathlib.Path(get_excel_path(journal_path)).name}")
+
+    def on_export_failed(self, journal_path, locked):
+        """写入线程导出Excel失败：日志保留，等待手动导出"""
+        if locked:
+            self.main_window.log_message(f"{pathlib.Path(get_excel_path(journal_path)).name} 被占用，阅卷记录已保存在日志中，关闭文件后请选择 添加最新阅卷记录", True)
+        self.pending_exports.add(journal_path)
+        self._update_pending_export_status()
+
+    def on_stale_journals_found(self, journal_paths):
+        """启动时发现上次未导出的日志"""
+        if not journal_paths:
+            return
+        self.pending_exports.update(journal_paths)
+        self._update_pending_export_status()
+
+    def _update_pending_export_status(self):
+        """更新主窗口上等待导出的提示和按钮"""
+        if self.pending_exports:
+            names = "、".join(pathlib.Path(p).stem for p in sorted(self.pending_exports))
+            self.main_window.update_cache_status(f"有阅卷记录等待添加进[{names}]，请选择 添加最新阅卷记录")
+            self.main_window.show_merge_button(True)
+        else:
+            self.main_window.update_cache_status("")
+            self.main_window.show_merge_button(False)
+
+    def _report_startup_time(self):
+        """记录并输出启动各阶段耗时"""
+        startup_timer.mark("首次绘制窗口")
+        for line in startup_timer.report().splitlines():
+            self.main_window.log_message(line)
+
     def start_auto_evaluation(self):
         """开始自动阅卷"""
         try:
@@ -730,6 +576,8 @@ class Application:
         """运行应用程序"""
         # 显示主窗口
         self.main_window.show()
+        # 事件循环处理完第一批事件（窗口已绘制）后报告启动耗时
+        QTimer.singleShot(0, self._report_startup_time)
 
         # 运行应用程序事件循环
         result = self.app.exec_()
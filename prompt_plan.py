@@ -0,0 +1,45 @@
+# --- START OF FILE prompt_plan.py ---
+#
+# ==============================================================================
+#  预编译的评分Prompt (Prompt Plan)
+#
+#  原来每份答卷的每道题都要重新拼装一遍嵌套的Prompt字典、从配置中读取科目，
+#  再以 indent=2 序列化成几千字的JSON文本；而同一次运行中科目、题型和评分细则都不变。
+#  现在运行开始时为每道题编译一次 PromptPlan，整次运行的所有答卷复用:
+#  - Prompt文本按 (科目, 题型, 评分细则) 缓存，配置修改后自然生成新的Prompt
+#  - 序列化时去掉缩进和多余空格，减少每次请求的输入token
+#  - 日志中给出每道题Prompt的估算token数，便于比较不同评分细则的成本
+# ==============================================================================
+
+import math
+from typing import NamedTuple
+
+
+class PromptPlan(NamedTuple):
+    """一道题在本次运行中使用的Prompt（运行期间不变）"""
+    question_index: int
+    question_type: str
+    subject: str
+    prompt: str
+    estimated_tokens: int
+
+
+def _is_cjk(char):
+    code = ord(char)
+    return (0x4E00 <= code <= 0x9FFF or 0x3400 <= code <= 0x4DBF or 0x3000 <= code <= 0x303F
+            or 0xFF00 <= code <= 0xFFEF)
+
+
+def estimate_tokens(text):
+    """
+    估算文本的token数（不依赖具体模型的分词器）。
+
+    中文字符和全角标点按每字约1个token计，其余字符按每4个字符约1个token计。
+    各供应商的实际计数以API返回的 usage 为准，这里只用于比较和预估。
+    """
+    if not text:
+        return 0
+    cjk_count = sum(1 for char in text if _is_cjk(char))
+    return cjk_count + math.ceil((len(text) - cjk_count) / 4)
+
+# --- END OF FILE prompt_plan.py ---
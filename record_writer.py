@@ -0,0 +1,211 @@
+# --- START OF FILE record_writer.py ---
+#
+# ==============================================================================
+#  阅卷记录后台写入线程 (Background Record Writer)
+#
+#  record_signal 连接在 GUI 线程的槽上，日志追加、Excel导出、文件占用检测都会
+#  卡住界面，Esc 停止也会被延迟。这里用一个专用线程负责所有记录相关的磁盘操作:
+#  - GUI 线程只把任务放进有界队列，立即返回；队列满时（磁盘长时间卡住）记录直接追加到日志，
+#    不阻塞界面，也不让内存无限增长
+#  - 写入线程按数量或时间攒批，同一日志的多条记录一次写入、一次 fsync
+#  - 同一批记录同时写入 SQLite 结果数据库（一个事务），见 results_store.py
+#  - Excel导出和文件被占用时的回退（保留日志、等待手动导出）也在该线程完成
+#  - 通过信号报告日志、导出结果和队列深度（队列深度显示在实时进度面板上）
+# ==============================================================================
+
+import os
+import queue
+import time
+import traceback
+
+from PyQt5.QtCore import QThread, pyqtSignal
+
+from grading_journal import (GradingJournal, export_journal_to_excel, find_stale_journals,
+                             get_journal_path, is_file_locked)
+from results_store import ResultsStore
+
+# 队列容量：远大于正常阅卷的记录速度，只在磁盘长时间卡住时才会满
+RECORD_QUEUE_MAXSIZE = 1000
+# 攒批：最多攒这么多条，或等待这么久（秒）后写入
+BATCH_MAX_RECORDS = 50
+BATCH_MAX_WAIT = 0.5
+# 队列积压超过该值时提示
+QUEUE_DEPTH_WARNING = 100
+
+_TASK_RECORD = "record"
+_TASK_EXPORT = "export"
+_TASK_SCAN = "scan"
+_TASK_STOP = "stop"
+
+
+class RecordWriterThread(QThread):
+    """后台记录写入线程：追加日志、导出Excel、扫描未导出的日志"""
+
+    log_signal = pyqtSignal(str, bool)
+    export_succeeded_signal = pyqtSignal(str, int)  # (日志路径, 导出的记录条数)
+    export_failed_signal = pyqtSignal(str, bool)    # (日志路径, 是否因文件被占用)
+    stale_journals_signal = pyqtSignal(list)        # 启动扫描发现的未导出日志
+    queue_depth_signal = pyqtSignal(int)
+
+    def __init__(self, results_db_path=None, parent=None):
+        """
+        Args:
+            results_db_path: 可选，SQLite 结果数据库路径；为空时只写日志
+        """
+        super().__init__(parent)
+        self._queue = queue.Queue(maxsize=RECORD_QUEUE_MAXSIZE)
+        self._spill_warned = False
+        self._depth_warned = False
+        self.results_db_path = results_db_path
+        self._results_store = None  # 在写入线程中创建，sqlite连接只能在创建它的线程使用
+
+    # --------------------------------------------------------------------------
+    #  GUI 线程调用的接口：只入队，不做磁盘操作
+    # --------------------------------------------------------------------------
+
+    def submit_record(self, excel_filepath, record_data):
+        """提交一条阅卷记录（追加到 excel_filepath 对应的日志）"""
+        try:
+            self._queue.put_nowait((_TASK_RECORD, str(excel_filepath), record_data))
+        except queue.Full:
+            self._spill_record(excel_filepath, record_data)
+
+    def _spill_record(self, excel_filepath, record_data):
+        """
+        队列已满时的回退：直接追加到日志（与写入线程共用日志锁，行不会交错），不等待队列。
+        这类记录排在队列中更早的记录之前，且不写入结果数据库；Excel 仍从日志完整导出。
+        """
+        if not self._spill_warned:
+            self._spill_warned = True
+            self.log_signal.emit(f"阅卷记录写入积压已达 {RECORD_QUEUE_MAXSIZE} 条，新记录直接写入日志（不进入结果数据库）", True)
+        try:
+            GradingJournal(get_journal_path(excel_filepath)).append(record_data)
+        except Exception as e:
+            self.log_signal.emit(f"写入阅卷记录日志失败 ({os.path.basename(get_journal_path(excel_filepath))}): {str(e)}", True)
+
+    def request_export(self, excel_filepath):
+        """请求从日志导出Excel（在此之前提交的记录会先写入）"""
+        try:
+            self._queue.put_nowait((_TASK_EXPORT, str(excel_filepath), None))
+        except queue.Full:
+            # 不等待队列：标记为待导出，写入完成后由“添加最新阅卷记录”导出
+            self.log_signal.emit("阅卷记录写入积压，暂不导出Excel，稍后请选择 添加最新阅卷记录", True)
+            self.export_failed_signal.emit(get_journal_path(excel_filepath), False)
+
+    def request_scan(self, record_dir):
+        """请求扫描记录目录中尚未导出的日志"""
+        try:
+            self._queue.put_nowait((_TASK_SCAN, str(record_dir), None))
+        except queue.Full:
+            self.log_signal.emit("阅卷记录写入积压，跳过未导出日志的扫描", True)
+
+    def queue_depth(self):
+        """当前等待写入的任务数"""
+        return self._queue.qsize()
+
+    def stop(self, timeout_ms=10000):
+        """写完队列中剩余的任务后停止线程（程序退出时调用）"""
+        if not self.isRunning():
+            return
+        self._queue.put((_TASK_STOP, None, None))
+        self.wait(timeout_ms)
+
+    # --------------------------------------------------------------------------
+    #  写入线程
+    # --------------------------------------------------------------------------
+
+    def run(self):
+        if self.results_db_path:
+            try:
+                os.makedirs(os.path.dirname(os.path.abspath(self.results_db_path)), exist_ok=True)
+                self._results_store = ResultsStore(self.results_db_path)
+            except Exception as e:
+                self.log_signal.emit(f"打开阅卷结果数据库失败，本次只写入记录日志: {str(e)}", True)
+
+        running = True
+        while running:
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + BATCH_MAX_WAIT
+            # 只有记录任务需要攒批；导出/扫描/停止立即处理
+            while batch[-1][0] == _TASK_RECORD and len(batch) < BATCH_MAX_RECORDS:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+
+            try:
+                running = self._process_batch(batch)
+            except Exception as e:
+                self.log_signal.emit(f"阅卷记录写入线程出错: {str(e)}\n{traceback.format_exc()}", True)
+            self._report_queue_depth()
+
+        if self._results_store is not None:
+            self._results_store.close()
+            self._results_store = None
+
+    def _process_batch(self, batch):
+        """按顺序处理一批任务；返回 False 表示收到停止任务"""
+        pending_records = []  # [(Excel路径, 记录), ...]
+        for task_type, path, payload in batch:
+            if task_type == _TASK_RECORD:
+                pending_records.append((path, payload))
+                continue
+
+            # 非记录任务之前的记录必须先落盘（例如导出要包含本次的汇总记录）
+            self._flush_records(pending_records)
+            pending_records = []
+            if task_type == _TASK_EXPORT:
+                self._export(path)
+            elif task_type == _TASK_SCAN:
+                self.stale_journals_signal.emit(find_stale_journals(path))
+            elif task_type == _TASK_STOP:
+                return False
+
+        self._flush_records(pending_records)
+        return True
+
+    def _flush_records(self, pending_records):
+        if not pending_records:
+            return
+        records_by_journal = {}  # {日志路径: [记录, ...]}，保持首次出现的顺序
+        for excel_path, record_data in pending_records:
+            records_by_journal.setdefault(get_journal_path(excel_path), []).append(record_data)
+        for journal_path, records in records_by_journal.items():
+            try:
+                GradingJournal(journal_path).append_many(records)
+            except Exception as e:
+                self.log_signal.emit(f"写入阅卷记录日志失败 ({os.path.basename(journal_path)}): {str(e)}", True)
+
+        if self._results_store is not None:
+            try:
+                self._results_store.add_records(pending_records)
+            except Exception as e:
+                # 数据库只是便于查询的副本，写入失败不影响日志和Excel
+                self.log_signal.emit(f"写入阅卷结果数据库失败: {str(e)}", True)
+
+    def _export(self, excel_filepath):
+        journal_path = get_journal_path(excel_filepath)
+        try:
+            record_count = export_journal_to_excel(journal_path, excel_filepath)
+        except Exception as e:
+            locked = is_file_locked(excel_filepath)
+            if not locked:
+                self.log_signal.emit(f"导出Excel失败: {str(e)}，阅卷记录已保存在日志中", True)
+            self.export_failed_signal.emit(journal_path, locked)
+            return
+        self.export_succeeded_signal.emit(journal_path, record_count)
+
+    def _report_queue_depth(self):
+        depth = self._queue.qsize()
+        self.queue_depth_signal.emit(depth)
+        if depth >= QUEUE_DEPTH_WARNING and not self._depth_warned:
+            self._depth_warned = True
+            self.log_signal.emit(f"阅卷记录写入积压 {depth} 条，磁盘写入较慢", True)
+        elif depth < QUEUE_DEPTH_WARNING // 2:
+            self._depth_warned = False
+            self._spill_warned = False
+
+# --- END OF FILE record_writer.py ---
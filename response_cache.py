@@ -0,0 +1,160 @@
+# --- START OF FILE response_cache.py ---
+#
+# ==============================================================================
+#  AI评分响应缓存 (Content-Addressed Response Cache)
+#
+#  空白作答区域、照抄标准答案的作答往往截出字节完全相同的图片，但每一张仍会
+#  触发一次完整的视觉模型调用。本模块以 (图片, 提示词, 供应商, 模型) 的哈希
+#  作为键，将成功解析的AI原始响应持久化到磁盘，命中时直接复用。
+#
+#  - 每条缓存一个JSON文件，按键的前两位分目录存放
+#  - 以文件修改时间作为最近使用时间，命中时刷新，超出容量时按LRU淘汰
+#  - 线程安全，可在多题并发/双评并行时共用同一实例
+# ==============================================================================
+
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional
+
+# 默认缓存条目数上限，防止大量小文件拖慢目录扫描
+DEFAULT_MAX_ENTRIES = 20000
+
+
+class ResponseCache:
+    """基于内容哈希的磁盘响应缓存，按总大小和条目数做LRU淘汰"""
+
+    def __init__(self, cache_dir: str, max_bytes: int, max_entries: int = DEFAULT_MAX_ENTRIES):
+        """
+        Args:
+            cache_dir: 缓存目录
+            max_bytes: 缓存总大小上限（字节）
+            max_entries: 缓存条目数上限
+        """
+        self.cache_dir = cache_dir
+        self.max_bytes = max(1, int(max_bytes))
+        self.max_entries = max(1, int(max_entries))
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()  # {key: 文件大小}，按最近使用时间从旧到新排列
+        self._total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+
+        os.makedirs(self.cache_dir, exist_ok=True)
+        self._load_index()
+
+    @staticmethod
+    def make_key(img_str: str, prompt: str, provider: str, model_id: str) -> str:
+        """
+        计算缓存键。
+
+        img_str 是JPEG字节的base64编码，与图片字节一一对应，直接参与哈希即可，无需解码。
+        各字段带长度前缀拼接，避免不同字段组合产生相同的输入串。
+        """
+        digest = hashlib.sha256()
+        for part in (provider or "", model_id or "", prompt or "", img_str or ""):
+            data = part.encode("utf-8")
+            digest.update(f"{len(data)}:".encode("ascii"))
+            digest.update(data)
+        return digest.hexdigest()
+
+    def _path_for(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key[:2], f"{key}.json")
+
+    def _load_index(self):
+        """扫描缓存目录，按修改时间重建LRU索引"""
+        found = []
+        for root, _dirs, files in os.walk(self.cache_dir):
+            for name in files:
+                if not name.endswith(".json"):
+                    continue
+                try:
+                    stat = os.stat(os.path.join(root, name))
+                except OSError:
+                    continue
+                found.append((stat.st_mtime, name[:-5], stat.st_size))
+
+        found.sort()
+        for _mtime, key, size in found:
+            self._entries[key] = size
+            self._total_bytes += size
+        self._evict_locked()
+
+    def get(self, key: str) -> Optional[str]:
+        """读取缓存的响应文本，未命中返回 None。命中/未命中都会计数"""
+        with self._lock:
+            if key not in self._entries:
+                self.misses += 1
+                return None
+            path = self._path_for(key)
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    response_text = json.load(f)["response"]
+                os.utime(path, None)  # 刷新最近使用时间，重启后LRU顺序仍然有效
+            except (OSError, ValueError, KeyError, TypeError):
+                # 缓存文件损坏或被外部删除，视为未命中
+                self._remove_locked(key)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return response_text
+
+    def put(self, key: str, response_text: str, provider: str = "", model_id: str = ""):
+        """写入一条缓存（原子替换），并在超出容量时淘汰最久未使用的条目"""
+        record = {
+            "created": time.strftime("%Y-%m-%d %H:%M:%S"),
+            "provider": provider,
+            "model_id": model_id,
+            "response": response_text,
+        }
+        data = json.dumps(record, ensure_ascii=False).encode("utf-8")
+        path = self._path_for(key)
+
+        with self._lock:
+            try:
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                tmp_path = f"{path}.{threading.get_ident()}.tmp"
+                with open(tmp_path, "wb") as f:
+                    f.write(data)
+                os.replace(tmp_path, path)
+            except OSError:
+                return
+
+            self._total_bytes -= self._entries.pop(key, 0)
+            self._entries[key] = len(data)
+            self._total_bytes += len(data)
+            self._evict_locked()
+
+    def invalidate(self, key: str):
+        """删除一条缓存（例如缓存的响应已无法按当前题目配置解析）"""
+        with self._lock:
+            self._remove_locked(key)
+
+    def _remove_locked(self, key: str):
+        self._total_bytes -= self._entries.pop(key, 0)
+        try:
+            os.remove(self._path_for(key))
+        except OSError:
+            pass
+
+    def _evict_locked(self):
+        while self._entries and (self._total_bytes > self.max_bytes or len(self._entries) > self.max_entries):
+            oldest_key = next(iter(self._entries))
+            self._remove_locked(oldest_key)
+
+    def reset_stats(self):
+        """清零命中/未命中计数（每次阅卷开始时调用）"""
+        with self._lock:
+            self.hits = 0
+            self.misses = 0
+
+    def get_stats(self):
+        """返回 (hits, misses, 条目数, 总字节数)"""
+        with self._lock:
+            return self.hits, self.misses, len(self._entries), self._total_bytes
+
+# --- END OF FILE response_cache.py ---
@@ -0,0 +1,277 @@
+# --- START OF FILE results_store.py ---
+#
+# ==============================================================================
+#  阅卷结果数据库 (SQLite Results Store)
+#
+#  阅卷记录按天、按题分散在 阅卷记录/<日期>/*.xlsx 中，跨天查找只能逐个打开工作簿。
+#  这里把所有记录同时写入一个 SQLite 数据库（阅卷记录/grading_results.db），
+#  Excel 仍作为导出格式保留:
+#  - runs             每次阅卷一行（来自 generate_summary_record）
+#  - gradings         每道题/每份答卷一行（来自 record_grading_result）
+#  - dual_evaluations 双评时两组API各一行（关联 gradings.id）
+#  日期、题号、得分、模型ID均建有索引，"本周第3题所有0分" 之类的查询为毫秒级。
+#
+#  写入由 RecordWriterThread 在后台线程批量完成；查询可在任意线程新建实例执行。
+# ==============================================================================
+
+import datetime
+import json
+import sqlite3
+import threading
+
+RESULTS_DB_FILENAME = "grading_results.db"
+RECORD_TIMESTAMP_FORMAT = '%Y年%m月%d日_%H点%M分%S秒'
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    run_id TEXT,
+    finished_at TEXT NOT NULL,
+    date TEXT NOT NULL,
+    run_mode TEXT,
+    completion_status TEXT,
+    interrupt_reason TEXT,
+    total_questions_attempted INTEGER,
+    questions_completed INTEGER,
+    elapsed_seconds REAL,
+    dual_evaluation INTEGER,
+    first_model_id TEXT,
+    second_model_id TEXT,
+    local_blank_count INTEGER,
+    cache_hits INTEGER,
+    cache_misses INTEGER,
+    excel_path TEXT,
+    record_json TEXT
+);
+CREATE TABLE IF NOT EXISTS gradings (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    run_id TEXT,
+    graded_at TEXT NOT NULL,
+    date TEXT NOT NULL,
+    question_index INTEGER,
+    total_score REAL,
+    is_dual INTEGER,
+    grading_source TEXT,
+    run_mode TEXT,
+    source_image TEXT,
+    model_id TEXT,
+    student_answer TEXT,
+    reasoning_basis TEXT,
+    sub_scores TEXT,
+    excel_path TEXT,
+    record_json TEXT
+);
+CREATE TABLE IF NOT EXISTS dual_evaluations (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    grading_id INTEGER NOT NULL REFERENCES gradings(id) ON DELETE CASCADE,
+    api_index INTEGER NOT NULL,
+    model_id TEXT,
+    raw_score REAL,
+    student_answer TEXT,
+    scoring_basis TEXT,
+    itemized_scores TEXT,
+    score_difference REAL,
+    score_diff_threshold REAL
+);
+CREATE INDEX IF NOT EXISTS idx_runs_date ON runs(date);
+CREATE INDEX IF NOT EXISTS idx_runs_run_id ON runs(run_id);
+CREATE INDEX IF NOT EXISTS idx_gradings_date ON gradings(date);
+CREATE INDEX IF NOT EXISTS idx_gradings_question_date ON gradings(question_index, date);
+CREATE INDEX IF NOT EXISTS idx_gradings_score ON gradings(total_score);
+CREATE INDEX IF NOT EXISTS idx_gradings_model ON gradings(model_id);
+CREATE INDEX IF NOT EXISTS idx_gradings_run_id ON gradings(run_id);
+CREATE INDEX IF NOT EXISTS idx_dual_grading ON dual_evaluations(grading_id);
+CREATE INDEX IF NOT EXISTS idx_dual_model ON dual_evaluations(model_id);
+"""
+
+
+def _parse_record_time(timestamp_str):
+    """阅卷记录时间戳 -> datetime，无法解析时使用当前时间"""
+    try:
+        return datetime.datetime.strptime(timestamp_str, RECORD_TIMESTAMP_FORMAT)
+    except (TypeError, ValueError):
+        return datetime.datetime.now()
+
+
+def _to_float(value):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _to_int(value):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _date_str(value):
+    """接受 'YYYY-MM-DD' 字符串或 date/datetime"""
+    if isinstance(value, (datetime.date, datetime.datetime)):
+        return value.strftime('%Y-%m-%d')
+    return str(value)
+
+
+class ResultsStore:
+    """阅卷结果 SQLite 数据库。一个实例只在创建它的线程中使用"""
+
+    _schema_lock = threading.Lock()
+
+    def __init__(self, db_path):
+        self.db_path = str(db_path)
+        self._conn = sqlite3.connect(self.db_path, timeout=10)
+        self._conn.row_factory = sqlite3.Row
+        # WAL 模式下查询不会阻塞后台写入
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("PRAGMA foreign_keys=ON")
+        with ResultsStore._schema_lock:
+            self._conn.executescript(_SCHEMA)
+
+    def close(self):
+        self._conn.close()
+
+    # --------------------------------------------------------------------------
+    #  写入
+    # --------------------------------------------------------------------------
+
+    def add_records(self, records):
+        """
+        在一个事务中写入一批记录。
+
+        Args:
+            records: [(excel_path, record_data), ...]；record_type 为 summary 的写入 runs，其余写入 gradings
+        """
+        with self._conn:
+            for excel_path, record_data in records:
+                if record_data.get('record_type') == 'summary':
+                    self._insert_run(excel_path, record_data)
+                else:
+                    self._insert_grading(excel_path, record_data)
+
+    def _insert_run(self, excel_path, record_data):
+        finished_at = _parse_record_time(record_data.get('timestamp'))
+        self._conn.execute(
+            "INSERT INTO runs (run_id, finished_at, date, run_mode, completion_status, interrupt_reason,"
+            " total_questions_attempted, questions_completed, elapsed_seconds, dual_evaluation,"
+            " first_model_id, second_model_id, local_blank_count, cache_hits, cache_misses, excel_path, record_json)"
+            " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (record_data.get('run_id'), finished_at.isoformat(sep=' '), finished_at.strftime('%Y-%m-%d'),
+             record_data.get('run_mode'), record_data.get('completion_status'), record_data.get('interrupt_reason'),
+             _to_int(record_data.get('total_questions_attempted')), _to_int(record_data.get('questions_completed')),
+             _to_float(record_data.get('total_elapsed_time_seconds')), int(bool(record_data.get('dual_evaluation_enabled'))),
+             record_data.get('first_model_id'), record_data.get('second_model_id'),
+             _to_int(record_data.get('local_blank_count')), _to_int(record_data.get('response_cache_hits')),
+             _to_int(record_data.get('response_cache_misses')), excel_path,
+             json.dumps(record_data, ensure_ascii=False, default=str)))
+
+    def _insert_grading(self, excel_path, record_data):
+        graded_at = _parse_record_time(record_data.get('timestamp'))
+        is_dual = bool(record_data.get('is_dual_evaluation'))
+        if is_dual:
+            student_answer = record_data.get('api1_student_answer_summary')
+            reasoning_basis = record_data.get('api1_scoring_basis')
+            sub_scores = str(record_data.get('api1_itemized_scores', []))
+        else:
+            student_answer = record_data.get('student_answer')
+            reasoning_basis = record_data.get('reasoning_basis')
+            sub_scores = record_data.get('sub_scores')
+
+        cursor = self._conn.execute(
+            "INSERT INTO gradings (run_id, graded_at, date, question_index, total_score, is_dual, grading_source,"
+            " run_mode, source_image, model_id, student_answer, reasoning_basis, sub_scores, excel_path, record_json)"
+            " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (record_data.get('run_id'), graded_at.isoformat(sep=' '), graded_at.strftime('%Y-%m-%d'),
+             _to_int(record_data.get('question_index')), _to_float(record_data.get('total_score')), int(is_dual),
+             record_data.get('grading_source'), record_data.get('run_mode'), record_data.get('source_image'),
+             record_data.get('first_model_id'), student_answer, reasoning_basis,
+             None if sub_scores is None else str(sub_scores), excel_path,
+             json.dumps(record_data, ensure_ascii=False, default=str)))
+
+        if is_dual:
+            grading_id = cursor.lastrowid
+            for api_index, prefix, model_key in ((1, 'api1', 'first_model_id'), (2, 'api2', 'second_model_id')):
+                self._conn.execute(
+                    "INSERT INTO dual_evaluations (grading_id, api_index, model_id, raw_score, student_answer,"
+                    " scoring_basis, itemized_scores, score_difference, score_diff_threshold)"
+                    " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    (grading_id, api_index, record_data.get(model_key), _to_float(record_data.get(f'{prefix}_raw_score')),
+                     record_data.get(f'{prefix}_student_answer_summary'), record_data.get(f'{prefix}_scoring_basis'),
+                     str(record_data.get(f'{prefix}_itemized_scores', [])),
+                     _to_float(record_data.get('score_difference')), _to_float(record_data.get('score_diff_threshold'))))
+
+    # --------------------------------------------------------------------------
+    #  查询
+    # --------------------------------------------------------------------------
+
+    def query_gradings(self, date_from=None, date_to=None, question_index=None, min_score=None, max_score=None,
+                       model_id=None, run_id=None, grading_source=None, limit=None):
+        """
+        按条件查询阅卷结果，按阅卷时间排序。
+
+        Args:
+            date_from / date_to: 日期范围（含两端），'YYYY-MM-DD' 或 date
+            question_index: 题号
+            min_score / max_score: 最终得分范围（含两端），查0分可传 max_score=0
+            model_id: 第一组API的模型ID
+            run_id: 某次阅卷的ID
+            grading_source: "api" 或 "local-blank"
+            limit: 最多返回条数
+
+        Returns:
+            [dict, ...]，不含 record_json 字段
+        """
+        conditions, params = [], []
+        for column, operator, value in (("date", ">=", date_from and _date_str(date_from)),
+                                        ("date", "<=", date_to and _date_str(date_to)),
+                                        ("question_index", "=", question_index),
+                                        ("total_score", ">=", min_score),
+                                        ("total_score", "<=", max_score),
+                                        ("model_id", "=", model_id),
+                                        ("run_id", "=", run_id),
+                                        ("grading_source", "=", grading_source)):
+            if value is not None:
+                conditions.append(f"{column} {operator} ?")
+                params.append(value)
+
+        sql = ("SELECT id, run_id, graded_at, date, question_index, total_score, is_dual, grading_source, run_mode,"
+               " source_image, model_id, student_answer, reasoning_basis, sub_scores, excel_path FROM gradings")
+        if conditions:
+            sql += " WHERE " + " AND ".join(conditions)
+        sql += " ORDER BY graded_at, id"
+        if limit:
+            sql += " LIMIT ?"
+            params.append(int(limit))
+        return [dict(row) for row in self._conn.execute(sql, params)]
+
+    def query_runs(self, date_from=None, date_to=None, limit=None):
+        """按日期范围查询阅卷批次，最近的在前"""
+        conditions, params = [], []
+        if date_from is not None:
+            conditions.append("date >= ?")
+            params.append(_date_str(date_from))
+        if date_to is not None:
+            conditions.append("date <= ?")
+            params.append(_date_str(date_to))
+        sql = "SELECT * FROM runs"
+        if conditions:
+            sql += " WHERE " + " AND ".join(conditions)
+        sql += " ORDER BY finished_at DESC, id DESC"
+        if limit:
+            sql += " LIMIT ?"
+            params.append(int(limit))
+        return [dict(row) for row in self._conn.execute(sql, params)]
+
+    def get_dual_evaluations(self, grading_id):
+        """某条双评记录中两组API各自的评分"""
+        rows = self._conn.execute("SELECT * FROM dual_evaluations WHERE grading_id = ? ORDER BY api_index", (grading_id,))
+        return [dict(row) for row in rows]
+
+    def get_record(self, grading_id):
+        """某条阅卷结果的原始记录字典（与 record_signal 发出的内容一致）"""
+        row = self._conn.execute("SELECT record_json FROM gradings WHERE id = ?", (grading_id,)).fetchone()
+        return json.loads(row["record_json"]) if row else None
+
+# --- END OF FILE results_store.py ---
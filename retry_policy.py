@@ -0,0 +1,151 @@
+# --- START OF FILE retry_policy.py ---
+#
+# ==============================================================================
+#  API 重试策略 (Adaptive Retry Policy)
+#
+#  原来评分调用失败后不论原因都固定等待1秒、最多重试3次：
+#  API Key 无效（401）重试也不会成功，限流（429）时1秒又太短，
+#  JSON解析失败时网络请求本身是正常的，却同样等待后重新上传整张图片。
+#  这里按失败原因分类，分别决定是否重试以及退避多久:
+#  - 认证失败、额度不足、请求参数错误、本地配置错误：不重试，立即失败
+#  - 限流：优先遵循服务器返回的 Retry-After，否则按较长的基准指数退避
+#  - 超时、网络错误、服务器 5xx：指数退避
+#  - 模型输出格式错误、响应内容为空：网络正常，不等待直接重试
+#  退避时间加入随机抖动，避免多个并发请求在同一时刻重试。
+#  各供应商可在 PROVIDER_CONFIGS[provider]["retry"] 中覆盖 RetryPolicy 的字段。
+# ==============================================================================
+
+import email.utils
+import random
+import time
+from typing import NamedTuple, Optional
+
+# 失败分类
+AUTH = "auth"                    # 401/403，API Key 无效或无权限
+QUOTA = "quota"                  # 402，或限流响应中提示余额/额度不足
+BAD_REQUEST = "bad_request"      # 400/404/422 等，请求参数或模型ID错误
+CONFIG = "config"                # 本地配置错误（Key为空、格式错误、未知供应商）
+RATE_LIMIT = "rate_limit"        # 429
+TIMEOUT = "timeout"              # 连接或读取超时
+NETWORK = "network"              # 其他网络错误
+SERVER = "server"                # 5xx，或网关返回了非JSON内容
+MALFORMED_OUTPUT = "malformed_output"  # 模型输出不是要求的JSON格式
+EMPTY_RESPONSE = "empty_response"      # 响应中没有内容
+UNKNOWN = "unknown"
+
+CATEGORY_LABELS = {
+    AUTH: "认证失败",
+    QUOTA: "额度不足",
+    BAD_REQUEST: "请求参数错误",
+    CONFIG: "配置错误",
+    RATE_LIMIT: "请求限流",
+    TIMEOUT: "请求超时",
+    NETWORK: "网络错误",
+    SERVER: "服务端错误",
+    MALFORMED_OUTPUT: "输出格式错误",
+    EMPTY_RESPONSE: "响应为空",
+    UNKNOWN: "未知错误",
+}
+
+NON_RETRYABLE_CATEGORIES = frozenset({AUTH, QUOTA, BAD_REQUEST, CONFIG})
+# 响应已经正常返回，只是内容不可用：不需要等待
+IMMEDIATE_RETRY_CATEGORIES = frozenset({MALFORMED_OUTPUT, EMPTY_RESPONSE})
+
+_QUOTA_KEYWORDS = ("quota", "insufficient", "balance", "arrears", "余额", "欠费", "额度")
+
+
+class ApiError(str):
+    """
+    API调用的错误信息。仍是普通字符串（界面与日志直接显示），另外附带失败分类、
+    HTTP状态码、服务器要求的等待时间和原始响应内容（截断），供重试策略使用。
+    """
+
+    def __new__(cls, message, category=UNKNOWN, status_code=None, retry_after=None, detail=""):
+        error = super().__new__(cls, message)
+        error.category = category
+        error.status_code = status_code
+        error.retry_after = retry_after
+        error.detail = detail or ""
+        return error
+
+
+def error_category(error) -> str:
+    """错误的分类；未经分类的普通字符串视为 UNKNOWN"""
+    return getattr(error, 'category', UNKNOWN)
+
+
+def classify_http_status(status_code: int, response_text: str = "") -> str:
+    """根据HTTP状态码（和响应内容）判断失败分类"""
+    if status_code in (401, 403):
+        return AUTH
+    if status_code == 402:
+        return QUOTA
+    if status_code == 429:
+        lowered = (response_text or "").lower()
+        return QUOTA if any(keyword in lowered for keyword in _QUOTA_KEYWORDS) else RATE_LIMIT
+    if status_code == 408:
+        return TIMEOUT
+    if status_code >= 500:
+        return SERVER
+    if 400 <= status_code < 500:
+        return BAD_REQUEST
+    return UNKNOWN
+
+
+def parse_retry_after(value) -> Optional[float]:
+    """解析 Retry-After 响应头（秒数或HTTP日期），返回需要等待的秒数；无法解析时返回 None"""
+    if value is None:
+        return None
+    value = str(value).strip()
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at is None:
+        return None
+    return max(0.0, retry_at.timestamp() - time.time())
+
+
+class RetryPolicy(NamedTuple):
+    """一个供应商的重试参数（PROVIDER_CONFIGS[provider]["retry"] 中可覆盖任意字段）"""
+    max_attempts: int = 3              # 总尝试次数（含第一次）
+    base_delay: float = 1.0            # 超时/网络/服务端错误的首次退避（秒），之后每次翻倍
+    max_delay: float = 30.0
+    rate_limit_base_delay: float = 5.0  # 限流且服务器未给出 Retry-After 时的首次退避
+    rate_limit_max_delay: float = 120.0  # 限流退避上限，也是 Retry-After 的上限
+
+    @classmethod
+    def from_provider_config(cls, retry_config) -> "RetryPolicy":
+        """从供应商配置的 "retry" 字典构建策略，未知字段忽略，缺失字段使用默认值"""
+        overrides = {key: value for key, value in (retry_config or {}).items() if key in cls._fields}
+        policy = cls(**overrides)
+        return policy._replace(max_attempts=max(1, int(policy.max_attempts)))
+
+    def is_retryable(self, category: str) -> bool:
+        return category not in NON_RETRYABLE_CATEGORIES
+
+    def compute_delay(self, category: str, retry_number: int, retry_after: Optional[float] = None) -> float:
+        """
+        第 retry_number 次重试（从1开始）前需要等待的秒数。
+
+        指数退避加一半随机抖动：delay = d/2 + random(0, d/2)，d = min(上限, 基准 * 2^(n-1))。
+        """
+        if category in IMMEDIATE_RETRY_CATEGORIES:
+            return 0.0
+        if category == RATE_LIMIT:
+            if retry_after is not None:
+                # 服务器明确给出等待时间：照做，只加少量抖动错开并发请求
+                return min(retry_after, self.rate_limit_max_delay) + random.uniform(0, 0.5)
+            base, cap = self.rate_limit_base_delay, self.rate_limit_max_delay
+        else:
+            base, cap = self.base_delay, self.max_delay
+        delay = min(cap, base * (2 ** (retry_number - 1)))
+        return delay / 2 + random.uniform(0, delay / 2)
+
+# --- END OF FILE retry_policy.py ---
@@ -0,0 +1,144 @@
+# --- START OF FILE run_tracer.py ---
+#
+# ==============================================================================
+#  阅卷阶段耗时统计 (Run Tracer)
+#
+#  汇总记录原先只有总用时，无法判断慢在截图、图片编码、构建Prompt、API请求、
+#  JSON解析、分数输入、记录保存还是固定等待。RunTracer 以很小的开销记录每个阶段
+#  的起止时间（span）:
+#  - 汇总记录中按阶段给出次数、p50/p95/最大耗时
+#  - 每次运行写出一个 Chrome trace-event 格式的 JSON 文件（放在阅卷记录旁边），
+#    可以用 chrome://tracing 或 https://ui.perfetto.dev 打开，按线程查看时间线
+#  多个线程（并发阅卷、双评并行）可以同时记录。
+# ==============================================================================
+
+import json
+import math
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+# 追踪文件中最多保存的事件数，超出后只统计耗时、不再保存事件，避免超长批次占用过多内存
+MAX_TRACE_EVENTS = 200000
+
+
+def percentile(sorted_values, fraction):
+    """最近秩法计算百分位数，sorted_values 需已升序排列"""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(fraction * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+class RunTracer:
+    """记录一次阅卷运行中各阶段的耗时"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        """开始新的一次运行时清空之前的记录"""
+        with self._lock:
+            self._origin = time.perf_counter()
+            self._events = []      # [(名称, 线程ID, 开始秒, 耗时秒, 附加参数)]
+            self._durations = {}   # {阶段名称: [耗时秒, ...]}，按首次出现顺序
+            self._thread_names = {}
+            self.dropped_events = 0
+
+    @contextmanager
+    def span(self, name, **args):
+        """记录 with 块的耗时，归入 name 阶段；args 写入追踪文件（如题号、尝试次数）"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(name, start, time.perf_counter() - start, **args)
+
+    def add(self, name, start, duration, **args):
+        """直接记录一个阶段（start 为 time.perf_counter() 的值）"""
+        thread = threading.current_thread()
+        with self._lock:
+            self._durations.setdefault(name, []).append(duration)
+            if len(self._events) >= MAX_TRACE_EVENTS:
+                self.dropped_events += 1
+                return
+            self._thread_names.setdefault(thread.ident, thread.name)
+            self._events.append((name, thread.ident, start - self._origin, duration, args))
+
+    def count(self, name):
+        """name 阶段目前已记录的次数"""
+        with self._lock:
+            return len(self._durations.get(name, ()))
+
+    def recent_durations(self, name, limit):
+        """name 阶段最近 limit 次的耗时（秒），用于界面上的滚动统计"""
+        with self._lock:
+            return list(self._durations.get(name, ())[-limit:])
+
+    def stage_stats(self):
+        """
+        各阶段耗时统计。
+
+        Returns:
+            {阶段名称: {'count', 'total_ms', 'p50_ms', 'p95_ms', 'max_ms'}}，按阶段首次出现的顺序
+        """
+        with self._lock:
+            durations = {name: sorted(values) for name, values in self._durations.items()}
+        stats = {}
+        for name, values in durations.items():
+            stats[name] = {
+                'count': len(values),
+                'total_ms': round(sum(values) * 1000, 1),
+                'p50_ms': round(percentile(values, 0.50) * 1000, 1),
+                'p95_ms': round(percentile(values, 0.95) * 1000, 1),
+                'max_ms': round(values[-1] * 1000, 1),
+            }
+        return stats
+
+    def write_chrome_trace(self, path, metadata=None):
+        """
+        写出 Chrome trace-event 格式的追踪文件（先写临时文件再替换）。
+
+        Args:
+            path: 输出路径（*.trace.json）
+            metadata: 可选，写入文件的附加信息（如 run_id、模型）
+        """
+        with self._lock:
+            events = list(self._events)
+            thread_names = dict(self._thread_names)
+            dropped = self.dropped_events
+
+        pid = os.getpid()
+        trace_events = [
+            {'name': 'thread_name', 'ph': 'M', 'pid': pid, 'tid': tid, 'args': {'name': thread_name}}
+            for tid, thread_name in thread_names.items()
+        ]
+        for name, tid, start, duration, args in events:
+            trace_events.append({
+                'name': name, 'cat': 'grading', 'ph': 'X', 'pid': pid, 'tid': tid,
+                'ts': round(start * 1e6, 1), 'dur': round(duration * 1e6, 1), 'args': args,
+            })
+
+        trace_metadata = dict(metadata or {})
+        if dropped:
+            trace_metadata['dropped_events'] = dropped
+
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        tmp_path = path + ".tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'traceEvents': trace_events, 'displayTimeUnit': 'ms', 'metadata': trace_metadata},
+                      f, ensure_ascii=False, separators=(',', ':'), default=str)
+        os.replace(tmp_path, path)
+
+
+def format_stage_stats(stage_stats):
+    """把阶段耗时统计格式化为每个阶段一行的文字（用于汇总记录和日志）"""
+    lines = []
+    for name, stats in stage_stats.items():
+        lines.append(f"{name}: {stats['count']} 次，p50 {stats['p50_ms']:.1f} ms / "
+                     f"p95 {stats['p95_ms']:.1f} ms / 最大 {stats['max_ms']:.1f} ms，合计 {stats['total_ms'] / 1000:.1f} 秒")
+    return lines
+
+# --- END OF FILE run_tracer.py ---
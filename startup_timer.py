@@ -0,0 +1,43 @@
+# --- START OF FILE startup_timer.py ---
+#
+# ==============================================================================
+#  启动耗时统计 (Startup Timing)
+#
+#  记录从 main.py 开始执行到主窗口显示的各阶段耗时（导入各模块、创建QApplication、
+#  加载配置、构建主窗口等），在窗口显示后写入日志，便于定位启动慢的原因。
+#  打包后的单文件exe在 main.py 执行前还有解压耗时，这部分无法在程序内统计。
+# ==============================================================================
+
+import time
+
+
+class StartupTimer:
+    """按顺序记录启动各阶段的耗时"""
+
+    def __init__(self, start_time=None):
+        """
+        Args:
+            start_time: 可选，计时起点（time.perf_counter() 的值），默认为创建时
+        """
+        self._start = time.perf_counter() if start_time is None else start_time
+        self._last = self._start
+        self.stages = []  # [(阶段名称, 耗时秒)]
+
+    def mark(self, stage_name):
+        """记录上一个标记到现在的耗时，归入 stage_name 阶段"""
+        now = time.perf_counter()
+        self.stages.append((stage_name, now - self._last))
+        self._last = now
+
+    def total(self):
+        """起点到最近一次标记的总耗时（秒）"""
+        return self._last - self._start
+
+    def report(self):
+        """生成启动耗时报告：总耗时 + 按耗时从高到低排列的各阶段"""
+        lines = [f"启动耗时 {self.total() * 1000:.0f} ms（不含exe解压）:"]
+        for stage_name, elapsed in sorted(self.stages, key=lambda item: item[1], reverse=True):
+            lines.append(f"  {elapsed * 1000:7.1f} ms  {stage_name}")
+        return "\n".join(lines)
+
+# --- END OF FILE startup_timer.py ---
@@ -0,0 +1,44 @@
+from PIL import Image, ImageDraw
+
+from image_processing import detect_blank_answer, find_content_bbox
+
+
+def _answer_area(fill=245):
+    return Image.new("L", (800, 400), fill)
+
+
+def test_empty_area_is_blank():
+    assert detect_blank_answer(_answer_area()).is_blank
+
+
+def test_dark_ink_is_not_blank():
+    image = _answer_area()
+    ImageDraw.Draw(image).line((100, 200, 300, 220), fill=30, width=3)
+    assert not detect_blank_answer(image).is_blank
+
+
+def test_light_pencil_stroke_is_not_blank():
+    # 比纸面只暗约20个灰度级的浅色铅笔字，低于 INK_DELTA，但不能判为空白而跳过AI评分
+    image = _answer_area()
+    ImageDraw.Draw(image).line((100, 200, 400, 230), fill=225, width=2)
+    result = detect_blank_answer(image)
+    assert not result.is_blank
+    assert result.ink_ratio > 0
+
+
+def test_light_pencil_stroke_is_not_blank_against_template():
+    template = _answer_area()
+    ImageDraw.Draw(template).line((0, 300, 800, 300), fill=120, width=1)  # 印刷的横线
+    image = template.copy()
+    ImageDraw.Draw(image).line((100, 200, 400, 230), fill=225, width=2)
+    assert detect_blank_answer(template, template).is_blank
+    assert not detect_blank_answer(image, template).is_blank
+
+
+def test_trim_keeps_light_strokes_away_from_dark_ink():
+    image = _answer_area()
+    draw = ImageDraw.Draw(image)
+    draw.rectangle((100, 80, 250, 160), fill=20)
+    draw.line((500, 300, 700, 320), fill=225, width=2)
+    left, top, right, bottom = find_content_bbox(image)
+    assert left <= 100 and top <= 80 and right >= 700 and bottom >= 320
@@ -0,0 +1,68 @@
+# --- START OF FILE compile_ui.py ---
+#
+# ==============================================================================
+#  界面文件预编译 (Precompiled UI)
+#
+#  主窗口原先每次启动都用 uic.loadUi 解析 setting/多题.ui（800多行XML），再通过
+#  findChild 按名称查找控件。现在把 .ui 编译成 ui_components/ui_main_window.py，
+#  主窗口直接继承 Ui_MainWindow 并调用 setupUi，控件是普通属性，打包时也不再需要
+#  uic 模块和 .ui 文件。
+#
+#  - 修改 .ui 后在源码环境中运行程序会自动重新编译（.ui 比生成的 .py 新时）
+#  - 也可以手动编译: python -m ui_components.compile_ui
+#  - 打包（spec）时会先编译一次，确保exe中的界面与 .ui 一致
+# ==============================================================================
+
+import io
+import os
+import sys
+
+_PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+UI_SOURCE_PATH = os.path.join(_PROJECT_DIR, "setting", "多题.ui")
+UI_MODULE_PATH = os.path.join(_PROJECT_DIR, "ui_components", "ui_main_window.py")
+
+
+def is_ui_module_stale():
+    """生成的界面模块不存在，或 .ui 文件比它新时返回 True"""
+    if not os.path.exists(UI_SOURCE_PATH):
+        return False  # 没有 .ui 源文件（例如打包后），只能使用已生成的模块
+    if not os.path.exists(UI_MODULE_PATH):
+        return True
+    return os.path.getmtime(UI_SOURCE_PATH) > os.path.getmtime(UI_MODULE_PATH)
+
+
+def compile_main_window_ui():
+    """把 setting/多题.ui 编译为 ui_components/ui_main_window.py"""
+    from PyQt5 import uic  # 只在编译时需要，不随程序打包
+
+    with open(UI_SOURCE_PATH, "rb") as f:
+        ui_file = io.BytesIO(f.read())
+    # 生成文件头部注释中使用相对路径，不记录本机的目录
+    ui_file.name = os.path.relpath(UI_SOURCE_PATH, _PROJECT_DIR).replace(os.sep, "/")
+
+    tmp_path = UI_MODULE_PATH + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        uic.compileUi(ui_file, f)
+    os.replace(tmp_path, UI_MODULE_PATH)
+
+
+def ensure_ui_module_fresh():
+    """源码环境中 .ui 有改动时重新编译；打包后的程序直接使用已编译的模块"""
+    if getattr(sys, 'frozen', False):
+        return False
+    if not is_ui_module_stale():
+        return False
+    try:
+        compile_main_window_ui()
+    except Exception as e:
+        # 编译失败时继续使用旧的模块（界面可能与 .ui 不一致），不影响启动
+        print(f"重新编译界面文件失败，使用已有的 ui_main_window.py: {str(e)}")
+        return False
+    return True
+
+
+if __name__ == "__main__":
+    compile_main_window_ui()
+    print(f"已生成 {UI_MODULE_PATH}")
+
+# --- END OF FILE compile_ui.py ---
@@ -2,39 +2,67 @@
 
 import sys
 import os
+import html
 import traceback
 from PyQt5.QtWidgets import (QMainWindow, QWidget, QMessageBox, QDialog,
                              QComboBox, QLineEdit, QCheckBox, QSpinBox,
-                             QPlainTextEdit, QApplication, QShortcut, QLabel, QPushButton)
-from PyQt5.QtCore import Qt, pyqtSignal
-from PyQt5.QtGui import QKeySequence
-from PyQt5 import uic
+                             QPlainTextEdit, QApplication, QShortcut, QLabel, QPushButton,
+                             QFileDialog, QInputDialog)
+from PyQt5.QtCore import Qt, pyqtSignal, QTimer
+from PyQt5.QtGui import QKeySequence, QTextCursor
 
 # --- 新增导入 ---
 # 从 api_service.py 导入转换函数和UI文本列表生成函数
 from api_service import get_provider_id_from_ui_text, get_ui_text_from_provider_id, UI_TEXT_TO_PROVIDER_ID
-
-class MainWindow(QMainWindow):
+from live_stats import LiveProgressTracker, format_live_stats
+from config_manager import get_app_base_dir
+import app_log
+from ui_components.compile_ui import ensure_ui_module_fresh
+
+ensure_ui_module_fresh()  # 源码环境中 .ui 有改动时先重新编译，再导入生成的界面类
+from ui_components.ui_main_window import Ui_MainWindow
+
+# 实时进度面板的刷新间隔（毫秒）
+LIVE_STATS_INTERVAL_MS = 1000
+# 日志区合并刷新的间隔（毫秒）：这段时间内的日志一次性追加到界面
+LOG_FLUSH_INTERVAL_MS = 200
+LOG_LEVEL_STYLES = {
+    app_log.DEBUG: ("gray", "[调试]"),
+    app_log.INFO: ("blue", "[信息]"),
+    app_log.ERROR: ("red", "[错误]"),
+}
+
+class MainWindow(QMainWindow, Ui_MainWindow):
     # ... (信号定义部分保持不变) ...
     # update_signal = pyqtSignal(str)
     log_signal = pyqtSignal(str, bool)
     progress_signal = pyqtSignal(int, int)
     finished_signal = pyqtSignal()
+    merge_requested_signal = pyqtSignal() # “添加最新阅卷记录”按钮，Application 连接到 manual_merge_records
 
     def __init__(self, config_manager, api_service, worker):
         super().__init__()
         self.config_manager = config_manager
         self.api_service = api_service
         self.worker = worker
+        self.batch_worker = None # 离线批量阅卷线程，首次使用时由 batch_worker_factory 创建
+        self.batch_worker_factory = None # 由 Application 设置
+        self._live_stats_worker = None # 实时进度面板正在统计的线程
         self._is_initializing = True
 
-        # ... (UI文件加载部分保持不变) ...
-        if getattr(sys, 'frozen', False):
-            base_path = sys._MEIPASS
-        else:
-            base_path = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-        ui_path = os.path.join(base_path, "setting", "多题.ui")
-        uic.loadUi(ui_path, self)
+        # 界面由 setting/多题.ui 预编译而来（见 compile_ui.py），控件直接作为属性使用
+        self.setupUi(self)
+
+        # 日志：全部写入滚动日志文件；日志区只保留最近的消息，由定时器合并刷新
+        self.log_file_path = app_log.setup_file_logging(
+            os.path.join(get_app_base_dir(), "日志"), self.config_manager.log_file_max_mb)
+        self.log_buffer = app_log.LogBuffer(self.config_manager.log_view_max_lines,
+                                            app_log.parse_level(self.config_manager.log_level))
+        self.log_text.document().setMaximumBlockCount(self.log_buffer.max_entries)
+        self.log_flush_timer = QTimer(self)
+        self.log_flush_timer.setSingleShot(True)
+        self.log_flush_timer.setInterval(LOG_FLUSH_INTERVAL_MS)
+        self.log_flush_timer.timeout.connect(self.flush_log_view)
 
         # ... (其他初始化属性保持不变) ...
         self.answer_windows = {}
@@ -42,7 +70,6 @@ class MainWindow(QMainWindow):
         self.max_questions = 4
         self.shortcut_esc = QShortcut(QKeySequence(Qt.Key_Escape), self)
         self.shortcut_esc.activated.connect(self.stop_auto_thread)
-        self._ui_cache = {}
 
         self.init_ui()
 
@@ -57,12 +84,26 @@ class MainWindow(QMainWindow):
         self.merge_cache_button.clicked.connect(self.request_merge_cache)
         self.merge_cache_button.hide()
 
+        self.batch_grading_button = QPushButton("离线批量阅卷")
+        self.batch_grading_button.setToolTip("从文件夹或zip压缩包读取同一道题的答题图片，批量调用AI评分")
+        self.batch_grading_button.clicked.connect(self.batch_grading_but_clicked)
+
+        # 实时进度面板：progress_signal 只更新计数，由定时器汇总刷新
+        self.live_progress = LiveProgressTracker()
+        self.live_stats_label = QLabel("")
+        self.live_stats_label.setStyleSheet("color: #2e7d32; font-weight: bold;")
+        self.live_stats_label.setWordWrap(True)
+        self.live_stats_label.hide()
+        self.live_stats_timer = QTimer(self)
+        self.live_stats_timer.setInterval(LIVE_STATS_INTERVAL_MS)
+        self.live_stats_timer.timeout.connect(self.refresh_live_stats)
+
         # 查找UI中的合适区域添加缓存控件（假设有一个水平布局区域）
         # 这里需要根据实际UI文件找到合适的位置，比如日志区域上方
         # 临时添加到一个假设的位置，实际使用时需要调整
         from PyQt5.QtWidgets import QHBoxLayout, QVBoxLayout
         # 假设有log_text布局的父级，添加缓存区域
-        log_widget = self.get_ui_element('log_text')
+        log_widget = self.log_text
         if log_widget and log_widget.parent():
             parent_layout = log_widget.parent().layout()
             if parent_layout:
@@ -71,10 +112,12 @@ class MainWindow(QMainWindow):
                 cache_layout.addWidget(self.cache_status_label)
                 cache_layout.addStretch()
                 cache_layout.addWidget(self.merge_cache_button)
+                cache_layout.addWidget(self.batch_grading_button)
 
                 # 将缓存布局插入到日志上方
                 if hasattr(parent_layout, 'insertLayout'):
                     parent_layout.insertLayout(parent_layout.count() - 1, cache_layout)
+                    parent_layout.insertWidget(parent_layout.count() - 1, self.live_stats_label)
 
         self.show()
         self._is_initializing = False
@@ -153,6 +196,12 @@ class MainWindow(QMainWindow):
                     lambda val, f=field: self.handle_spinBox_save(f, val)
                 )
 
+        concurrent_cb = self.concurrent_grading_enabled
+        if concurrent_cb:
+            concurrent_cb.stateChanged.connect(
+                lambda state: self.handle_checkBox_save('concurrent_grading_enabled', state)
+            )
+
         for i in range(1, self.max_questions + 1):
             std_answer_widget = self.get_ui_element(f'StandardAnswer_text_{i}', QPlainTextEdit)
             if std_answer_widget:
@@ -226,12 +275,14 @@ class MainWindow(QMainWindow):
                         combo_box.setCurrentIndex(0) # 如果找不到，默认选第一个
 
             # 加载其他配置 (保持不变)
-            subject_widget = self.get_ui_element('subject_text', QComboBox)
+            subject_widget = self.subject_text
             if subject_widget: subject_widget.setCurrentText(self.config_manager.subject)
-            self.get_ui_element('cycle_number').setValue(self.config_manager.cycle_number)
-            self.get_ui_element('wait_time').setValue(self.config_manager.wait_time)
-            self.get_ui_element('dual_evaluation_enabled').setChecked(self.config_manager.dual_evaluation_enabled)
-            self.get_ui_element('score_diff_threshold').setValue(self.config_manager.score_diff_threshold)
+            self.cycle_number.setValue(self.config_manager.cycle_number)
+            self.wait_time.setValue(self.config_manager.wait_time)
+            self.dual_evaluation_enabled.setChecked(self.config_manager.dual_evaluation_enabled)
+            self.score_diff_threshold.setValue(self.config_manager.score_diff_threshold)
+            concurrent_cb = self.concurrent_grading_enabled
+            if concurrent_cb: concurrent_cb.setChecked(self.config_manager.concurrent_grading_enabled)
             
             # 加载题目配置 (保持不变)
             for i in range(1, self.max_questions + 1):
@@ -311,16 +362,19 @@ class MainWindow(QMainWindow):
                 q_config['dual_eval_enabled'] = dual_evaluation if q_index == 1 else False
                 question_configs_for_worker.append(q_config)
 
-            params = {
+            params = self._build_common_worker_params()
+            params.update({
                 'cycle_number': self.config_manager.cycle_number,
                 'wait_time': self.config_manager.wait_time,
                 'question_configs': question_configs_for_worker,
                 'dual_evaluation': dual_evaluation,
-                'score_diff_threshold': self.config_manager.score_diff_threshold,
-                'first_model_id': self.config_manager.first_modelID,
-                'second_model_id': self.config_manager.second_modelID,
-                'is_single_question_one_run': is_single_q1_run
-            }
+                'is_single_question_one_run': is_single_q1_run,
+                'concurrent_grading': self.config_manager.concurrent_grading_enabled and not is_single_q1_run,
+                'max_concurrent_requests': self.config_manager.max_concurrent_requests,
+                'page_change_detection': self.config_manager.page_change_detection,
+                'page_change_timeout': self.config_manager.page_change_timeout,
+                'page_stable_frames': self.config_manager.page_stable_frames,
+            })
 
             self.worker.set_parameters(**params)
             self.worker.start()
@@ -331,6 +385,85 @@ class MainWindow(QMainWindow):
             self.log_message(f"启动自动阅卷出错: {e}", is_error=True)
             traceback.print_exc()
 
+    def _build_common_worker_params(self):
+        """屏幕阅卷与离线批量阅卷共用的线程参数"""
+        return {
+            'score_diff_threshold': self.config_manager.score_diff_threshold,
+            'first_model_id': self.config_manager.first_modelID,
+            'second_model_id': self.config_manager.second_modelID,
+            'response_cache_enabled': self.config_manager.response_cache_enabled,
+            'response_cache_max_mb': self.config_manager.response_cache_max_mb,
+            'blank_detection_enabled': self.config_manager.blank_detection_enabled,
+            'blank_ink_ratio_threshold': self.config_manager.blank_ink_ratio_threshold,
+            'blank_template_dir': self.config_manager.get_blank_template_dir(),
+            'usage_budget': self.config_manager.usage_budget,
+            'usage_token_budget': self.config_manager.usage_token_budget,
+            'price_table': dict(self.config_manager.price_table),
+        }
+
+    def batch_grading_but_clicked(self):
+        """离线批量阅卷按钮点击事件：选择图片来源和题目后启动批量阅卷线程"""
+        if self.batch_worker is None and self.batch_worker_factory is not None:
+            self.batch_worker_factory()
+        if self.batch_worker is None:
+            self.log_message("离线批量阅卷不可用", is_error=True)
+            return
+        if self.worker.isRunning() or self.batch_worker.isRunning():
+            self.log_message("已有阅卷任务在运行，请先停止", is_error=True)
+            return
+
+        if not self.config_manager.save_all_configs_to_file():
+            self.log_message("错误：运行前保存配置失败！无法启动离线批量阅卷。", is_error=True)
+            return
+        if not self.check_required_settings():
+            return
+
+        source_type, ok = QInputDialog.getItem(self, "离线批量阅卷", "答题图片来源:",
+                                               ["图片文件夹", "zip压缩包"], 0, False)
+        if not ok:
+            return
+        if source_type == "图片文件夹":
+            source_path = QFileDialog.getExistingDirectory(self, "选择答题图片所在文件夹")
+        else:
+            source_path, _ = QFileDialog.getOpenFileName(self, "选择答题图片压缩包", "", "zip压缩包 (*.zip)")
+        if not source_path:
+            return
+
+        enabled_questions_indices = [1] + [i for i in range(2, self.max_questions + 1)
+                                           if self.get_ui_element(f'enableQuestion{i}').isChecked()]
+        if len(enabled_questions_indices) == 1:
+            q_index = 1
+        else:
+            choice, ok = QInputDialog.getItem(self, "离线批量阅卷", "这些图片是第几题的答案:",
+                                              [f"第{i}题" for i in enabled_questions_indices], 0, False)
+            if not ok:
+                return
+            q_index = enabled_questions_indices[[f"第{i}题" for i in enabled_questions_indices].index(choice)]
+
+        try:
+            # 双评设置只对第一题生效，与屏幕阅卷保持一致
+            dual_evaluation = self.config_manager.dual_evaluation_enabled and q_index == 1
+            q_config = self.config_manager.get_question_config(q_index).copy()
+            q_config['question_index'] = q_index
+            q_config['dual_eval_enabled'] = dual_evaluation
+
+            params = self._build_common_worker_params()
+            params.update({
+                'source_path': source_path,
+                'question_configs': [q_config],
+                'dual_evaluation': dual_evaluation,
+                'batch_concurrency': self.config_manager.batch_concurrency,
+            })
+
+            self.batch_worker.set_parameters(**params)
+            self.batch_worker.start()
+            # 批量阅卷不操作网页，无需最小化主窗口
+            self.update_ui_state(is_running=True, minimize=False)
+            self.log_message(f"离线批量阅卷已启动: 第{q_index}题, 来源 {source_path}")
+        except Exception as e:
+            self.log_message(f"启动离线批量阅卷出错: {e}", is_error=True)
+            traceback.print_exc()
+
     def check_required_settings(self):
         """检查必要的设置是否已配置"""
         errors = []
@@ -380,7 +513,7 @@ class MainWindow(QMainWindow):
             self.log_message("正在测试第一组API连接...")
             success1, message1 = self.api_service.test_api_connection("first")
             
-            dual_eval_checkbox = self.get_ui_element('dual_evaluation_enabled')
+            dual_eval_checkbox = self.dual_evaluation_enabled
             is_dual_active_ui = dual_eval_checkbox.isChecked() and dual_eval_checkbox.isEnabled()
 
             result_message = ""
@@ -426,6 +559,9 @@ class MainWindow(QMainWindow):
         if self.worker.isRunning():
             self.worker.stop()
             self.worker.wait()  # 等待线程安全退出，这是一个好习惯
+        if self.batch_worker is not None and self.batch_worker.isRunning():
+            self.batch_worker.stop()
+            self.batch_worker.wait()
 
         # 遍历字典值的副本，因为我们不需要在循环中修改字典
         for window in list(self.answer_windows.values()):
@@ -475,7 +611,7 @@ class MainWindow(QMainWindow):
     def _apply_ui_constraints(self):
         is_single_q1_mode = self._is_single_q1_mode()
 
-        dual_eval_checkbox = self.get_ui_element('dual_evaluation_enabled')
+        dual_eval_checkbox = self.dual_evaluation_enabled
         if dual_eval_checkbox:
             dual_eval_checkbox.setEnabled(is_single_q1_mode)
             if not is_single_q1_mode and dual_eval_checkbox.isChecked():
@@ -485,10 +621,15 @@ class MainWindow(QMainWindow):
                 dual_eval_checkbox.blockSignals(False)
             
             is_dual_active = dual_eval_checkbox.isChecked() and dual_eval_checkbox.isEnabled()
-            self.get_ui_element('score_diff_threshold').setEnabled(is_dual_active)
-            self.get_ui_element('second_api_url').setEnabled(is_dual_active)
-            self.get_ui_element('second_api_key').setEnabled(is_dual_active)
-            self.get_ui_element('second_modelID').setEnabled(is_dual_active)
+            self.score_diff_threshold.setEnabled(is_dual_active)
+            self.second_api_url.setEnabled(is_dual_active)
+            self.second_api_key.setEnabled(is_dual_active)
+            self.second_modelID.setEnabled(is_dual_active)
+
+        # 多题并发仅在启用多道题目时有意义
+        concurrent_cb = self.concurrent_grading_enabled
+        if concurrent_cb:
+            concurrent_cb.setEnabled(not is_single_q1_mode)
 
         q1_config = self.config_manager.get_question_config(1)
         is_q1_three_step_enabled = q1_config.get('enable_three_step_scoring', False)
@@ -525,12 +666,84 @@ class MainWindow(QMainWindow):
         if btn: btn.setEnabled(is_enabled)
         
     def log_message(self, message, is_error=False):
-        log_widget = self.get_ui_element('log_text')
-        if log_widget:
-            color = "red" if is_error else "blue"
-            prefix = "[错误]" if is_error else "[信息]"
-            log_widget.append(f'<span style="color:{color}">{prefix} {message}</span>')
-        print(f"[{'错误' if is_error else '信息'}] {message}")
+        self._add_log(app_log.ERROR if is_error else app_log.INFO, message)
+
+    def log_debug(self, message):
+        """过程细节（解析步骤、原始响应等），日志级别为 DEBUG 时才显示在日志区"""
+        self._add_log(app_log.DEBUG, message)
+
+    def _add_log(self, level, message):
+        if self.log_buffer.add(level, message) and not self.log_flush_timer.isActive():
+            self.log_flush_timer.start()
+
+    def flush_log_view(self):
+        """把缓冲中的日志一次性追加到日志区（超过上限的旧消息由文档自动移除）"""
+        entries, dropped = self.log_buffer.take_pending()
+        if not entries:
+            return
+        log_widget = self.log_text
+        scroll_bar = log_widget.verticalScrollBar()
+        at_bottom = scroll_bar.value() >= scroll_bar.maximum() - 4
+
+        cursor = QTextCursor(log_widget.document())
+        cursor.movePosition(QTextCursor.End)
+        cursor.beginEditBlock()
+        is_first = log_widget.document().isEmpty()
+        if dropped:
+            entries.insert(0, (app_log.INFO, f"（日志过多，已省略 {dropped} 条，完整内容见日志文件）"))
+        for level, message in entries:
+            color, prefix = LOG_LEVEL_STYLES.get(level, LOG_LEVEL_STYLES[app_log.INFO])
+            if not is_first:
+                cursor.insertBlock()
+            is_first = False
+            text = html.escape(message).replace("\n", "<br>")
+            cursor.insertHtml(f'<span style="color:{color}">{prefix} {text}</span>')
+        cursor.endEditBlock()
+
+        if at_bottom:
+            scroll_bar.setValue(scroll_bar.maximum())
+
+    def update_progress(self, current, total):
+        """progress_signal 的槽：只记录进度，面板由 refresh_live_stats 定时刷新"""
+        self.live_progress.update_progress(current, total)
+
+    def update_record_queue_depth(self, depth):
+        """阅卷记录写入线程 queue_depth_signal 的槽：运行中由定时器刷新，运行结束后积压变化时立即刷新"""
+        self.live_progress.update_record_queue_depth(depth)
+        if not self.live_stats_timer.isActive() and self.live_stats_label.isVisible():
+            self.refresh_live_stats()
+
+    def _get_running_worker(self):
+        """当前正在运行（或刚结束）的阅卷线程"""
+        if self.batch_worker is not None and self.batch_worker.isRunning():
+            return self.batch_worker
+        if self.worker.isRunning():
+            return self.worker
+        return self._live_stats_worker
+
+    def refresh_live_stats(self):
+        """汇总吞吐量、API延迟、重试次数、剩余时间并刷新面板"""
+        worker = self._get_running_worker()
+        if worker is None:
+            return
+        try:
+            text = format_live_stats(self.live_progress.snapshot(worker))
+        except Exception as e:
+            text = f"实时统计出错: {str(e)}"
+        self.live_stats_label.setText(text)
+
+    def _start_live_stats(self):
+        self.live_progress.reset()
+        self._live_stats_worker = self._get_running_worker()
+        self.live_stats_label.setText("等待第一份答卷完成...")
+        self.live_stats_label.show()
+        self.live_stats_timer.start()
+
+    def _stop_live_stats(self):
+        if not self.live_stats_timer.isActive():
+            return
+        self.live_stats_timer.stop()
+        self.refresh_live_stats()  # 保留结束时的最终统计，直到下次运行
 
     def on_worker_finished(self):
         self.update_ui_state(is_running=False)
@@ -539,16 +752,17 @@ class MainWindow(QMainWindow):
         self.log_message(f"任务中断: {error_message}", is_error=True)
         self.update_ui_state(is_running=False)
         
-    def update_ui_state(self, is_running):
-        self.get_ui_element('auto_run_but').setEnabled(not is_running)
-        self.get_ui_element('stop_but').setEnabled(is_running)
+    def update_ui_state(self, is_running, minimize=True):
+        self.auto_run_but.setEnabled(not is_running)
+        self.stop_but.setEnabled(is_running)
+        self.batch_grading_button.setEnabled(not is_running)
         
         # 禁用所有配置相关控件
         config_controls = [
             'first_api_url', 'first_api_key', 'first_modelID',
             'second_api_url', 'second_api_key', 'second_modelID',
             'dual_evaluation_enabled', 'score_diff_threshold', 'subject_text',
-            'cycle_number', 'wait_time', 'api_test_button'
+            'cycle_number', 'wait_time', 'concurrent_grading_enabled', 'api_test_button'
         ]
         for i in range(1, 5):
             config_controls.append(f'configQuestion{i}')
@@ -561,8 +775,10 @@ class MainWindow(QMainWindow):
                 widget.setEnabled(not is_running)
 
         if is_running:
-            if not self.isMinimized(): self.showMinimized()
+            self._start_live_stats()
+            if minimize and not self.isMinimized(): self.showMinimized()
         else:
+            self._stop_live_stats()
             if self.isMinimized(): self.showNormal(); self.activateWindow()
             self._apply_ui_constraints() # 任务结束后恢复UI约束
 
@@ -570,19 +786,20 @@ class MainWindow(QMainWindow):
         if self.worker.isRunning():
             self.worker.stop()
             self.log_message("已发送停止请求至自动阅卷线程。")
+        elif self.batch_worker is not None and self.batch_worker.isRunning():
+            self.batch_worker.stop()
+            self.log_message("已发送停止请求至离线批量阅卷线程。")
         else:
             self.update_ui_state(is_running=False) # 确保UI状态正确
 
     # ... 其他如 get_ui_element, open_question_config_dialog 等函数保持原样 ...
     # 您可以将原文件中的这些函数直接复制过来
     def get_ui_element(self, element_name, element_type=None):
-        if element_name in self._ui_cache:
-            return self._ui_cache[element_name]
-        
-        element = self.findChild(QWidget, element_name)
-        if element:
-            self._ui_cache[element_name] = element
-        return element
+        """按名称获取控件（用于 f'enableQuestion{i}' 这类拼接的名称）"""
+        element = getattr(self, element_name, None)
+        if isinstance(element, QWidget):
+            return element
+        return self.findChild(QWidget, element_name)
         
     def open_question_config_dialog(self, question_index):
         # 延迟导入以避免循环依赖
@@ -637,9 +854,9 @@ class MainWindow(QMainWindow):
             if widget: widget.setPlaceholderText(f"请输入第{i}题的评分细则...")
 
     def setup_dual_evaluation(self):
-        cb = self.get_ui_element('dual_evaluation_enabled')
+        cb = self.dual_evaluation_enabled
         if cb: cb.stateChanged.connect(self.on_dual_evaluation_changed)
-        spin = self.get_ui_element('score_diff_threshold')
+        spin = self.score_diff_threshold
         if spin: spin.valueChanged.connect(lambda val: self.handle_spinBox_save('score_diff_threshold', val))
 
     def on_subject_changed(self, index):
@@ -650,9 +867,9 @@ class MainWindow(QMainWindow):
     def _connect_signals(self):
         """统一连接所有UI控件的信号与槽"""
         # 连接按钮点击
-        self.get_ui_element('auto_run_but').clicked.connect(self.auto_run_but_clicked)
-        self.get_ui_element('stop_but').clicked.connect(self.stop_auto_thread)
-        self.get_ui_element('api_test_button').clicked.connect(self.test_api_connections)
+        self.auto_run_but.clicked.connect(self.auto_run_but_clicked)
+        self.stop_but.clicked.connect(self.stop_auto_thread)
+        self.api_test_button.clicked.connect(self.test_api_connections)
         for i in range(1, self.max_questions + 1):
             btn = self.get_ui_element(f'configQuestion{i}')
             if btn:
@@ -682,16 +899,7 @@ class MainWindow(QMainWindow):
             self.merge_cache_button.setEnabled(show)
 
     def request_merge_cache(self):
-        """请求合并缓存记录"""
-        # 通过信号发送到Application类
-        # 假设Application类有连接的槽
-        # 这里发出一个信号或者直接调用
-        # 由于MainWindow不知道Application实例，我们需要通过信号
-        # 临时：使用一个自定义信号
-        from PyQt5.QtCore import pyqtSignal
-        if not hasattr(self, 'merge_requested_signal'):
-            self.merge_requested_signal = pyqtSignal()
-            # 在Application中连接: self.main_window.merge_requested_signal.connect(self.manual_merge_records)
+        """请求导出/合并等待中的阅卷记录（由Application处理）"""
         self.merge_requested_signal.emit()
 
 # --- END OF FILE main_window.py ---
@@ -6,8 +6,10 @@ from PyQt5.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QLabel,
                             QMainWindow, QWidget)
 from PyQt5.QtCore import Qt, QPoint, QRect, pyqtSignal, QTimer
 from PyQt5.QtGui import QPainter, QColor, QPen, QFont
-import pyautogui
 import time
+import os
+
+from image_processing import get_blank_template_path
 
 class MyWindow2(QMainWindow):
     """答案框窗口类，用于框定答案区域"""
@@ -538,10 +540,52 @@ class QuestionConfigDialog(QDialog):
         self.set_answer_button = QPushButton("框定答案区域")
         self.set_answer_button.clicked.connect(self.start_answer_area_selection)
         answer_button_layout.addWidget(self.set_answer_button)
+        self.capture_template_button = QPushButton("采集空白模板")
+        self.capture_template_button.setToolTip("屏幕上显示一份未作答的答题卡时点击，采集该题答案区域作为空白模板。\n"
+                                                "本地空白检测会与模板比较，避免把印刷的横线、方格误认为作答。")
+        self.capture_template_button.clicked.connect(self.start_blank_template_capture)
+        answer_button_layout.addWidget(self.capture_template_button)
         answer_group_main_layout.addLayout(answer_button_layout)
         
         answer_group.setLayout(answer_group_main_layout)
         main_layout.addWidget(answer_group) # 确保 answer_group 被添加到主布局
+
+        # --- 6.1 上传图片预处理 ---
+        image_group = QGroupBox("上传图片预处理（减小上传体积与识图Token）")
+        image_group_layout = QHBoxLayout()
+
+        self.image_auto_trim_check = QCheckBox("自动裁白边")
+        self.image_auto_trim_check.setChecked(self.question_config.get('image_auto_trim', True))
+        self.image_auto_trim_check.setToolTip("只上传答案区域中有笔迹的部分（保留少量边距）。笔迹过少时自动上传完整区域。")
+        image_group_layout.addWidget(self.image_auto_trim_check)
+
+        self.image_grayscale_check = QCheckBox("灰度")
+        self.image_grayscale_check.setChecked(self.question_config.get('image_grayscale', False))
+        self.image_grayscale_check.setToolTip("转为灰度图上传。题目依赖颜色（如作图题用彩笔）时不要勾选。")
+        image_group_layout.addWidget(self.image_grayscale_check)
+
+        self.image_autocontrast_check = QCheckBox("增强对比度")
+        self.image_autocontrast_check.setChecked(self.question_config.get('image_autocontrast', False))
+        self.image_autocontrast_check.setToolTip("拉伸灰度范围，使铅笔等浅色笔迹更清晰。")
+        image_group_layout.addWidget(self.image_autocontrast_check)
+
+        image_group_layout.addWidget(QLabel("最长边:"))
+        self.image_max_edge_spin = QSpinBox()
+        self.image_max_edge_spin.setRange(0, 4096)
+        self.image_max_edge_spin.setSingleStep(100)
+        self.image_max_edge_spin.setSpecialValueText("不缩放")
+        self.image_max_edge_spin.setValue(self.question_config.get('image_max_edge', 1600))
+        self.image_max_edge_spin.setToolTip("截图最长边超过该像素数时等比缩小，0 表示不缩放。")
+        image_group_layout.addWidget(self.image_max_edge_spin)
+
+        image_group_layout.addWidget(QLabel("JPEG质量:"))
+        self.image_jpeg_quality_spin = QSpinBox()
+        self.image_jpeg_quality_spin.setRange(30, 95)
+        self.image_jpeg_quality_spin.setValue(self.question_config.get('image_jpeg_quality', 75))
+        image_group_layout.addWidget(self.image_jpeg_quality_spin)
+
+        image_group.setLayout(image_group_layout)
+        main_layout.addWidget(image_group)
         
         # --- 7. 按钮区域 (Save, Cancel) ---
         button_layout = QHBoxLayout()
@@ -693,6 +737,42 @@ class QuestionConfigDialog(QDialog):
         except Exception as e:
             self.parent.log_message(f"处理答案区域坐标出错: {str(e)}", is_error=True)
 
+    def start_blank_template_capture(self):
+        """隐藏配置框和答案框后采集当前答案区域，作为本题的空白模板"""
+        try:
+            bbox = (int(self.answer_x1_edit.text()), int(self.answer_y1_edit.text()),
+                    int(self.answer_x2_edit.text()), int(self.answer_y2_edit.text()))
+        except ValueError:
+            self.parent.log_message(f"第{self.question_index}题答案区域坐标无效，无法采集空白模板", is_error=True)
+            return
+        if bbox[2] <= bbox[0] or bbox[3] <= bbox[1]:
+            self.parent.log_message(f"请先框定第{self.question_index}题的答案区域，再采集空白模板", is_error=True)
+            return
+
+        # 截图前把可能遮挡答案区域的窗口设为全透明（模态对话框调用 hide() 会直接结束 exec_），等待重绘后再截取
+        hidden_windows = [self]
+        answer_window = self.parent.answer_windows.get(self.question_index)
+        if answer_window is not None and answer_window.isVisible():
+            hidden_windows.append(answer_window)
+        saved_opacity = [(window, window.windowOpacity()) for window in hidden_windows]
+        for window in hidden_windows:
+            window.setWindowOpacity(0.0)
+        QTimer.singleShot(300, lambda: self._capture_blank_template(bbox, saved_opacity))
+
+    def _capture_blank_template(self, bbox, saved_opacity):
+        try:
+            from PIL import ImageGrab  # 首次采集时才导入，不拖慢程序启动
+            template = ImageGrab.grab(bbox=bbox)
+            template_dir = self.config_manager.get_blank_template_dir()
+            os.makedirs(template_dir, exist_ok=True)
+            template.save(get_blank_template_path(template_dir, self.question_index), format="PNG")
+            self.parent.log_message(f"第{self.question_index}题空白模板已采集，尺寸 {template.size[0]}x{template.size[1]}")
+        except Exception as e:
+            self.parent.log_message(f"采集第{self.question_index}题空白模板出错: {str(e)}", is_error=True)
+        finally:
+            for window, opacity in saved_opacity:
+                window.setWindowOpacity(opacity)
+
     def set_position(self, x_edit_name, y_edit_name, position_name):
         """设置位置坐标"""
         try:
@@ -721,7 +801,8 @@ class QuestionConfigDialog(QDialog):
     def capture_position(self, x_edit_name, y_edit_name, position_name):
         """捕获鼠标位置并更新文本框"""
         try:
-            # 获取当前鼠标位置
+            # 获取当前鼠标位置（pyautogui 返回物理像素坐标，与自动阅卷点击一致；首次使用时才导入）
+            import pyautogui
             x, y = pyautogui.position()
 
             # 设置坐标到文本框
@@ -783,6 +864,11 @@ class QuestionConfigDialog(QDialog):
                     'x2': answer_x2,
                     'y2': answer_y2
                 })
+                self.config_manager.update_question_config(str(self.question_index), 'image_auto_trim', self.image_auto_trim_check.isChecked())
+                self.config_manager.update_question_config(str(self.question_index), 'image_grayscale', self.image_grayscale_check.isChecked())
+                self.config_manager.update_question_config(str(self.question_index), 'image_autocontrast', self.image_autocontrast_check.isChecked())
+                self.config_manager.update_question_config(str(self.question_index), 'image_max_edge', self.image_max_edge_spin.value())
+                self.config_manager.update_question_config(str(self.question_index), 'image_jpeg_quality', self.image_jpeg_quality_spin.value())
 
             # 更新当前小题的翻页按钮配置
             enable_next_for_current_q = self.enable_next_check.isChecked()
@@ -0,0 +1,437 @@
+# -*- coding: utf-8 -*-
+
+# Form implementation generated from reading ui file 'setting/多题.ui'
+#
+# Created by: PyQt5 UI code generator 5.15.11
+#
+# WARNING: Any manual changes made to this file will be lost when pyuic5 is
+# run again.  Do not edit this file unless you know what you are doing.
+
+
+from PyQt5 import QtCore, QtGui, QtWidgets
+
+
+class Ui_MainWindow(object):
+    def setupUi(self, MainWindow):
+        MainWindow.setObjectName("MainWindow")
+        MainWindow.resize(800, 980)
+        sizePolicy = QtWidgets.QSizePolicy(QtWidgets.QSizePolicy.Preferred, QtWidgets.QSizePolicy.Preferred)
+        sizePolicy.setHorizontalStretch(0)
+        sizePolicy.setVerticalStretch(0)
+        sizePolicy.setHeightForWidth(MainWindow.sizePolicy().hasHeightForWidth())
+        MainWindow.setSizePolicy(sizePolicy)
+        MainWindow.setMinimumSize(QtCore.QSize(0, 980))
+        MainWindow.setMaximumSize(QtCore.QSize(800, 980))
+        font = QtGui.QFont()
+        font.setFamily("微软雅黑")
+        font.setPointSize(10)
+        MainWindow.setFont(font)
+        self.centralwidget = QtWidgets.QWidget(MainWindow)
+        sizePolicy = QtWidgets.QSizePolicy(QtWidgets.QSizePolicy.Preferred, QtWidgets.QSizePolicy.Preferred)
+        sizePolicy.setHorizontalStretch(0)
+        sizePolicy.setVerticalStretch(0)
+        sizePolicy.setHeightForWidth(self.centralwidget.sizePolicy().hasHeightForWidth())
+        self.centralwidget.setSizePolicy(sizePolicy)
+        self.centralwidget.setMaximumSize(QtCore.QSize(16777215, 980))
+        self.centralwidget.setObjectName("centralwidget")
+        self.horizontalLayout_8 = QtWidgets.QHBoxLayout(self.centralwidget)
+        self.horizontalLayout_8.setContentsMargins(1, 1, 1, 1)
+        self.horizontalLayout_8.setObjectName("horizontalLayout_8")
+        self.scrollArea = QtWidgets.QScrollArea(self.centralwidget)
+        sizePolicy = QtWidgets.QSizePolicy(QtWidgets.QSizePolicy.Preferred, QtWidgets.QSizePolicy.Preferred)
+        sizePolicy.setHorizontalStretch(0)
+        sizePolicy.setVerticalStretch(0)
+        sizePolicy.setHeightForWidth(self.scrollArea.sizePolicy().hasHeightForWidth())
+        self.scrollArea.setSizePolicy(sizePolicy)
+        self.scrollArea.setMaximumSize(QtCore.QSize(780, 980))
+        self.scrollArea.setVerticalScrollBarPolicy(QtCore.Qt.ScrollBarAsNeeded)
+        self.scrollArea.setHorizontalScrollBarPolicy(QtCore.Qt.ScrollBarAsNeeded)
+        self.scrollArea.setSizeAdjustPolicy(QtWidgets.QAbstractScrollArea.AdjustToContents)
+        self.scrollArea.setWidgetResizable(False)
+        self.scrollArea.setAlignment(QtCore.Qt.AlignCenter)
+        self.scrollArea.setObjectName("scrollArea")
+        self.scrollAreaWidgetContents = QtWidgets.QWidget()
+        self.scrollAreaWidgetContents.setEnabled(True)
+        self.scrollAreaWidgetContents.setGeometry(QtCore.QRect(9, 6, 760, 965))
+        sizePolicy = QtWidgets.QSizePolicy(QtWidgets.QSizePolicy.Minimum, QtWidgets.QSizePolicy.Preferred)
+        sizePolicy.setHorizontalStretch(0)
+        sizePolicy.setVerticalStretch(0)
+        sizePolicy.setHeightForWidth(self.scrollAreaWidgetContents.sizePolicy().hasHeightForWidth())
+        self.scrollAreaWidgetContents.setSizePolicy(sizePolicy)
+        self.scrollAreaWidgetContents.setObjectName("scrollAreaWidgetContents")
+        self.verticalLayout = QtWidgets.QVBoxLayout(self.scrollAreaWidgetContents)
+        self.verticalLayout.setSpacing(1)
+        self.verticalLayout.setObjectName("verticalLayout")
+        self.horizontalLayout_3 = QtWidgets.QHBoxLayout()
+        self.horizontalLayout_3.setObjectName("horizontalLayout_3")
+        self.first_api_url = QtWidgets.QComboBox(self.scrollAreaWidgetContents)
+        self.first_api_url.setEnabled(True)
+        sizePolicy = QtWidgets.QSizePolicy(QtWidgets.QSizePolicy.Expanding, QtWidgets.QSizePolicy.Fixed)
+        sizePolicy.setHorizontalStretch(0)
+        sizePolicy.setVerticalStretch(0)
+        sizePolicy.setHeightForWidth(self.first_api_url.sizePolicy().hasHeightForWidth())
+        self.first_api_url.setSizePolicy(sizePolicy)
+        self.first_api_url.setMaximumSize(QtCore.QSize(170, 16777215))
+        self.first_api_url.setEditable(False)
+        self.first_api_url.setObjectName("first_api_url")
+        self.first_api_url.addItem("")
+        self.first_api_url.addItem("")
+        self.first_api_url.addItem("")
+        self.first_api_url.addItem("")
+        self.first_api_url.addItem("")
+        self.first_api_url.addItem("")
+        self.first_api_url.addItem("")
+        self.first_api_url.addItem("")
+        self.first_api_url.addItem("")
+        self.horizontalLayout_3.addWidget(self.first_api_url)
+        self.first_api_key = QtWidgets.QLineEdit(self.scrollAreaWidgetContents)
+        sizePolicy = QtWidgets.QSizePolicy(QtWidgets.QSizePolicy.Preferred, QtWidgets.QSizePolicy.Fixed)
+        sizePolicy.setHorizontalStretch(0)
+        sizePolicy.setVerticalStretch(0)
+        sizePolicy.setHeightForWidth(self.first_api_key.sizePolicy().hasHeightForWidth())
+        self.first_api_key.setSizePolicy(sizePolicy)
+        self.first_api_key.setText("")
+        self.first_api_key.setObjectName("first_api_key")
+        self.horizontalLayout_3.addWidget(self.first_api_key)
+        self.first_modelID = QtWidgets.QLineEdit(self.scrollAreaWidgetContents)
+        sizePolicy = QtWidgets.QSizePolicy(QtWidgets.QSizePolicy.Preferred, QtWidgets.QSizePolicy.Fixed)
+        sizePolicy.setHorizontalStretch(0)
+        sizePolicy.setVerticalStretch(0)
+        sizePolicy.setHeightForWidth(self.first_modelID.sizePolicy().hasHeightForWidth())
+        self.first_modelID.setSizePolicy(sizePolicy)
+        self.first_modelID.setText("")
+        self.first_modelID.setObjectName("first_modelID")
+        self.horizontalLayout_3.addWidget(self.first_modelID)
+        self.verticalLayout.addLayout(self.horizontalLayout_3)
+        self.horizontalLayout_4 = QtWidgets.QHBoxLayout()
+        self.horizontalLayout_4.setObjectName("horizontalLayout_4")
+        self.second_api_url = QtWidgets.QComboBox(self.scrollAreaWidgetContents)
+        sizePolicy = QtWidgets.QSizePolicy(QtWidgets.QSizePolicy.Expanding, QtWidgets.QSizePolicy.Fixed)
+        sizePolicy.setHorizontalStretch(0)
+        sizePolicy.setVerticalStretch(0)
+        sizePolicy.setHeightForWidth(self.second_api_url.sizePolicy().hasHeightForWidth())
+        self.second_api_url.setSizePolicy(sizePolicy)
+        self.second_api_url.setMaximumSize(QtCore.QSize(170, 16777215))
+        self.second_api_url.setObjectName("second_api_url")
+        self.second_api_url.addItem("")
+        self.second_api_url.addItem("")
+        self.second_api_url.addItem("")
+        self.second_api_url.addItem("")
+        self.second_api_url.addItem("")
+        self.second_api_url.addItem("")
+        self.second_api_url.addItem("")
+        self.second_api_url.addItem("")
+        self.second_api_url.addItem("")
+        self.horizontalLayout_4.addWidget(self.second_api_url)
+        self.second_api_key = QtWidgets.QLineEdit(self.scrollAreaWidgetContents)
+        sizePolicy = QtWidgets.QSizePolicy(QtWidgets.QSizePolicy.Preferred, QtWidgets.QSizePolicy.Fixed)
+        sizePolicy.setHorizontalStretch(0)
+        sizePolicy.setVerticalStretch(0)
+        sizePolicy.setHeightForWidth(self.second_api_key.sizePolicy().hasHeightForWidth())
+        self.second_api_key.setSizePolicy(sizePolicy)
+        self.second_api_key.setObjectName("second_api_key")
+        self.horizontalLayout_4.addWidget(self.second_api_key)
+        self.second_modelID = QtWidgets.QLineEdit(self.scrollAreaWidgetContents)
+        sizePolicy = QtWidgets.QSizePolicy(QtWidgets.QSizePolicy.Preferred, QtWidgets.QSizePolicy.Fixed)
+        sizePolicy.setHorizontalStretch(0)
+        sizePolicy.setVerticalStretch(0)
+        sizePolicy.setHeightForWidth(self.second_modelID.sizePolicy().hasHeightForWidth())
+        self.second_modelID.setSizePolicy(sizePolicy)
+        self.second_modelID.setObjectName("second_modelID")
+        self.horizontalLayout_4.addWidget(self.second_modelID)
+        self.verticalLayout.addLayout(self.horizontalLayout_4)
+        self.horizontalLayout_9 = QtWidgets.QHBoxLayout()
+        self.horizontalLayout_9.setObjectName("horizontalLayout_9")
+        self.dual_evaluation_enabled = QtWidgets.QCheckBox(self.scrollAreaWidgetContents)
+        self.dual_evaluation_enabled.setEnabled(True)
+        self.dual_evaluation_enabled.setChecked(False)
+        self.dual_evaluation_enabled.setObjectName("dual_evaluation_enabled")
+        self.horizontalLayout_9.addWidget(self.dual_evaluation_enabled)
+        self.label_10 = QtWidgets.QLabel(self.scrollAreaWidgetContents)
+        sizePolicy = QtWidgets.QSizePolicy(QtWidgets.QSizePolicy.Fixed, QtWidgets.QSizePolicy.Preferred)
+        sizePolicy.setHorizontalStretch(0)
+        sizePolicy.setVerticalStretch(0)
+        sizePolicy.setHeightForWidth(self.label_10.sizePolicy().hasHeightForWidth())
+        self.label_10.setSizePolicy(sizePolicy)
+        self.label_10.setObjectName("label_10")
+        self.horizontalLayout_9.addWidget(self.label_10)
+        self.score_diff_threshold = QtWidgets.QSpinBox(self.scrollAreaWidgetContents)
+        self.score_diff_threshold.setMinimum(1)
+        self.score_diff_threshold.setMaximum(5000)
+        self.score_diff_threshold.setObjectName("score_diff_threshold")
+        self.horizontalLayout_9.addWidget(self.score_diff_threshold)
+        self.label_14 = QtWidgets.QLabel(self.scrollAreaWidgetContents)
+        sizePolicy = QtWidgets.QSizePolicy(QtWidgets.QSizePolicy.Fixed, QtWidgets.QSizePolicy.Preferred)
+        sizePolicy.setHorizontalStretch(0)
+        sizePolicy.setVerticalStretch(0)
+        sizePolicy.setHeightForWidth(self.label_14.sizePolicy().hasHeightForWidth())
+        self.label_14.setSizePolicy(sizePolicy)
+        self.label_14.setObjectName("label_14")
+        self.horizontalLayout_9.addWidget(self.label_14)
+        self.api_test_button = QtWidgets.QPushButton(self.scrollAreaWidgetContents)
+        self.api_test_button.setObjectName("api_test_button")
+        self.horizontalLayout_9.addWidget(self.api_test_button)
+        self.verticalLayout.addLayout(self.horizontalLayout_9)
+        self.horizontalLayout_title1 = QtWidgets.QHBoxLayout()
+        self.horizontalLayout_title1.setObjectName("horizontalLayout_title1")
+        self.enableQuestion1 = QtWidgets.QCheckBox(self.scrollAreaWidgetContents)
+        self.enableQuestion1.setEnabled(False)
+        self.enableQuestion1.setChecked(True)
+        self.enableQuestion1.setObjectName("enableQuestion1")
+        self.horizontalLayout_title1.addWidget(self.enableQuestion1)
+        self.configQuestion1 = QtWidgets.QPushButton(self.scrollAreaWidgetContents)
+        self.configQuestion1.setObjectName("configQuestion1")
+        self.horizontalLayout_title1.addWidget(self.configQuestion1)
+        self.label_3 = QtWidgets.QLabel(self.scrollAreaWidgetContents)
+        sizePolicy = QtWidgets.QSizePolicy(QtWidgets.QSizePolicy.Preferred, QtWidgets.QSizePolicy.Preferred)
+        sizePolicy.setHorizontalStretch(0)
+        sizePolicy.setVerticalStretch(5)
+        sizePolicy.setHeightForWidth(self.label_3.sizePolicy().hasHeightForWidth())
+        self.label_3.setSizePolicy(sizePolicy)
+        self.label_3.setObjectName("label_3")
+        self.horizontalLayout_title1.addWidget(self.label_3)
+        self.verticalLayout.addLayout(self.horizontalLayout_title1)
+        self.horizontalLayout_question1 = QtWidgets.QHBoxLayout()
+        self.horizontalLayout_question1.setObjectName("horizontalLayout_question1")
+        self.StandardAnswer_text_1 = QtWidgets.QPlainTextEdit(self.scrollAreaWidgetContents)
+        sizePolicy = QtWidgets.QSizePolicy(QtWidgets.QSizePolicy.Expanding, QtWidgets.QSizePolicy.Expanding)
+        sizePolicy.setHorizontalStretch(0)
+        sizePolicy.setVerticalStretch(0)
+        sizePolicy.setHeightForWidth(self.StandardAnswer_text_1.sizePolicy().hasHeightForWidth())
+        self.StandardAnswer_text_1.setSizePolicy(sizePolicy)
+        self.StandardAnswer_text_1.setMaximumSize(QtCore.QSize(16777215, 16777215))
+        self.StandardAnswer_text_1.setPlainText("")
+        self.StandardAnswer_text_1.setPlaceholderText("")
+        self.StandardAnswer_text_1.setObjectName("StandardAnswer_text_1")
+        self.horizontalLayout_question1.addWidget(self.StandardAnswer_text_1)
+        self.verticalLayout.addLayout(self.horizontalLayout_question1)
+        self.horizontalLayout_title2 = QtWidgets.QHBoxLayout()
+        self.horizontalLayout_title2.setObjectName("horizontalLayout_title2")
+        self.enableQuestion2 = QtWidgets.QCheckBox(self.scrollAreaWidgetContents)
+        self.enableQuestion2.setChecked(False)
+        self.enableQuestion2.setObjectName("enableQuestion2")
+        self.horizontalLayout_title2.addWidget(self.enableQuestion2)
+        self.configQuestion2 = QtWidgets.QPushButton(self.scrollAreaWidgetContents)
+        self.configQuestion2.setObjectName("configQuestion2")
+        self.horizontalLayout_title2.addWidget(self.configQuestion2)
+        self.label_7 = QtWidgets.QLabel(self.scrollAreaWidgetContents)
+        self.label_7.setAlignment(QtCore.Qt.AlignCenter)
+        self.label_7.setObjectName("label_7")
+        self.horizontalLayout_title2.addWidget(self.label_7)
+        self.verticalLayout.addLayout(self.horizontalLayout_title2)
+        self.horizontalLayout_question2 = QtWidgets.QHBoxLayout()
+        self.horizontalLayout_question2.setObjectName("horizontalLayout_question2")
+        self.StandardAnswer_text_2 = QtWidgets.QPlainTextEdit(self.scrollAreaWidgetContents)
+        self.StandardAnswer_text_2.setMaximumSize(QtCore.QSize(16777215, 16777215))
+        self.StandardAnswer_text_2.setPlainText("")
+        self.StandardAnswer_text_2.setPlaceholderText("")
+        self.StandardAnswer_text_2.setObjectName("StandardAnswer_text_2")
+        self.horizontalLayout_question2.addWidget(self.StandardAnswer_text_2)
+        self.verticalLayout.addLayout(self.horizontalLayout_question2)
+        self.horizontalLayout_title3 = QtWidgets.QHBoxLayout()
+        self.horizontalLayout_title3.setObjectName("horizontalLayout_title3")
+        self.enableQuestion3 = QtWidgets.QCheckBox(self.scrollAreaWidgetContents)
+        self.enableQuestion3.setChecked(False)
+        self.enableQuestion3.setObjectName("enableQuestion3")
+        self.horizontalLayout_title3.addWidget(self.enableQuestion3)
+        self.configQuestion3 = QtWidgets.QPushButton(self.scrollAreaWidgetContents)
+        self.configQuestion3.setObjectName("configQuestion3")
+        self.horizontalLayout_title3.addWidget(self.configQuestion3)
+        self.label_4 = QtWidgets.QLabel(self.scrollAreaWidgetContents)
+        self.label_4.setAlignment(QtCore.Qt.AlignCenter)
+        self.label_4.setObjectName("label_4")
+        self.horizontalLayout_title3.addWidget(self.label_4)
+        self.verticalLayout.addLayout(self.horizontalLayout_title3)
+        self.StandardAnswer_text_3 = QtWidgets.QPlainTextEdit(self.scrollAreaWidgetContents)
+        sizePolicy = QtWidgets.QSizePolicy(QtWidgets.QSizePolicy.Expanding, QtWidgets.QSizePolicy.Expanding)
+        sizePolicy.setHorizontalStretch(0)
+        sizePolicy.setVerticalStretch(0)
+        sizePolicy.setHeightForWidth(self.StandardAnswer_text_3.sizePolicy().hasHeightForWidth())
+        self.StandardAnswer_text_3.setSizePolicy(sizePolicy)
+        self.StandardAnswer_text_3.setMaximumSize(QtCore.QSize(16777215, 16777215))
+        self.StandardAnswer_text_3.setPlainText("")
+        self.StandardAnswer_text_3.setPlaceholderText("")
+        self.StandardAnswer_text_3.setObjectName("StandardAnswer_text_3")
+        self.verticalLayout.addWidget(self.StandardAnswer_text_3)
+        self.horizontalLayout_title4 = QtWidgets.QHBoxLayout()
+        self.horizontalLayout_title4.setObjectName("horizontalLayout_title4")
+        self.enableQuestion4 = QtWidgets.QCheckBox(self.scrollAreaWidgetContents)
+        self.enableQuestion4.setChecked(False)
+        self.enableQuestion4.setObjectName("enableQuestion4")
+        self.horizontalLayout_title4.addWidget(self.enableQuestion4)
+        self.configQuestion4 = QtWidgets.QPushButton(self.scrollAreaWidgetContents)
+        self.configQuestion4.setObjectName("configQuestion4")
+        self.horizontalLayout_title4.addWidget(self.configQuestion4)
+        self.label_12 = QtWidgets.QLabel(self.scrollAreaWidgetContents)
+        sizePolicy = QtWidgets.QSizePolicy(QtWidgets.QSizePolicy.Preferred, QtWidgets.QSizePolicy.Preferred)
+        sizePolicy.setHorizontalStretch(0)
+        sizePolicy.setVerticalStretch(5)
+        sizePolicy.setHeightForWidth(self.label_12.sizePolicy().hasHeightForWidth())
+        self.label_12.setSizePolicy(sizePolicy)
+        self.label_12.setTextFormat(QtCore.Qt.PlainText)
+        self.label_12.setAlignment(QtCore.Qt.AlignCenter)
+        self.label_12.setObjectName("label_12")
+        self.horizontalLayout_title4.addWidget(self.label_12)
+        self.verticalLayout.addLayout(self.horizontalLayout_title4)
+        self.StandardAnswer_text_4 = QtWidgets.QPlainTextEdit(self.scrollAreaWidgetContents)
+        sizePolicy = QtWidgets.QSizePolicy(QtWidgets.QSizePolicy.Expanding, QtWidgets.QSizePolicy.Expanding)
+        sizePolicy.setHorizontalStretch(0)
+        sizePolicy.setVerticalStretch(0)
+        sizePolicy.setHeightForWidth(self.StandardAnswer_text_4.sizePolicy().hasHeightForWidth())
+        self.StandardAnswer_text_4.setSizePolicy(sizePolicy)
+        self.StandardAnswer_text_4.setMaximumSize(QtCore.QSize(16777215, 16777215))
+        self.StandardAnswer_text_4.setPlainText("")
+        self.StandardAnswer_text_4.setPlaceholderText("")
+        self.StandardAnswer_text_4.setObjectName("StandardAnswer_text_4")
+        self.verticalLayout.addWidget(self.StandardAnswer_text_4)
+        self.horizontalLayout = QtWidgets.QHBoxLayout()
+        self.horizontalLayout.setObjectName("horizontalLayout")
+        self.subject_text = QtWidgets.QComboBox(self.scrollAreaWidgetContents)
+        sizePolicy = QtWidgets.QSizePolicy(QtWidgets.QSizePolicy.Expanding, QtWidgets.QSizePolicy.Fixed)
+        sizePolicy.setHorizontalStretch(0)
+        sizePolicy.setVerticalStretch(0)
+        sizePolicy.setHeightForWidth(self.subject_text.sizePolicy().hasHeightForWidth())
+        self.subject_text.setSizePolicy(sizePolicy)
+        self.subject_text.setObjectName("subject_text")
+        self.subject_text.addItem("")
+        self.subject_text.addItem("")
+        self.subject_text.addItem("")
+        self.subject_text.addItem("")
+        self.subject_text.addItem("")
+        self.subject_text.addItem("")
+        self.subject_text.addItem("")
+        self.subject_text.addItem("")
+        self.subject_text.addItem("")
+        self.subject_text.addItem("")
+        self.subject_text.addItem("")
+        self.subject_text.addItem("")
+        self.subject_text.addItem("")
+        self.subject_text.addItem("")
+        self.subject_text.addItem("")
+        self.subject_text.addItem("")
+        self.subject_text.addItem("")
+        self.subject_text.addItem("")
+        self.subject_text.addItem("")
+        self.subject_text.setItemText(18, "")
+        self.horizontalLayout.addWidget(self.subject_text)
+        self.label_13 = QtWidgets.QLabel(self.scrollAreaWidgetContents)
+        sizePolicy = QtWidgets.QSizePolicy(QtWidgets.QSizePolicy.Fixed, QtWidgets.QSizePolicy.Preferred)
+        sizePolicy.setHorizontalStretch(0)
+        sizePolicy.setVerticalStretch(0)
+        sizePolicy.setHeightForWidth(self.label_13.sizePolicy().hasHeightForWidth())
+        self.label_13.setSizePolicy(sizePolicy)
+        self.label_13.setObjectName("label_13")
+        self.horizontalLayout.addWidget(self.label_13)
+        self.cycle_number = QtWidgets.QSpinBox(self.scrollAreaWidgetContents)
+        self.cycle_number.setMinimum(1)
+        self.cycle_number.setMaximum(5000)
+        self.cycle_number.setObjectName("cycle_number")
+        self.horizontalLayout.addWidget(self.cycle_number)
+        self.label_11 = QtWidgets.QLabel(self.scrollAreaWidgetContents)
+        sizePolicy = QtWidgets.QSizePolicy(QtWidgets.QSizePolicy.Fixed, QtWidgets.QSizePolicy.Preferred)
+        sizePolicy.setHorizontalStretch(0)
+        sizePolicy.setVerticalStretch(0)
+        sizePolicy.setHeightForWidth(self.label_11.sizePolicy().hasHeightForWidth())
+        self.label_11.setSizePolicy(sizePolicy)
+        self.label_11.setObjectName("label_11")
+        self.horizontalLayout.addWidget(self.label_11)
+        self.wait_time = QtWidgets.QSpinBox(self.scrollAreaWidgetContents)
+        self.wait_time.setMinimum(2)
+        self.wait_time.setObjectName("wait_time")
+        self.horizontalLayout.addWidget(self.wait_time)
+        self.concurrent_grading_enabled = QtWidgets.QCheckBox(self.scrollAreaWidgetContents)
+        self.concurrent_grading_enabled.setObjectName("concurrent_grading_enabled")
+        self.horizontalLayout.addWidget(self.concurrent_grading_enabled)
+        self.auto_run_but = QtWidgets.QPushButton(self.scrollAreaWidgetContents)
+        self.auto_run_but.setObjectName("auto_run_but")
+        self.horizontalLayout.addWidget(self.auto_run_but)
+        self.stop_but = QtWidgets.QPushButton(self.scrollAreaWidgetContents)
+        self.stop_but.setObjectName("stop_but")
+        self.horizontalLayout.addWidget(self.stop_but)
+        self.verticalLayout.addLayout(self.horizontalLayout)
+        self.log_text = QtWidgets.QTextBrowser(self.scrollAreaWidgetContents)
+        self.log_text.setMaximumSize(QtCore.QSize(16777215, 120))
+        self.log_text.setObjectName("log_text")
+        self.verticalLayout.addWidget(self.log_text)
+        self.scrollArea.setWidget(self.scrollAreaWidgetContents)
+        self.horizontalLayout_8.addWidget(self.scrollArea)
+        MainWindow.setCentralWidget(self.centralwidget)
+
+        self.retranslateUi(MainWindow)
+        self.first_api_url.setCurrentIndex(0)
+        self.second_api_url.setCurrentIndex(0)
+        self.subject_text.setCurrentIndex(0)
+        QtCore.QMetaObject.connectSlotsByName(MainWindow)
+
+    def retranslateUi(self, MainWindow):
+        _translate = QtCore.QCoreApplication.translate
+        MainWindow.setWindowTitle(_translate("MainWindow", "科技改变世界 - 本软件仅能使用视觉（多模态）大模型，AI仅直接评阅答题卡截图"))
+        self.first_api_url.setItemText(0, _translate("MainWindow", "火山引擎 (推荐)"))
+        self.first_api_url.setItemText(1, _translate("MainWindow", "月之暗面"))
+        self.first_api_url.setItemText(2, _translate("MainWindow", "智谱清言"))
+        self.first_api_url.setItemText(3, _translate("MainWindow", "阿里通义千问"))
+        self.first_api_url.setItemText(4, _translate("MainWindow", "百度文心千帆"))
+        self.first_api_url.setItemText(5, _translate("MainWindow", "腾讯混元"))
+        self.first_api_url.setItemText(6, _translate("MainWindow", "OpenRouter"))
+        self.first_api_url.setItemText(7, _translate("MainWindow", "OpenAI"))
+        self.first_api_url.setItemText(8, _translate("MainWindow", "Google Gemini"))
+        self.first_api_key.setPlaceholderText(_translate("MainWindow", "API密钥/Access Token"))
+        self.first_modelID.setPlaceholderText(_translate("MainWindow", "AI视觉模型/ID"))
+        self.second_api_url.setItemText(0, _translate("MainWindow", "火山引擎 (推荐)"))
+        self.second_api_url.setItemText(1, _translate("MainWindow", "月之暗面"))
+        self.second_api_url.setItemText(2, _translate("MainWindow", "智谱清言"))
+        self.second_api_url.setItemText(3, _translate("MainWindow", "阿里通义千问"))
+        self.second_api_url.setItemText(4, _translate("MainWindow", "百度文心千帆"))
+        self.second_api_url.setItemText(5, _translate("MainWindow", "腾讯混元"))
+        self.second_api_url.setItemText(6, _translate("MainWindow", "OpenRouter"))
+        self.second_api_url.setItemText(7, _translate("MainWindow", "OpenAI"))
+        self.second_api_url.setItemText(8, _translate("MainWindow", "Google Gemini"))
+        self.second_api_key.setPlaceholderText(_translate("MainWindow", "API密钥/Access Token"))
+        self.second_modelID.setPlaceholderText(_translate("MainWindow", "AI视觉模型/ID（此AI仅双评启用）"))
+        self.dual_evaluation_enabled.setText(_translate("MainWindow", "双评（仅单题阅卷第一题）"))
+        self.label_10.setText(_translate("MainWindow", " 双评分差"))
+        self.label_14.setText(_translate("MainWindow", "分差内取均分；否则停止阅卷   "))
+        self.api_test_button.setText(_translate("MainWindow", "测试api连接"))
+        self.api_test_button.setShortcut(_translate("MainWindow", "Esc"))
+        self.enableQuestion1.setText(_translate("MainWindow", "第一题默认启用"))
+        self.configQuestion1.setText(_translate("MainWindow", "配置第一题自动改卷信息"))
+        self.configQuestion1.setShortcut(_translate("MainWindow", "Esc"))
+        self.label_3.setText(_translate("MainWindow", "---------------------第一题评分细则-------------------------"))
+        self.enableQuestion2.setText(_translate("MainWindow", "启用第二题"))
+        self.configQuestion2.setText(_translate("MainWindow", "配置第二题自动改卷信息"))
+        self.configQuestion2.setShortcut(_translate("MainWindow", "Esc"))
+        self.label_7.setText(_translate("MainWindow", "--------------------------------------------------------------------第二题评分细则--------------------------------------------------------------------"))
+        self.enableQuestion3.setText(_translate("MainWindow", "启用第三题"))
+        self.configQuestion3.setText(_translate("MainWindow", "配置第三题自动改卷信息"))
+        self.configQuestion3.setShortcut(_translate("MainWindow", "Esc"))
+        self.label_4.setText(_translate("MainWindow", "--------------------------------------------------------------------第三题评分细则--------------------------------------------------------------------"))
+        self.enableQuestion4.setText(_translate("MainWindow", "启用第四题"))
+        self.configQuestion4.setText(_translate("MainWindow", "配置第四题自动改卷信息"))
+        self.configQuestion4.setShortcut(_translate("MainWindow", "Esc"))
+        self.label_12.setText(_translate("MainWindow", "--------------------------------------------------------------------第四题评分细则--------------------------------------------------------------------"))
+        self.subject_text.setItemText(0, _translate("MainWindow", "初中语文"))
+        self.subject_text.setItemText(1, _translate("MainWindow", "初中数学"))
+        self.subject_text.setItemText(2, _translate("MainWindow", "初中英语"))
+        self.subject_text.setItemText(3, _translate("MainWindow", "初中物理"))
+        self.subject_text.setItemText(4, _translate("MainWindow", "初中化学"))
+        self.subject_text.setItemText(5, _translate("MainWindow", "初中生物"))
+        self.subject_text.setItemText(6, _translate("MainWindow", "初中政治"))
+        self.subject_text.setItemText(7, _translate("MainWindow", "初中历史"))
+        self.subject_text.setItemText(8, _translate("MainWindow", "初中地理"))
+        self.subject_text.setItemText(9, _translate("MainWindow", "高中语文"))
+        self.subject_text.setItemText(10, _translate("MainWindow", "高中数学"))
+        self.subject_text.setItemText(11, _translate("MainWindow", "高中英语"))
+        self.subject_text.setItemText(12, _translate("MainWindow", "高中物理"))
+        self.subject_text.setItemText(13, _translate("MainWindow", "高中化学"))
+        self.subject_text.setItemText(14, _translate("MainWindow", "高中生物"))
+        self.subject_text.setItemText(15, _translate("MainWindow", "高中政治"))
+        self.subject_text.setItemText(16, _translate("MainWindow", "高中历史"))
+        self.subject_text.setItemText(17, _translate("MainWindow", "高中地理"))
+        self.label_13.setText(_translate("MainWindow", "    自动改卷份数"))
+        self.label_11.setText(_translate("MainWindow", "    翻页后等待（秒）"))
+        self.concurrent_grading_enabled.setToolTip(_translate("MainWindow", "各题答案区域同屏显示时，同时截图并并行调用API，按题目顺序输入分数"))
+        self.concurrent_grading_enabled.setText(_translate("MainWindow", "多题并发"))
+        self.auto_run_but.setText(_translate("MainWindow", "运行自动改卷"))
+        self.stop_but.setText(_translate("MainWindow", "中止(Esc)"))
+        self.stop_but.setShortcut(_translate("MainWindow", "Esc"))
+        self.log_text.setPlaceholderText(_translate("MainWindow", "日志信息将显示在这里..."))